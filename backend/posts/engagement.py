@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.db.models import Case, Func, IntegerField, Max, Min, When
+
+PLATFORM_MULTIPLIERS = {
+    'facebook': 1.0,
+    'instagram': 1.5,
+    'twitter': 0.8,
+    'linkedin': 1.2,
+}
+
+BASE_SCORE_RANGE = (100, 1000)
+
+
+class RandomInt(Func):
+    """A uniformly random integer in [low, high], evaluated by the database for every row."""
+
+    template = '(FLOOR(RANDOM() * %(span)s) + %(low)s)'
+    output_field = IntegerField()
+
+    def __init__(self, low, high, **extra):
+        super().__init__(low=int(low), span=int(high) - int(low) + 1, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # RANDOM() is a signed 64-bit integer on SQLite. The modulo sign is
+        # doubled twice: once for this template and once for the backend's
+        # parameter formatting.
+        return self.as_sql(
+            compiler, connection, template='(ABS(RANDOM()) %%%% %(span)s + %(low)s)', **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(compiler, connection, template='(FLOOR(RAND() * %(span)s) + %(low)s)', **extra_context)
+
+
+def engagement_score_expression():
+    """Random base score scaled by the post's platform multiplier, as one CASE expression."""
+    low, high = BASE_SCORE_RANGE
+    return Case(
+        *[
+            When(platform=platform, then=RandomInt(low * multiplier, high * multiplier))
+            for platform, multiplier in PLATFORM_MULTIPLIERS.items()
+        ],
+        default=RandomInt(low, high),
+        output_field=IntegerField(),
+    )
+
+
+def generate_engagement_scores(queryset, chunk_size=50_000):
+    """
+    Assign a random engagement score to every post in ``queryset``.
+
+    Each primary-key range of ``chunk_size`` rows is one UPDATE in its own
+    short transaction, so locks are held per chunk rather than for the
+    whole table. Returns the number of rows updated.
+    """
+    bounds = queryset.aggregate(low=Min('pk'), high=Max('pk'))
+    if bounds['low'] is None:
+        return 0
+
+    score = engagement_score_expression()
+    updated = 0
+    start = bounds['low']
+    while start <= bounds['high']:
+        with transaction.atomic():
+            updated += queryset.filter(pk__gte=start, pk__lt=start + chunk_size).update(engagement_score=score)
+        start += chunk_size
+    return updated
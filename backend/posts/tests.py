@@ -1,3 +1,58 @@
-from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .engagement import BASE_SCORE_RANGE, PLATFORM_MULTIPLIERS, generate_engagement_scores
+from .models import Post
+
+
+class GenerateEngagementTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('post-generate-engagement')
+        platforms = [choice for choice, _ in Post.PLATFORM_CHOICES]
+        self.posts = [
+            Post.objects.create(
+                title=f'Post {i}', content='c', platform=platforms[i % len(platforms)],
+                status='published' if i % 2 else 'draft', engagement_score=-1,
+            )
+            for i in range(20)
+        ]
+
+    def scores(self):
+        return dict(Post.objects.values_list('id', 'engagement_score'))
+
+    def test_scores_stay_in_platform_range(self):
+        response = self.client.post(self.url, {}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated_count'], len(self.posts))
+        low, high = BASE_SCORE_RANGE
+        for post in Post.objects.all():
+            multiplier = PLATFORM_MULTIPLIERS.get(post.platform, 1)
+            self.assertGreaterEqual(post.engagement_score, int(low * multiplier), post.platform)
+            self.assertLessEqual(post.engagement_score, int(high * multiplier), post.platform)
+
+    def test_only_filtered_posts_change(self):
+        response = self.client.post(self.url, {'platform': 'instagram', 'status': 'published'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        matching = {p.id for p in self.posts if p.platform == 'instagram' and p.status == 'published'}
+        self.assertEqual(response.data['updated_count'], len(matching))
+        for pk, score in self.scores().items():
+            self.assertEqual(score != -1, pk in matching)
+
+    def test_chunks_cover_every_row(self):
+        # Leave holes in the primary keys so some chunks are partly empty.
+        Post.objects.filter(pk__in=[self.posts[3].pk, self.posts[4].pk, self.posts[11].pk]).delete()
+
+        updated = generate_engagement_scores(Post.objects.all(), chunk_size=3)
+
+        self.assertEqual(updated, 17)
+        self.assertNotIn(-1, self.scores().values())
+
+    def test_invalid_chunk_size_is_rejected(self):
+        response = self.client.post(self.url, {'chunk_size': 'lots'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.data['success'])
+        self.assertEqual(set(self.scores().values()), {-1})
@@ -2,11 +2,11 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import api_view, action
 from rest_framework.response import Response
 from django.db.models import Count, Avg, Sum
-from django.db import transaction
 import requests
-import random
 from .models import Post
 from .serializers import PostSerializer
+from .engagement import generate_engagement_scores
+from . import outbound
 
 class PostViewSet(viewsets.ModelViewSet):
     queryset = Post.objects.all()
@@ -47,25 +47,25 @@ class PostViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['post'])
     def generate_engagement(self, request):
-        """Generate random engagement scores for all posts"""
+        """
+        Generate random engagement scores for posts, optionally filtered by
+        ``platform`` / ``status``, in chunks of ``chunk_size`` rows.
+        """
+        posts = Post.objects.all()
+        for field in ('platform', 'status'):
+            value = request.data.get(field) or request.query_params.get(field)
+            if value:
+                posts = posts.filter(**{field: value})
         try:
-            with transaction.atomic():
-                posts = Post.objects.all()
-                updated_count = 0
-                for post in posts:
-                    # Generate random engagement score based on platform
-                    platform_multipliers = {
-                        'Facebook': 1.0,
-                        'Instagram': 1.5,
-                        'Twitter': 0.8,
-                        'LinkedIn': 1.2,
-                    }
-                    multiplier = platform_multipliers.get(post.platform, 1.0)
-                    score = int(random.randint(100, 1000) * multiplier)
-                    post.engagement_score = score
-                    post.save(update_fields=['engagement_score'])
-                    updated_count += 1
-                
+            chunk_size = int(request.data.get('chunk_size') or request.query_params.get('chunk_size') or 50000)
+        except (TypeError, ValueError):
+            return Response({
+                'success': False,
+                'message': 'chunk_size must be an integer'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            updated_count = generate_engagement_scores(posts, chunk_size=max(chunk_size, 1))
             return Response({
                 'success': True,
                 'message': f'Generated engagement scores for {updated_count} posts',
@@ -90,10 +90,10 @@ def random_quote(request):
     ]
     
     try:
-        r = requests.get("https://api.quotable.io/random", timeout=5)
+        r = outbound.client.get("https://api.quotable.io/random", timeout=(2, 3))
         if r.status_code == 200:
             return Response(r.json())
-    except Exception:
+    except (requests.RequestException, ValueError):
         pass
     
     # Return a fallback quote if the external API fails
@@ -40,6 +40,75 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.AllowAny",
     ],
     "DEFAULT_PAGINATION_CLASS": None,
+    # orjson-backed JSON output (falls back to the stock encoder without orjson).
+    "DEFAULT_RENDERER_CLASSES": [
+        "content_posts.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+# Keyset pagination for the posts API (content_posts.pagination.KeysetPagination).
+# Clients opt in with ?page_size= / ?limit= / ?cursor=.
+POSTS_PAGE_SIZE = 50
+POSTS_MAX_PAGE_SIZE = 500
+# Largest batch accepted by /api/posts/bulk/.
+POSTS_BULK_MAX_ITEMS = 1000
+
+# /api/analytics/timeseries/ range limits. Hour buckets aggregate the posts
+# table directly, so their range is kept short.
+ANALYTICS_HOURLY_MAX_DAYS = 7
+ANALYTICS_MAX_RANGE_DAYS = 3660
+
+# Unsplash image pools for FetchImageView (content_posts.images).
+UNSPLASH_CACHE_TTL = 3600
+UNSPLASH_CACHE_MAX_QUERIES = 256
+UNSPLASH_PREFETCH_QUERIES = ['social media', 'marketing', 'business', 'technology']
+
+# Platform publishing (content_posts.dispatch). Access tokens are read from
+# <PLATFORM>_ACCESS_TOKEN, e.g. INSTAGRAM_ACCESS_TOKEN.
+PUBLISHING_BASE_URL = config('PUBLISHING_BASE_URL', default='http://127.0.0.1:8765')
+# platform: (requests per second, burst)
+PUBLISHING_RATE_LIMITS = {
+    'instagram': (5, 10),
+    'facebook': (10, 20),
+    'twitter': (15, 30),
+    'linkedin': (5, 10),
+}
+
+# Total time a request may spend on outbound HTTP calls (content_posts.outbound).
+# Keep it well under the gunicorn worker timeout (30s).
+OUTBOUND_DEADLINE_SECONDS = 8
+
+# Structured logging (content_posts.logger). LOG_SAMPLING maps a level to the
+# fraction of its records kept, e.g. {'DEBUG': 0.01}. LOG_QUEUE_SIZE bounds the
+# records waiting for the writer thread; past it new records are dropped.
+LOG_LEVEL = config('LOG_LEVEL', default='INFO')
+LOG_SAMPLING = {'DEBUG': 0.1}
+LOG_QUEUE_SIZE = 10000
+
+# Request metrics (content_posts.metrics), served at /api/metrics. With a
+# directory set, gunicorn workers write snapshots there and any worker can
+# answer a scrape for all of them. Clear it when the server restarts.
+METRICS_DIR = config('PROMETHEUS_MULTIPROC_DIR', default='')
+METRICS_FLUSH_INTERVAL = 1.0
+
+# Per-request query counting and slow-query EXPLAIN logging
+# (content_posts.instrumentation). Off unless QUERY_INSTRUMENTATION is set.
+QUERY_INSTRUMENTATION = config('QUERY_INSTRUMENTATION', default=False, cast=bool)
+SLOW_QUERY_MS = config('SLOW_QUERY_MS', default=200, cast=int)
+
+# Server-rendered pages (content_posts.views.post_list / dashboard). Fragments
+# are keyed on the posts TableVersion, so the TTL only bounds how long stale
+# versions linger in the cache. Deep OFFSET pages are refused past the cap.
+POST_LIST_PAGE_SIZE = 25
+POST_LIST_MAX_PAGES = 200
+HTML_FRAGMENT_CACHE_TTL = 300
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'content-planner',
+    },
 }
 
 CORS_ALLOW_ALL_ORIGINS = True
@@ -48,8 +117,14 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'frontend', 'dist'), os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
+            # Cached even with DEBUG on; restart the server after editing templates.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -94,6 +169,9 @@ ROOT_URLCONF = 'content_planner.urls'
 
 # ... other settings ...
 MIDDLEWARE = [
+    'content_posts.middleware.RequestLogMiddleware',
+    'content_posts.middleware.MetricsMiddleware',
+    'content_posts.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -103,4 +181,5 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'content_posts.middleware.OutboundDeadlineMiddleware',
 ]
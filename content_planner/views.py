@@ -1,12 +1,27 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import render
-from content_posts.models import SocialPost
-from django.db.models import Count
+from content_posts.analytics import StatsGrid
+from content_posts.models import SocialPost, TableVersion
 
-def dashboard(request):
-    context = {
-        "total": SocialPost.objects.count(),
-        "draft": SocialPost.objects.filter(status="Draft").count(),
-        "published": SocialPost.objects.filter(status="Published").count(),
-        "by_platform": SocialPost.objects.values("platform").annotate(count=Count("id")),
+
+def dashboard_context():
+    grid = StatsGrid.from_rollup()
+    by_status = grid.count_by_status()
+    return {
+        "total": grid.total_posts,
+        "draft": by_status.get("Draft", 0),
+        "published": by_status.get("Published", 0),
+        "by_platform": [
+            {"platform": platform, "count": count}
+            for platform, count in grid.count_by_platform().items()
+        ],
     }
+
+
+def dashboard(request):
+    # Keyed on the posts table version, so any write invalidates it.
+    version, updated_at = TableVersion.current(SocialPost)
+    key = f"dashboard-context:{version}-{updated_at.timestamp() if updated_at else 0}"
+    context = cache.get_or_set(key, dashboard_context, settings.HTML_FRAGMENT_CACHE_TTL)
     return render(request, "dashboard.html", context)
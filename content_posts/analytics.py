@@ -0,0 +1,167 @@
+"""
+Post statistics shared by every stats, analytics and dashboard endpoint.
+
+All payloads are derived from a single (platform x status) grid holding a
+post count and an engagement total per cell. The grid is loaded with one
+query, either from the PostStatsRollup table (what the endpoints use) or
+with one GROUP BY over the posts table.
+
+Time series come from PostDailyRollup (day and week buckets) or, for hour
+buckets over a short range, from the posts table.
+"""
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncHour
+
+from .models import PostDailyRollup, PostStatsRollup, SocialPost, queryset_stats_grid, utc_day
+
+TIMESERIES_BUCKETS = ('hour', 'day', 'week')
+
+
+class StatsGrid:
+    def __init__(self, cells):
+        # {(platform, status): (count, engagement_total)}, empty cells dropped.
+        self.cells = {key: tuple(cell) for key, cell in cells.items() if cell[0]}
+
+    @classmethod
+    def from_rollup(cls):
+        rows = PostStatsRollup.objects.filter(post_count__gt=0).values_list(
+            'platform', 'status', 'post_count', 'engagement_total',
+        )
+        return cls({(platform, status): (count, total) for platform, status, count, total in rows})
+
+    @classmethod
+    def from_posts(cls, queryset=None):
+        if queryset is None:
+            queryset = SocialPost.objects.all()
+        return cls(queryset_stats_grid(queryset))
+
+    def __eq__(self, other):
+        return isinstance(other, StatsGrid) and self.cells == other.cells
+
+    def _fold(self, axis):
+        counts, engagement = {}, {}
+        for key, (count, total) in self.cells.items():
+            counts[key[axis]] = counts.get(key[axis], 0) + count
+            engagement[key[axis]] = engagement.get(key[axis], 0) + total
+        return counts, engagement
+
+    def count_by_platform(self):
+        return self._fold(0)[0]
+
+    def count_by_status(self):
+        return self._fold(1)[0]
+
+    def avg_engagement_by_platform(self):
+        counts, engagement = self._fold(0)
+        return {platform: engagement[platform] / counts[platform] for platform in counts}
+
+    @property
+    def total_posts(self):
+        return sum(count for count, _ in self.cells.values())
+
+    @property
+    def total_engagement(self):
+        return sum(total for _, total in self.cells.values())
+
+
+def analytics_payload(grid):
+    """Payload for PostAnalyticsView."""
+    return {
+        'platform_stats': [
+            {'platform': platform, 'count': count}
+            for platform, count in grid.count_by_platform().items()
+        ],
+        'status_stats': [
+            {'status': status, 'count': count}
+            for status, count in grid.count_by_status().items()
+        ],
+        'engagement_stats': [
+            {'platform': platform, 'avg_engagement': avg}
+            for platform, avg in grid.avg_engagement_by_platform().items()
+        ],
+        'total_posts': grid.total_posts,
+        'total_engagement': grid.total_engagement,
+    }
+
+
+def post_stats_payload(grid):
+    """Payload for PostStatsView: every status and platform count."""
+    by_status, by_platform = grid.count_by_status(), grid.count_by_platform()
+    stats = {status.lower(): by_status.get(status, 0) for status, _ in SocialPost.STATUS_CHOICES}
+    stats.update({platform: by_platform.get(platform, 0) for platform, _ in SocialPost.PLATFORM_CHOICES})
+    return stats
+
+
+def simple_stats_payload(grid):
+    """Payload for post_stats."""
+    stats = post_stats_payload(grid)
+    return {key: stats[key] for key in ('draft', 'published', 'instagram', 'twitter', 'facebook')}
+
+
+def dashboard_stats_payload(grid):
+    """Payload for dashboard_stats; platforms are ordered by post count."""
+    by_status = grid.count_by_status()
+    platform_stats = sorted(grid.count_by_platform().items(), key=lambda item: -item[1])
+    return {
+        'total_posts': grid.total_posts,
+        'published': by_status.get('Published', 0),
+        'drafts': by_status.get('Draft', 0),
+        'platform_stats': [{'platform': platform, 'count': count} for platform, count in platform_stats],
+    }
+
+
+def _hour_floor(moment):
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def _week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def engagement_timeseries(bucket, start, end, platform=None):
+    """
+    ``[{"bucket", "posts", "engagement"}]`` for every bucket from ``start``
+    to ``end`` (aware datetimes, inclusive), oldest first and zero-filled.
+    Buckets are UTC hours, days or ISO weeks (labelled by their Monday).
+    """
+    if bucket == 'hour':
+        posts = SocialPost.objects.filter(created_at__gte=start, created_at__lte=end)
+        if platform:
+            posts = posts.filter(platform=platform)
+        rows = (
+            posts.order_by()
+            .annotate(bucket=TruncHour('created_at', tzinfo=dt_timezone.utc))
+            .values('bucket')
+            .annotate(posts=Count('id'), engagement=Sum('engagement_score'))
+            .values_list('bucket', 'posts', 'engagement')
+        )
+        totals = {_hour_floor(key): (count, engagement or 0) for key, count, engagement in rows}
+        first, last, step = _hour_floor(start), _hour_floor(end), timedelta(hours=1)
+    else:
+        cells = PostDailyRollup.objects.filter(day__range=(utc_day(start), utc_day(end)))
+        if platform:
+            cells = cells.filter(platform=platform)
+        rows = (
+            cells.order_by()
+            .values('day')
+            .annotate(posts=Sum('post_count'), engagement=Sum('engagement_total'))
+            .values_list('day', 'posts', 'engagement')
+        )
+        fold = _week_start if bucket == 'week' else (lambda day: day)
+        totals = {}
+        for day, count, engagement in rows:
+            cell = totals.setdefault(fold(day), (0, 0))
+            totals[fold(day)] = (cell[0] + count, cell[1] + engagement)
+        first, last = fold(utc_day(start)), fold(utc_day(end))
+        step = timedelta(weeks=1) if bucket == 'week' else timedelta(days=1)
+
+    series = []
+    key = first
+    while key <= last:
+        count, engagement = totals.get(key, (0, 0))
+        series.append({'bucket': key, 'posts': count, 'engagement': engagement})
+        key += step
+    return series
+
@@ -1,5 +1,38 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+SEARCH_MIGRATION = ('content_posts', '0008_post_search_index')
+
+
+def install_search(using, **kwargs):
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+    from . import search
+
+    connection = connections[using]
+    # Only while the search migration is applied: after `migrate
+    # content_posts zero` the posts table is gone, and after unapplying
+    # 0008 the index must stay removed.
+    if search.POSTS_TABLE not in connection.introspection.table_names():
+        return
+    if SEARCH_MIGRATION not in MigrationRecorder(connection).applied_migrations():
+        return
+    search.install(connection)
+
 
 class ContentPostsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'content_posts'
\ No newline at end of file
+    name = 'content_posts'
+
+    def ready(self):
+        from django.conf import settings
+        from .logger import setup_logger
+
+        setup_logger(
+            level=getattr(settings, 'LOG_LEVEL', 'INFO'),
+            sampling=getattr(settings, 'LOG_SAMPLING', None),
+            queue_size=getattr(settings, 'LOG_QUEUE_SIZE', 10000),
+        )
+        # Re-create the search triggers if a table rebuild dropped them.
+        post_migrate.connect(install_search, sender=self)
@@ -0,0 +1,125 @@
+"""
+Batched create/update/delete of posts for the bulk API and the importer.
+
+Each operation validates the whole batch first, reports errors per item
+(by index), and writes nothing unless every item is valid. The write is a
+single bulk statement inside one transaction.
+"""
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from .models import SocialPost
+from .serializers import SocialPostSerializer
+
+
+def normalize_post_data(data):
+    """Treat blank scheduled_time as null and blank engagement_score as 0, like the web forms send them."""
+    data = data.copy()
+    if isinstance(data.get("scheduled_time"), str) and not data.get("scheduled_time").strip():
+        data["scheduled_time"] = None
+    if "engagement_score" in data and data.get("engagement_score") in ["", None]:
+        data["engagement_score"] = 0
+    return data
+
+
+def validate_new_posts(items, offset=0, serializer=None):
+    """
+    Validate ``items`` with one shared serializer instance.
+
+    Returns ``(posts, errors)``: unsaved SocialPost objects for the valid
+    items and ``{"index", "errors"}`` entries for the rest.
+    """
+    serializer = serializer or SocialPostSerializer()
+    posts, errors = [], []
+    for index, item in enumerate(items):
+        if isinstance(item, dict):
+            item = normalize_post_data(item)
+        try:
+            attrs = serializer.run_validation(item)
+        except ValidationError as e:
+            errors.append({"index": offset + index, "errors": e.detail})
+        else:
+            posts.append(SocialPost(**attrs))
+    return posts, errors
+
+
+def bulk_create_posts(items, batch_size=500):
+    """Validate ``items`` and insert them with one bulk_create. Returns ``(posts, errors)``."""
+    posts, errors = validate_new_posts(items)
+    if errors:
+        return [], errors
+    with transaction.atomic():
+        posts = SocialPost.objects.bulk_create(posts, batch_size=batch_size)
+    return posts, []
+
+
+def _post_id(value):
+    """``value`` as a post id, or None. Booleans and floats are not ids, even though int() accepts them."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def bulk_update_posts(items, batch_size=500):
+    """
+    Apply partial updates given as ``{"id": ..., <field>: <value>}`` items.
+
+    Only fields whose value actually changes are written, in one
+    bulk_update. Returns ``(posts, errors)``.
+    """
+    errors = [{} for _ in items]
+    ids = [None for _ in items]
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or item.get("id") in ("", None):
+            errors[index] = {"id": ["This field is required."]}
+            continue
+        ids[index] = _post_id(item["id"])
+        if ids[index] is None:
+            errors[index] = {"id": ["A valid integer is required."]}
+
+    serializer = SocialPostSerializer(partial=True)
+    with transaction.atomic():
+        valid_ids = [pk for pk in ids if pk is not None]
+        instances = SocialPost.objects.select_for_update().in_bulk(valid_ids) if valid_ids else {}
+        posts, changed = [], set()
+        for index, item in enumerate(items):
+            if errors[index]:
+                continue
+            instance = instances.get(ids[index])
+            if instance is None:
+                errors[index] = {"id": ["Post not found."]}
+                continue
+            data = normalize_post_data({k: v for k, v in item.items() if k != "id"})
+            try:
+                attrs = serializer.run_validation(data)
+            except ValidationError as e:
+                errors[index] = e.detail
+                continue
+            for field, value in attrs.items():
+                if getattr(instance, field) != value:
+                    setattr(instance, field, value)
+                    changed.add(field)
+            posts.append(instance)
+
+        errors = [{"index": index, "errors": error} for index, error in enumerate(errors) if error]
+        if errors:
+            transaction.set_rollback(True)
+            return [], errors
+        if changed:
+            SocialPost.objects.bulk_update(posts, sorted(changed), batch_size=batch_size)
+    return posts, []
+
+
+def bulk_delete_posts(ids):
+    """Delete the posts with the given ids. Returns ``(deleted_ids, missing_ids)``."""
+    with transaction.atomic():
+        existing = set(SocialPost.objects.filter(id__in=ids).values_list("id", flat=True))
+        SocialPost.objects.filter(id__in=existing).delete()
+    return sorted(existing), [pk for pk in ids if pk not in existing]
@@ -0,0 +1,73 @@
+"""
+ETag / Last-Modified support for the polled post endpoints.
+
+List and stats responses are keyed on the posts table's TableVersion row,
+and detail responses on the post's own ``version``. A matching
+``If-None-Match`` gets a 304 before the view runs. ``Cache-Control:
+no-cache`` makes browsers revalidate on every poll rather than guessing a
+freshness lifetime from Last-Modified.
+"""
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from .models import SocialPost, TableVersion
+
+
+def posts_version(request):
+    """The posts table's ``(version, updated_at)``, read once per request."""
+    if not hasattr(request, '_posts_version'):
+        request._posts_version = TableVersion.current(SocialPost)
+    return request._posts_version
+
+
+def _post_version(request, pk):
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+    cache = request.__dict__.setdefault('_post_versions', {})
+    if pk not in cache:
+        cache[pk] = SocialPost.objects.filter(pk=pk).values_list('version', 'updated_at').first()
+    return cache[pk]
+
+
+def _with_no_cache(view):
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        patch_cache_control(response, no_cache=True)
+        return response
+    return wrapper
+
+
+def posts_condition(scope, applies=None):
+    """
+    Conditional GET for responses that depend on the whole posts table.
+    ``applies(request)`` returning False opts a request out, for responses
+    that also depend on something else, such as the current time.
+    """
+    def etag(request, *args, **kwargs):
+        if applies is not None and not applies(request):
+            return None
+        return f'{scope}-{posts_version(request)[0]}'
+
+    def last_modified(request, *args, **kwargs):
+        if applies is not None and not applies(request):
+            return None
+        return posts_version(request)[1]
+
+    def decorator(view):
+        return _with_no_cache(condition(etag_func=etag, last_modified_func=last_modified)(view))
+    return decorator
+
+
+def post_condition(view):
+    """Conditional GET for a single post, keyed on its row version."""
+    def etag(request, pk=None, *args, **kwargs):
+        row = _post_version(request, pk)
+        return f'post-{pk}-{row[0]}' if row else None
+
+    def last_modified(request, pk=None, *args, **kwargs):
+        row = _post_version(request, pk)
+        return row[1] if row else None
+
+    return _with_no_cache(condition(etag_func=etag, last_modified_func=last_modified)(view))
@@ -0,0 +1,214 @@
+"""
+Push due posts to the social platforms.
+
+Each platform has an adapter that turns a SocialPost into the platform's
+request payload and owns a pooled ``requests.Session``. The Dispatcher fans
+posts out over one thread pool per platform, each with its own token
+bucket. Throughput is bounded by the platform limits rather than by
+sequential HTTP calls, and workers waiting on a throttled platform never
+hold up posts for the others. Transient failures are retried with jittered
+exponential backoff.
+"""
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import requests
+from decouple import config
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts up to ``capacity``."""
+
+    def __init__(self, rate, capacity):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class PublishError(Exception):
+    def __init__(self, message, retryable=False, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class PlatformAdapter:
+    platform = None
+    path = 'posts'
+
+    def __init__(self, base_url, token='', timeout=10, pool_size=10):
+        self.url = f"{base_url.rstrip('/')}/{self.platform}/{self.path}"
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        if token:
+            self.session.headers['Authorization'] = f"Bearer {token}"
+
+    def build_payload(self, post):
+        raise NotImplementedError
+
+    def publish(self, post):
+        """Publish ``post`` and return the platform's id for it."""
+        try:
+            response = self.session.post(self.url, json=self.build_payload(post), timeout=self.timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise PublishError(str(e), retryable=True)
+        except requests.RequestException as e:
+            # Bad URL, redirect loop and the like: retrying will not help.
+            raise PublishError(str(e))
+
+        if response.status_code >= 400:
+            retry_after = response.headers.get('Retry-After')
+            raise PublishError(
+                f"{self.platform} returned {response.status_code}: {response.text[:200]}",
+                retryable=response.status_code in RETRYABLE_STATUSES,
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        try:
+            body = response.json()
+        except ValueError:
+            raise PublishError(f"{self.platform} returned a non-JSON response: {response.text[:200]}")
+        return str(body.get('id', '')) if isinstance(body, dict) else ''
+
+
+class InstagramAdapter(PlatformAdapter):
+    platform = 'instagram'
+    path = 'media'
+
+    def build_payload(self, post):
+        return {'caption': f"{post.title}\n\n{post.content}", 'image_url': post.image_url}
+
+
+class FacebookAdapter(PlatformAdapter):
+    platform = 'facebook'
+    path = 'feed'
+
+    def build_payload(self, post):
+        payload = {'message': f"{post.title}\n\n{post.content}"}
+        if post.image_url:
+            payload['link'] = post.image_url
+        return payload
+
+
+class TwitterAdapter(PlatformAdapter):
+    platform = 'twitter'
+    path = 'tweets'
+    max_length = 280
+
+    def build_payload(self, post):
+        text = post.content if len(post.content) <= self.max_length else post.content[:self.max_length - 1] + '…'
+        return {'text': text}
+
+
+class LinkedInAdapter(PlatformAdapter):
+    platform = 'linkedin'
+    path = 'posts'
+
+    def build_payload(self, post):
+        return {'commentary': f"{post.title}\n\n{post.content}", 'visibility': 'PUBLIC'}
+
+
+ADAPTERS = {
+    adapter.platform: adapter
+    for adapter in (InstagramAdapter, FacebookAdapter, TwitterAdapter, LinkedInAdapter)
+}
+
+
+@dataclass
+class DispatchResult:
+    post_id: int
+    platform: str
+    ok: bool
+    external_id: str = ''
+    error: str = ''
+    retryable: bool = False
+    attempts: int = 0
+
+
+class Dispatcher:
+    def __init__(self, base_url=None, rate_limits=None, max_workers=16, max_attempts=4, backoff=0.5):
+        base_url = base_url or settings.PUBLISHING_BASE_URL
+        rate_limits = rate_limits or settings.PUBLISHING_RATE_LIMITS
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.adapters = {
+            platform: adapter_class(
+                base_url,
+                token=config(f'{platform.upper()}_ACCESS_TOKEN', default=''),
+                pool_size=max_workers,
+            )
+            for platform, adapter_class in ADAPTERS.items()
+        }
+        self.buckets = {
+            platform: TokenBucket(*rate_limits.get(platform, (1, 1)))
+            for platform in self.adapters
+        }
+
+    def dispatch(self, posts):
+        """
+        Publish ``posts`` concurrently and return a DispatchResult per post, in
+        order. Each platform gets up to ``max_workers`` threads of its own.
+        """
+        posts = list(posts)
+        executors = {}
+        try:
+            futures = []
+            for post in posts:
+                executor = executors.get(post.platform)
+                if executor is None:
+                    executor = executors[post.platform] = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix=f'dispatch-{post.platform}',
+                    )
+                futures.append(executor.submit(self.publish_one, post))
+            return [future.result() for future in futures]
+        finally:
+            for executor in executors.values():
+                executor.shutdown()
+
+    def publish_one(self, post):
+        adapter = self.adapters.get(post.platform)
+        if adapter is None:
+            return DispatchResult(post.id, post.platform, ok=False, error="No adapter for platform")
+
+        for attempt in range(1, self.max_attempts + 1):
+            self.buckets[post.platform].acquire()
+            try:
+                external_id = adapter.publish(post)
+            except PublishError as e:
+                if not e.retryable or attempt == self.max_attempts:
+                    logger.warning("Publishing post %s to %s failed: %s", post.id, post.platform, e)
+                    return DispatchResult(
+                        post.id, post.platform, ok=False, error=str(e),
+                        retryable=e.retryable, attempts=attempt,
+                    )
+                # Full jitter keeps retries from many workers from lining up.
+                delay = random.uniform(0, self.backoff * 2 ** (attempt - 1))
+                time.sleep(max(delay, e.retry_after or 0))
+            else:
+                return DispatchResult(post.id, post.platform, ok=True, external_id=external_id, attempts=attempt)
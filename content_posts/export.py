@@ -0,0 +1,123 @@
+"""
+Streaming export of posts as NDJSON or CSV.
+
+Rows are read with ``values_list().iterator()`` and encoded chunk by chunk
+into a StreamingHttpResponse, so memory use does not grow with the table
+and the first bytes go out as soon as the first chunk is read. Clients
+that send ``Accept-Encoding: gzip`` get a gzip-compressed stream.
+"""
+import csv
+import json
+import zlib
+from datetime import datetime, time, timedelta
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import SocialPost
+from .serializers import SocialPostSerializer
+
+# Same fields, in the same order, as SocialPostSerializer.
+EXPORT_FIELDS = tuple(SocialPostSerializer().fields)
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+CHUNK_SIZE = 2000
+
+
+def parse_date_bound(value, end=False):
+    """A datetime or a date; a date ``to`` bound covers that whole day."""
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is not None:
+        moment = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+        end = False
+    else:
+        moment = parse_datetime(value)
+        if moment is None:
+            raise ValueError(f"Invalid date: {value!r}")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment, end
+
+
+def export_queryset(params):
+    """
+    Posts matching the ``platform``, ``status``, ``from`` and ``to``
+    (created_at) query parameters. Raises ValueError on a bad date.
+    """
+    queryset = SocialPost.objects.all()
+    if params.get('platform'):
+        queryset = queryset.filter(platform=params['platform'])
+    if params.get('status'):
+        queryset = queryset.filter(status=params['status'])
+    if params.get('from'):
+        start, _ = parse_date_bound(params['from'])
+        queryset = queryset.filter(created_at__gte=start)
+    if params.get('to'):
+        stop, inclusive = parse_date_bound(params['to'], end=True)
+        queryset = queryset.filter(created_at__lte=stop) if inclusive else queryset.filter(created_at__lt=stop)
+    return queryset
+
+
+def _format_value(value):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return value
+
+
+def _rows(queryset, chunk_size):
+    rows = queryset.order_by('pk').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    batch = []
+    for row in rows:
+        batch.append([_format_value(value) for value in row])
+        if len(batch) >= chunk_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_chunks(queryset, chunk_size=CHUNK_SIZE):
+    for batch in _rows(queryset, chunk_size):
+        yield ''.join(json.dumps(dict(zip(EXPORT_FIELDS, row)), ensure_ascii=False) + '\n' for row in batch)
+
+
+class _Echo:
+    """File-like object whose write() returns the line instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(queryset, chunk_size=CHUNK_SIZE):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for batch in _rows(queryset, chunk_size):
+        yield ''.join(writer.writerow(row) for row in batch)
+
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(queryset, export_format, gzip=False):
+    chunks = ndjson_chunks(queryset) if export_format == 'ndjson' else csv_chunks(queryset)
+    if gzip:
+        response = StreamingHttpResponse(gzip_chunks(chunks), content_type=EXPORT_FORMATS[export_format])
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = StreamingHttpResponse((chunk.encode() for chunk in chunks), content_type=EXPORT_FORMATS[export_format])
+    response['Vary'] = 'Accept-Encoding'
+    response['Content-Disposition'] = f'attachment; filename="posts.{export_format}"'
+    return response
@@ -0,0 +1,122 @@
+"""
+Local stand-in for the social platform APIs, used by the tests and by
+``benchmark_dispatch``.
+
+It accepts ``POST /<platform>/<path>`` with a JSON body and answers with a
+fake id. It can add latency, fail a fraction of requests with 503, and
+enforce a per-platform requests-per-second limit with 429s.
+
+Run standalone with ``python -m content_posts.fake_platform --port 8765``.
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakePlatformHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        platform = self.path.strip('/').split('/')[0]
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+
+        if server.latency:
+            time.sleep(server.latency)
+        if server.over_limit(platform):
+            return self.respond(429, {'error': 'rate limited'}, {'Retry-After': '1'})
+        if server.failure_rate and random.random() < server.failure_rate:
+            return self.respond(503, {'error': 'unavailable'})
+        try:
+            json.loads(body or b'{}')
+        except ValueError:
+            return self.respond(400, {'error': 'invalid JSON'})
+
+        server.record(platform)
+        self.respond(201, {'id': f"{platform}-{next(server.ids)}"})
+
+    def respond(self, status, payload, headers=None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakePlatformServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, failure_rate=0.0, rate_limit=None):
+        super().__init__((host, port), FakePlatformHandler)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rate_limit = rate_limit
+        self.ids = itertools.count(1)
+        self.published = Counter()
+        self.lock = threading.Lock()
+        self.windows = defaultdict(list)
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def over_limit(self, platform):
+        if not self.rate_limit:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            window = [t for t in self.windows[platform] if now - t < 1.0]
+            limited = len(window) >= self.rate_limit
+            if not limited:
+                window.append(now)
+            self.windows[platform] = window
+            return limited
+
+    def handle_error(self, request, client_address):
+        # Clients that time out hang up mid-response; that is expected here.
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def record(self, platform):
+        with self.lock:
+            self.published[platform] += 1
+
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=int, default=None)
+    args = parser.parse_args()
+    server = FakePlatformServer(
+        port=args.port, latency=args.latency, failure_rate=args.failure_rate, rate_limit=args.rate_limit,
+    )
+    print(f"Fake platform API listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
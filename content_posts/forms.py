@@ -4,4 +4,11 @@ from .models import SocialPost
 class SocialPostForm(forms.ModelForm):
     class Meta:
         model = SocialPost
-        fields = "__all__"
\ No newline at end of file
+        fields = "__all__"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Only the publisher claims posts; a Publishing post set here would never be picked up.
+        self.fields['status'].choices = [
+            choice for choice in self.fields['status'].choices if choice[0] != 'Publishing'
+        ]
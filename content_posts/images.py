@@ -0,0 +1,149 @@
+"""
+Unsplash image lookups for FetchImageView.
+
+Every normalised query keeps a pool of image URLs, fetched in one upstream
+call (``count=30``) and held in a TTL/LRU cache. Requests rotate through the
+pool in memory. An expired pool keeps being served while a background
+thread refreshes it. The queries in UNSPLASH_PREFETCH_QUERIES are fetched
+up front, so popular searches never wait on Unsplash.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from . import outbound
+
+UNSPLASH_RANDOM_URL = "https://api.unsplash.com/photos/random"
+DEFAULT_QUERY = "social media"
+
+
+def normalize_query(query):
+    return " ".join((query or "").lower().split()) or DEFAULT_QUERY
+
+
+class UnsplashClient:
+    def __init__(self, access_key, batch_size=30, timeout=(3.05, 10)):
+        self.access_key = access_key
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+    def fetch(self, query):
+        """Return a batch of image URLs for ``query``."""
+        response = outbound.client.get(
+            UNSPLASH_RANDOM_URL,
+            params={"query": query, "count": self.batch_size, "client_id": self.access_key},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return [photo["urls"]["regular"] for photo in response.json()]
+
+
+class ImageCache:
+    def __init__(self, fetch, ttl=3600, max_queries=256):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_queries = max_queries
+        self.entries = OrderedDict()  # query -> (expires_at, deque of urls)
+        self.refreshing = set()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image-prefetch")
+        self.hits = self.misses = self.refreshes = self.errors = 0
+
+    def get(self, query):
+        """
+        Return ``(url, hit)`` for ``query``.
+
+        Raises requests.RequestException if the pool is cold and the upstream
+        call fails, or LookupError if Unsplash has no image for the query.
+        """
+        key = normalize_query(query)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[1]:
+                expires_at, urls = entry
+                self.entries.move_to_end(key)
+                self.hits += 1
+                url = urls[0]
+                urls.rotate(-1)
+                if expires_at <= time.monotonic():
+                    self._schedule_refresh(key)
+                return url, True
+            self.misses += 1
+
+        urls = self._load(key, serving=True)
+        if not urls:
+            raise LookupError(f"No images found for {key!r}")
+        return urls[0], False
+
+    def prefetch(self, queries):
+        with self.lock:
+            for query in queries:
+                self._schedule_refresh(normalize_query(query))
+
+    def stats(self):
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "errors": self.errors,
+                "queries": len(self.entries),
+            }
+
+    def _schedule_refresh(self, key):
+        # Caller holds the lock.
+        if key not in self.refreshing:
+            self.refreshing.add(key)
+            self.executor.submit(self._refresh, key)
+
+    def _refresh(self, key):
+        try:
+            self._load(key)
+        except Exception:
+            pass  # counted in _load; the stale pool keeps serving
+        finally:
+            with self.lock:
+                self.refreshing.discard(key)
+                self.refreshes += 1
+
+    def _load(self, key, serving=False):
+        try:
+            urls = self.fetch(key)
+        except Exception:
+            with self.lock:
+                self.errors += 1
+            raise
+        with self.lock:
+            if urls:
+                pool = deque(urls)
+                if serving:
+                    pool.rotate(-1)  # urls[0] is being returned right now
+                self.entries[key] = (time.monotonic() + self.ttl, pool)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_queries:
+                    self.entries.popitem(last=False)
+        return urls
+
+
+_cache = None
+_cache_access_key = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache(access_key):
+    """The process-wide cache, created (and warmed) on first use."""
+    global _cache, _cache_access_key
+    with _cache_lock:
+        if _cache is None or _cache_access_key != access_key:
+            client = UnsplashClient(access_key)
+            _cache_access_key = access_key
+            _cache = ImageCache(
+                client.fetch,
+                ttl=getattr(settings, "UNSPLASH_CACHE_TTL", 3600),
+                max_queries=getattr(settings, "UNSPLASH_CACHE_MAX_QUERIES", 256),
+            )
+            _cache.prefetch(getattr(settings, "UNSPLASH_PREFETCH_QUERIES", []))
+        return _cache
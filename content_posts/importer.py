@@ -0,0 +1,139 @@
+"""
+Streaming import of posts from NDJSON or CSV, used by
+/api/posts/import/ and the ``import_posts`` command.
+
+The input is read line by line and validated in chunks with one shared
+serializer. Each chunk's valid rows go in with a single bulk_create, so a
+bad row is reported by line number without holding back the rest of the
+file.
+"""
+import csv
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+
+from .bulk import validate_new_posts
+from .models import SocialPost
+from .serializers import SocialPostSerializer
+
+IMPORT_FORMATS = ('ndjson', 'csv')
+
+
+@dataclass
+class ImportResult:
+    lines: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def rows_per_second(self):
+        elapsed = time.monotonic() - self.started
+        return self.lines / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            'lines': self.lines,
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+        }
+
+
+def guess_format(name, default='ndjson'):
+    name = (name or '').lower().removesuffix('.gz')
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl', '.json')):
+        return 'ndjson'
+    return default
+
+
+class _ReadOnlyStream(io.RawIOBase):
+    """Raw-stream adapter for file-likes that only offer read(), such as HttpRequest."""
+
+    def __init__(self, source):
+        self.source = source
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self.source.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def text_stream(stream):
+    """Wrap a binary stream for line-by-line decoding (a leading BOM is dropped)."""
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    if not hasattr(stream, 'readable'):
+        stream = io.BufferedReader(_ReadOnlyStream(stream))
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+
+def iter_records(stream, import_format):
+    """Yield ``(line_number, item)`` where item is a dict or an error string."""
+    text = text_stream(stream)
+    if import_format == 'csv':
+        reader = csv.DictReader(text)
+        for row in reader:
+            row.pop(None, None)  # cells beyond the header
+            yield reader.line_num, row
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield line_number, f"Invalid JSON: {e}"
+            continue
+        yield line_number, item if isinstance(item, dict) else "Expected a JSON object."
+
+
+def import_posts(stream, import_format='ndjson', chunk_size=1000, max_errors=100, progress=None):
+    """
+    Import posts from ``stream`` (binary or text) and return an ImportResult.
+
+    Only the first ``max_errors`` errors are kept in ``result.errors``;
+    ``result.failed`` counts all of them. ``progress(result)`` is called
+    after each chunk.
+    """
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f"format must be one of: {', '.join(IMPORT_FORMATS)}")
+
+    result = ImportResult()
+    serializer = SocialPostSerializer()
+    records = iter_records(stream, import_format)
+
+    def fail(line, errors):
+        result.failed += 1
+        if len(result.errors) < max_errors:
+            result.errors.append({'line': line, 'errors': errors})
+
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        result.lines += len(chunk)
+        lines, items = [], []
+        for line, item in chunk:
+            if isinstance(item, str):
+                fail(line, {'non_field_errors': [item]})
+            else:
+                lines.append(line)
+                items.append(item)
+
+        posts, errors = validate_new_posts(items, serializer=serializer)
+        for error in errors:
+            fail(lines[error['index']], error['errors'])
+        if posts:
+            result.created += len(SocialPost.objects.bulk_create(posts))
+        if progress:
+            progress(result)
+    return result
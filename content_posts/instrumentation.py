@@ -0,0 +1,76 @@
+"""
+Query instrumentation built on ``connection.execute_wrapper``.
+
+``QueryTimer`` counts the queries run through a connection and their total
+time. ``QueryInspector`` also logs every query slower than
+``slow_query_ms`` to ``content_posts.queries``, with its EXPLAIN plan.
+
+content_posts.middleware.QueryInstrumentationMiddleware applies a
+QueryInspector to each request when ``QUERY_INSTRUMENTATION`` is on.
+"""
+import logging
+import time
+
+logger = logging.getLogger('content_posts.queries')
+
+
+class QueryTimer:
+    """``connection.execute_wrapper`` callable that counts queries and their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - started
+
+
+class QueryInspector(QueryTimer):
+    def __init__(self, slow_query_ms=200, explain=True):
+        super().__init__()
+        self.slow_query_ms = slow_query_ms
+        self.explain = explain
+        self.slow = []
+        self._explaining = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self._explaining:
+            # The EXPLAIN below goes through this wrapper too.
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.seconds += elapsed
+            if elapsed * 1000 >= self.slow_query_ms:
+                self.report(context['connection'], sql, params, many, elapsed)
+
+    def report(self, conn, sql, params, many, elapsed):
+        plan = self.plan(conn, sql, params) if self.explain and not many else None
+        self.slow.append({'sql': sql, 'duration_ms': round(elapsed * 1000, 2), 'plan': plan})
+        logger.warning(
+            'Slow query (%.1f ms): %s', elapsed * 1000, sql,
+            extra={'sql': sql, 'duration_ms': round(elapsed * 1000, 2), 'plan': plan},
+        )
+
+    def plan(self, conn, sql, params):
+        # Only plain reads: EXPLAIN on a write is not safe on every backend.
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            return None
+        self._explaining = True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(f'{conn.ops.explain_query_prefix()} {sql}', params)
+                return '\n'.join(' '.join(str(col) for col in row) for row in cursor.fetchall())
+        except Exception as e:
+            return f'EXPLAIN failed: {e}'
+        finally:
+            self._explaining = False
+
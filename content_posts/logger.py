@@ -1,11 +1,175 @@
-import logging  
-
-def setup_logger():  
-    """Set up the logger for the application."""  
-    logger = logging.getLogger('flask-api-service')  
-    logger.setLevel(logging.INFO)  
-    handler = logging.StreamHandler()  
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')  
-    handler.setFormatter(formatter)  
-    logger.addHandler(handler)  
+"""
+Structured, non-blocking logging for the ``content_posts`` logger tree.
+
+* Request threads only put records on a bounded queue (``QueueHandler``).
+  A ``QueueListener`` thread formats them and does the blocking write. If
+  the queue is full, the record is dropped and counted. The request never
+  waits on stderr.
+* Each record is one JSON line. It carries the request id, method and
+  route bound by ``RequestLogMiddleware``, plus any ``extra=`` fields.
+* ``LOG_SAMPLING`` keeps only a fraction of the records at a level, e.g.
+  ``{'DEBUG': 0.01}``. Sampling runs before the record is queued.
+* ``setup_logger()`` is idempotent. It installs the pipeline once per
+  process however often it is called. A forked child (gunicorn
+  ``--preload``, ``seed_posts --workers``) gets a new queue and listener
+  thread, because threads do not survive a fork.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+LOGGER_NAME = 'content_posts'
+
+_request_context = contextvars.ContextVar('log_request_context', default={})
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=``.
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName'}
+
+
+def bind_request(**fields):
+    """Attach ``fields`` to every record logged in this context; returns a token for ``unbind``."""
+    return _request_context.set({**_request_context.get(), **fields})
+
+
+def unbind(token):
+    _request_context.reset(token)
+
+
+def request_context():
+    return _request_context.get()
+
+
+class ContextFilter(logging.Filter):
+    """Copy the bound request context onto the record before it leaves the request thread."""
+
+    def filter(self, record):
+        for key, value in _request_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, rates=None):
+        super().__init__()
+        # {levelno: fraction kept}
+        self.rates = {logging._checkLevel(level): rate for level, rate in (rates or {}).items()}
+
+    def filter(self, record):
+        rate = self.rates.get(record.levelno)
+        return rate is None or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Render the message and traceback here: args and exc_info may not
+        # survive the trip to the listener thread.
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+_lock = threading.Lock()
+_handler = None
+_listener = None
+
+
+def setup_logger(level='INFO', sampling=None, queue_size=10000, stream=None):
+    """
+    Install the queue pipeline on the ``content_posts`` logger and return it.
+    Arguments only apply to the first call in a process.
+    """
+    global _handler, _listener
+    logger = logging.getLogger(LOGGER_NAME)
+    with _lock:
+        if _handler is None:
+            output = logging.StreamHandler(stream or sys.stderr)
+            output.setFormatter(JsonFormatter())
+            log_queue = queue.Queue(maxsize=queue_size)
+            _handler = DroppingQueueHandler(log_queue)
+            _handler.addFilter(SamplingFilter(sampling))
+            _handler.addFilter(ContextFilter())
+            _listener = _start_listener(log_queue, output)
+            atexit.register(_stop_listener)
+
+            logger.setLevel(level)
+            logger.addHandler(_handler)
+            logger.propagate = False
     return logger
+
+
+def _start_listener(log_queue, *handlers):
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def _restart_after_fork():
+    # The child inherits the queue but not the listener thread, and that
+    # thread may have held the queue's lock at the moment of the fork.
+    # Records still queued belong to the parent, which writes them.
+    global _lock, _listener
+    _lock = threading.Lock()
+    if _listener is not None:
+        log_queue = queue.Queue(maxsize=_handler.queue.maxsize)
+        _handler.queue = log_queue
+        _listener = _start_listener(log_queue, *_listener.handlers)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def flush():
+    """Block until every queued record has been written."""
+    if _listener is not None:
+        _listener.queue.join()
+
+
+def dropped():
+    return _handler.dropped if _handler is not None else 0
@@ -0,0 +1,187 @@
+import json
+import logging
+import platform
+import statistics
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from content_posts.instrumentation import QueryTimer
+from content_posts.models import SocialPost
+from content_posts.seeding import seed_posts
+
+BULK_ITEMS = 100
+
+
+def new_post(i):
+    return {"title": f"Benchmark post {i}", "content": "Benchmark content", "platform": "twitter", "status": "Draft"}
+
+
+def endpoints(ids):
+    """``(label, method, url or url(i), body(i) or None)`` for every benchmarked call."""
+    posts = reverse("posts-list")
+    return [
+        ("list", "get", f"{posts}?limit=50", None),
+        ("list (sparse fields)", "get", f"{posts}?limit=50&fields=title,platform,status", None),
+        ("detail", "get", lambda i: reverse("posts-detail", args=[ids[i % len(ids)]]), None),
+        # "launch" is a seeding.WORDS word, so most seeded posts contain it;
+        # "123" only matches a few titles.
+        ("search (broad)", "get", f"{reverse('posts-search')}?q=launch&limit=20", None),
+        ("search (narrow)", "get", f"{reverse('posts-search')}?q=123&limit=20", None),
+        ("create", "post", posts, new_post),
+        ("bulk create", "post", reverse("posts-bulk"), lambda i: [new_post(i) for _ in range(BULK_ITEMS)]),
+        ("bulk update", "patch", reverse("posts-bulk"),
+         lambda i: [{"id": ids[(i * BULK_ITEMS + n) % len(ids)], "engagement_score": i} for n in range(BULK_ITEMS)]),
+        ("analytics", "get", reverse("post-analytics"), None),
+        ("post stats", "get", reverse("post-stats"), None),
+        ("post stats (simple)", "get", reverse("post-stats-simple"), None),
+        ("dashboard stats", "get", reverse("dashboard-stats"), None),
+        ("timeseries (day)", "get", reverse("analytics-timeseries"), None),
+        ("timeseries (hour)", "get", f"{reverse('analytics-timeseries')}?bucket=hour", None),
+        ("best time", "get", reverse("best-time"), None),
+        ("html post list", "get", reverse("post_list_root"), None),
+        ("html dashboard", "get", reverse("dashboard"), None),
+    ]
+
+
+def percentiles(timings):
+    if len(timings) == 1:
+        return {"p50_ms": timings[0], "p95_ms": timings[0], "p99_ms": timings[0]}
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return {"p50_ms": cuts[49], "p95_ms": cuts[94], "p99_ms": cuts[98]}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the API in-process with Django's test client against seeded posts, "
+        "recording p50/p95/p99 and queries per call; optionally save or compare a JSON baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[1000],
+            help="Table sizes to benchmark at, e.g. --rows 1000 100000 1000000.",
+        )
+        parser.add_argument('--calls', type=int, default=50, help="Timed calls per endpoint.")
+        parser.add_argument('--warmup', type=int, default=3, help="Untimed calls per endpoint first.")
+        parser.add_argument('--output', help="Write the results to this JSON file.")
+        parser.add_argument('--compare', help="Compare against this JSON baseline and fail on regressions.")
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help="Relative p95 slowdown counted as a regression (default 0.2 = 20%%).",
+        )
+        parser.add_argument(
+            '--min-delta-ms', type=float, default=1.0,
+            help="Ignore p95 slowdowns smaller than this, however large relatively.",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        access_log = logging.getLogger('content_posts.access')
+        level = access_log.level
+        # Measure the views, not a thousand access lines on stderr.
+        access_log.setLevel(logging.WARNING)
+        try:
+            results = self.run(sorted(options['rows']), options['calls'], options['warmup'])
+        finally:
+            access_log.setLevel(level)
+
+        report = {
+            "meta": {
+                "created": timezone.now().isoformat(),
+                "vendor": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "calls": options['calls'],
+            },
+            "results": results,
+        }
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+        if baseline is not None:
+            self.compare(baseline, report, options['threshold'], options['min_delta_ms'])
+
+    def run(self, sizes, calls, warmup):
+        results = {}
+        # Everything, seeded rows and rows written by the calls, is rolled back.
+        with transaction.atomic():
+            seeded = 0
+            for rows in sizes:
+                started = time.perf_counter()
+                seeded += seed_posts(rows - seeded, seed=rows)
+                self.stdout.write(self.style.MIGRATE_HEADING(
+                    f"== {rows} posts (seeded in {time.perf_counter() - started:.1f}s)"
+                ))
+                ids = list(SocialPost.objects.order_by('?').values_list('id', flat=True)[:1000])
+                results[str(rows)] = self.run_endpoints(endpoints(ids), calls, warmup)
+            transaction.set_rollback(True)
+        return results
+
+    def run_endpoints(self, calls_to_make, calls, warmup):
+        client = Client()
+        results = {}
+        for label, method, url, body in calls_to_make:
+            timings, queries = [], 0
+            for i in range(warmup + calls):
+                path = url(i) if callable(url) else url
+                kwargs = {}
+                if body is not None:
+                    kwargs = {"data": json.dumps(body(i)), "content_type": "application/json"}
+                timer = QueryTimer()
+                with connection.execute_wrapper(timer):
+                    started = time.perf_counter()
+                    response = getattr(client, method)(path, **kwargs)
+                    elapsed = time.perf_counter() - started
+                if response.status_code >= 400:
+                    raise CommandError(f"{label}: {method.upper()} {path} returned {response.status_code}")
+                if i >= warmup:
+                    timings.append(elapsed * 1000)
+                    queries += timer.count
+            stats = {k: round(v, 3) for k, v in percentiles(timings).items()}
+            stats["queries"] = round(queries / len(timings), 2)
+            results[label] = stats
+            self.stdout.write(
+                f"{label:<22} p50 {stats['p50_ms']:8.2f}ms  p95 {stats['p95_ms']:8.2f}ms  "
+                f"p99 {stats['p99_ms']:8.2f}ms  {stats['queries']:g} queries"
+            )
+        return results
+
+    def compare(self, baseline, report, threshold, min_delta_ms):
+        self.stdout.write(self.style.MIGRATE_HEADING("== Compared with baseline"))
+        regressions = 0
+        for rows, endpoints_now in report["results"].items():
+            endpoints_then = baseline.get("results", {}).get(rows)
+            if endpoints_then is None:
+                self.stdout.write(f"{rows} posts: not in baseline")
+                continue
+            for label, now in endpoints_now.items():
+                then = endpoints_then.get(label)
+                if then is None:
+                    continue
+                problems = []
+                delta = now["p95_ms"] - then["p95_ms"]
+                if delta > min_delta_ms and now["p95_ms"] > then["p95_ms"] * (1 + threshold):
+                    problems.append(f"p95 {then['p95_ms']:.2f} -> {now['p95_ms']:.2f}ms")
+                if now["queries"] > then["queries"]:
+                    problems.append(f"queries {then['queries']:g} -> {now['queries']:g}")
+                change = f"{delta / then['p95_ms']:+.0%}" if then["p95_ms"] else "n/a"
+                line = f"{rows} posts, {label}: p95 {change}"
+                if problems:
+                    regressions += 1
+                    self.stdout.write(self.style.ERROR(f"{line}  REGRESSION ({'; '.join(problems)})"))
+                else:
+                    self.stdout.write(line)
+        if regressions:
+            raise CommandError(f"{regressions} regression(s) against {len(baseline.get('results', {}))} baseline size(s)")
+        self.stdout.write(self.style.SUCCESS("No regressions"))
@@ -0,0 +1,44 @@
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from content_posts.dispatch import Dispatcher
+from content_posts.fake_platform import FakePlatformServer
+from content_posts.models import SocialPost
+
+
+class Command(BaseCommand):
+    help = "Dispatch synthetic posts to a local fake platform server and report throughput."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=400)
+        parser.add_argument('--workers', type=int, default=16)
+        parser.add_argument('--latency', type=float, default=0.05, help="Simulated platform latency in seconds.")
+        parser.add_argument('--failure-rate', type=float, default=0.0)
+
+    def handle(self, *args, **options):
+        server = FakePlatformServer(latency=options['latency'], failure_rate=options['failure_rate']).start()
+        try:
+            platforms = [choice for choice, _ in SocialPost.PLATFORM_CHOICES]
+            posts = [
+                SocialPost(id=i, title=f"Post {i}", content="Benchmark", platform=platforms[i % len(platforms)])
+                for i in range(options['posts'])
+            ]
+            dispatcher = Dispatcher(base_url=server.url, max_workers=options['workers'], backoff=0.05)
+
+            started = time.perf_counter()
+            results = dispatcher.dispatch(posts)
+            elapsed = time.perf_counter() - started
+        finally:
+            server.stop()
+
+        ok = Counter(result.platform for result in results if result.ok)
+        failed = Counter(result.platform for result in results if not result.ok)
+        for platform in platforms:
+            rate, burst = dispatcher.buckets[platform].rate, dispatcher.buckets[platform].capacity
+            self.stdout.write(
+                f"{platform}: {ok[platform]} published, {failed[platform]} failed "
+                f"(limit {rate:g}/s, burst {burst:g})"
+            )
+        self.stdout.write(f"{len(results)} posts in {elapsed:.2f}s ({len(results) / elapsed:.1f} posts/s)")
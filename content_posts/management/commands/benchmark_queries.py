@@ -0,0 +1,84 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from content_posts.models import SocialPost
+from content_posts.seeding import seed_posts
+
+
+def hot_queries():
+    """The filter/order paths used by the list, stats, dashboard and planner views."""
+    now = timezone.now()
+    posts = SocialPost.objects.all()
+    return [
+        ("latest posts", posts.order_by('-created_at', '-id')[:50]),
+        ("platform feed", posts.filter(platform='instagram').order_by('-created_at', '-id')[:50]),
+        ("count by status", posts.filter(status='Draft').values('status').annotate(count=Count('id'))),
+        ("count by platform", posts.values('platform').annotate(count=Count('id'))),
+        ("due scheduled posts", posts.filter(status='Scheduled', scheduled_time__lte=now).order_by('scheduled_time')[:100]),
+        ("planner range", posts.filter(status='Scheduled', scheduled_time__range=(now, now + timedelta(days=7)))),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Seed SocialPost rows and compare EXPLAIN plans and timings with and without the hot-path indexes."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100_000, help="Number of posts to seed.")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per query.")
+        parser.add_argument(
+            '--keep', action='store_true',
+            help="Keep the seeded rows instead of rolling everything back.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['rows']:
+                started = time.perf_counter()
+                inserted = seed_posts(options['rows'])
+                self.stdout.write(f"Seeded {inserted} posts in {time.perf_counter() - started:.2f}s")
+            self.analyze()
+
+            # Dropping the indexes inside a savepoint lets us measure the
+            # "before" plans without leaving the schema modified.
+            with transaction.atomic():
+                self.stdout.write(self.style.MIGRATE_HEADING("== Before (no indexes)"))
+                self.drop_indexes()
+                self.analyze()
+                self.run_queries(options['repeat'])
+                transaction.set_rollback(True)
+
+            self.stdout.write(self.style.MIGRATE_HEADING("== After (with indexes)"))
+            self.analyze()
+            self.run_queries(options['repeat'])
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+
+    def drop_indexes(self):
+        with connection.cursor() as cursor:
+            for index in SocialPost._meta.indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+
+    def analyze(self):
+        if connection.vendor in ('postgresql', 'sqlite'):
+            with connection.cursor() as cursor:
+                cursor.execute(f"ANALYZE {SocialPost._meta.db_table}")
+
+    def run_queries(self, repeat):
+        for label, queryset in hot_queries():
+            timings = []
+            for _ in range(max(repeat, 1)):
+                started = time.perf_counter()
+                list(queryset.all())
+                timings.append((time.perf_counter() - started) * 1000)
+            self.stdout.write(self.style.SQL_FIELD(
+                f"{label}: median {statistics.median(timings):.2f}ms, best {min(timings):.2f}ms"
+            ))
+            self.stdout.write(queryset.explain())
+            self.stdout.write("")
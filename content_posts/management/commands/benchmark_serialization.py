@@ -0,0 +1,57 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from content_posts.models import SocialPost
+from content_posts.renderers import ORJSONRenderer, orjson
+from content_posts.rows import post_rows
+from content_posts.seeding import seed_posts
+from content_posts.serializers import SocialPostSerializer
+
+
+def serializer_data(queryset):
+    return SocialPostSerializer(queryset, many=True).data
+
+
+def fast_path_data(queryset):
+    return post_rows.represent(post_rows.values(queryset))
+
+
+class Command(BaseCommand):
+    help = "Compare CPU time of the SocialPostSerializer list path with the .values() fast path and orjson renderer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20_000, help="Number of posts to seed and render.")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per variant.")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; ORJSONRenderer falls back to json."))
+        variants = [
+            ("serializer + JSONRenderer", serializer_data, JSONRenderer()),
+            ("serializer + ORJSONRenderer", serializer_data, ORJSONRenderer()),
+            ("fast path + JSONRenderer", fast_path_data, JSONRenderer()),
+            ("fast path + ORJSONRenderer", fast_path_data, ORJSONRenderer()),
+        ]
+        with transaction.atomic():
+            seed_posts(options['rows'])
+            queryset = SocialPost.objects.order_by('-created_at', '-id')
+            rows = queryset.count()
+            baseline = None
+            for label, build, renderer in variants:
+                cpu, wall = [], []
+                for _ in range(max(options['repeat'], 1)):
+                    started_cpu, started_wall = time.process_time(), time.perf_counter()
+                    renderer.render(build(queryset.all()))
+                    cpu.append(time.process_time() - started_cpu)
+                    wall.append(time.perf_counter() - started_wall)
+                median_cpu = statistics.median(cpu)
+                baseline = baseline or median_cpu
+                self.stdout.write(self.style.SQL_FIELD(
+                    f"{label}: cpu {median_cpu * 1000:.1f}ms, wall {statistics.median(wall) * 1000:.1f}ms, "
+                    f"{rows / median_cpu:,.0f} rows/s, {baseline / median_cpu:.1f}x"
+                ))
+            transaction.set_rollback(True)
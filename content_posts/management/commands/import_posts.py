@@ -0,0 +1,46 @@
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from content_posts.importer import IMPORT_FORMATS, guess_format, import_posts
+
+
+class Command(BaseCommand):
+    help = "Import posts from an NDJSON or CSV file (optionally gzipped); '-' reads stdin."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help="Defaults to the file extension, else ndjson.")
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--max-errors', type=int, default=100, help="How many line errors to print.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        import_format = options['format'] or guess_format(path)
+
+        def progress(result):
+            self.stdout.write(
+                f"{result.lines} lines, {result.created} created, {result.failed} failed "
+                f"({result.rows_per_second:,.0f} rows/s)"
+            )
+
+        try:
+            if path == '-':
+                stream = sys.stdin.buffer
+            elif path.endswith('.gz'):
+                stream = gzip.open(path, 'rb')
+            else:
+                stream = open(path, 'rb')
+        except OSError as e:
+            raise CommandError(e)
+        with stream:
+            result = import_posts(
+                stream, import_format,
+                chunk_size=options['chunk_size'], max_errors=options['max_errors'], progress=progress,
+            )
+
+        for error in result.errors:
+            self.stdout.write(self.style.ERROR(f"line {error['line']}: {error['errors']}"))
+        summary = f"Imported {result.created} of {result.lines} lines; {result.failed} failed."
+        self.stdout.write(self.style.WARNING(summary) if result.failed else self.style.SUCCESS(summary))
@@ -0,0 +1,170 @@
+import heapq
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from content_posts.dispatch import Dispatcher
+from content_posts.models import SocialPost
+
+
+class DueQueue:
+    """
+    Min-heap of (scheduled_time, id) for Scheduled posts inside a look-ahead window.
+
+    It only decides how long the publisher sleeps: the claim query re-checks
+    status and time in the database, so stale entries are harmless. Each
+    refresh loads just the posts scheduled past the previous horizon or
+    created since the previous refresh.
+    """
+
+    def __init__(self, lookahead, limit=10_000):
+        self.lookahead = lookahead
+        self.limit = limit
+        self.heap = []
+        self.queued = set()
+        self.horizon = None
+        self.max_id = 0
+
+    def refresh(self, now):
+        horizon = now + self.lookahead
+        posts = SocialPost.objects.filter(status='Scheduled', scheduled_time__lte=horizon)
+        if self.horizon is not None:
+            posts = posts.filter(Q(scheduled_time__gt=self.horizon) | Q(id__gt=self.max_id))
+        rows = list(posts.order_by('scheduled_time').values_list('scheduled_time', 'id')[:self.limit])
+        for when, pk in rows:
+            self.max_id = max(self.max_id, pk)
+            if pk not in self.queued:
+                heapq.heappush(self.heap, (when, pk))
+                self.queued.add(pk)
+        # If the window was truncated, only advance as far as we actually read.
+        self.horizon = rows[-1][0] if len(rows) == self.limit else horizon
+
+    def discard_due(self, now):
+        while self.heap and self.heap[0][0] <= now:
+            _, pk = heapq.heappop(self.heap)
+            self.queued.discard(pk)
+
+    def next_due(self):
+        return self.heap[0][0] if self.heap else None
+
+
+def claim_due_posts(now, batch_size, status='Published', stale_after=None, exclude=()):
+    """
+    Atomically move up to ``batch_size`` due posts from Scheduled to
+    ``status`` and return their ids.
+
+    The dispatching publisher claims into Publishing and only marks a post
+    Published once the platform accepted it. With ``stale_after``, posts
+    left in Publishing for longer than that (their publisher died
+    mid-dispatch) are claimed again. ``exclude`` skips ids, e.g. posts that
+    already failed in this pass.
+
+    SKIP LOCKED lets several publishers run side by side: rows another
+    worker is claiming are skipped instead of waited on. Backends without
+    row locks (SQLite) serialise writers anyway.
+    """
+    due = Q(status='Scheduled', scheduled_time__lte=now)
+    if stale_after is not None:
+        due |= Q(status='Publishing', claimed_at__lte=now - stale_after)
+    with transaction.atomic():
+        ids = list(
+            SocialPost.objects.select_for_update(skip_locked=True)
+            .filter(due)
+            .exclude(id__in=exclude)
+            .order_by('scheduled_time')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if ids:
+            claimed_at = now if status == 'Publishing' else None
+            SocialPost.objects.filter(id__in=ids).update(status=status, claimed_at=claimed_at)
+    return ids
+
+
+class Command(BaseCommand):
+    help = "Publish Scheduled posts whose scheduled_time has passed. Safe to run as several replicas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Posts claimed per transaction.")
+        parser.add_argument(
+            '--max-sleep', type=float, default=30.0,
+            help="Upper bound in seconds between polls, so edited schedules are picked up.",
+        )
+        parser.add_argument(
+            '--lookahead', type=int, default=3600,
+            help="Seconds of upcoming schedule kept in memory to compute the next wake-up.",
+        )
+        parser.add_argument('--once', action='store_true', help="Publish what is due now and exit.")
+        parser.add_argument(
+            '--dispatch', action='store_true',
+            help="Push claimed posts to the platform APIs. Transient failures go back to Scheduled, "
+                 "rejected posts go back to Draft.",
+        )
+        parser.add_argument('--workers', type=int, default=16, help="Concurrent requests per platform.")
+        parser.add_argument(
+            '--claim-timeout', type=int, default=600,
+            help="Seconds after which a post still Publishing (its publisher died mid-dispatch) is "
+                 "claimed again. Must exceed the longest dispatch, or a post may be sent twice.",
+        )
+
+    def handle(self, *args, **options):
+        queue = DueQueue(timedelta(seconds=options['lookahead']))
+        self.dispatcher = Dispatcher(max_workers=options['workers']) if options['dispatch'] else None
+        self.claim_timeout = timedelta(seconds=options['claim_timeout'])
+        try:
+            while True:
+                now = timezone.now()
+                published = self.publish_due(now, options['batch_size'])
+                if published:
+                    self.stdout.write(f"Published {published} post(s)")
+                if options['once']:
+                    return
+
+                queue.refresh(now)
+                queue.discard_due(now)
+                close_old_connections()
+                time.sleep(self.sleep_seconds(queue, options['max_sleep']))
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping publisher.")
+
+    def publish_due(self, now, batch_size):
+        published = 0
+        # Posts that failed in this pass. Retryable ones are due again at
+        # once, so they are skipped until the next pass rather than ending
+        # this one: one platform being down must not stall the others.
+        failed = set()
+        while True:
+            if self.dispatcher:
+                ids = claim_due_posts(
+                    now, batch_size, status='Publishing', stale_after=self.claim_timeout, exclude=failed,
+                )
+                failed.update(self.dispatch(ids) if ids else ())
+                published += len(set(ids) - failed)
+            else:
+                ids = claim_due_posts(now, batch_size)
+                published += len(ids)
+            if len(ids) < batch_size:
+                return published
+
+    def dispatch(self, ids):
+        """Push the claimed posts out, settle their status and return the ids that failed."""
+        results = self.dispatcher.dispatch(SocialPost.objects.filter(id__in=ids))
+        sent = [result.post_id for result in results if result.ok]
+        retry = [result.post_id for result in results if not result.ok and result.retryable]
+        rejected = [result.post_id for result in results if not result.ok and not result.retryable]
+        for pks, status in ((sent, 'Published'), (retry, 'Scheduled'), (rejected, 'Draft')):
+            if pks:
+                SocialPost.objects.filter(id__in=pks).update(status=status, claimed_at=None)
+        for result in results:
+            if not result.ok:
+                self.stderr.write(f"Post {result.post_id} ({result.platform}): {result.error}")
+        return retry + rejected
+
+    def sleep_seconds(self, queue, max_sleep):
+        next_due = queue.next_due()
+        if next_due is None:
+            return max_sleep
+        return min(max_sleep, max(0.0, (next_due - timezone.now()).total_seconds()))
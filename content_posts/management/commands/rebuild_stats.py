@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+
+from content_posts.models import ROLLUP_TABLES
+
+
+class Command(BaseCommand):
+    help = "Recompute the rollup tables (PostStatsRollup, PostDailyRollup) from the posts table and fix any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help="Report drift without writing the corrected values.",
+        )
+        parser.add_argument(
+            '--table', choices=[table.__name__ for table in ROLLUP_TABLES],
+            help="Only rebuild this rollup (default: all of them).",
+        )
+
+    def handle(self, *args, **options):
+        for table in ROLLUP_TABLES:
+            if options['table'] and table.__name__ != options['table']:
+                continue
+            self.rebuild(table, options['dry_run'])
+
+    def rebuild(self, table, dry_run):
+        name = table.__name__
+        drift = table.rebuild(dry_run=dry_run)
+        for *key, stored, actual in drift:
+            self.stdout.write(
+                f"{name} {'/'.join(map(str, key))}: stored count={stored[0]} engagement={stored[1]}, "
+                f"actual count={actual[0]} engagement={actual[1]}"
+            )
+        if not drift:
+            self.stdout.write(self.style.SUCCESS(f"{name} is in sync."))
+        elif dry_run:
+            self.stdout.write(self.style.WARNING(f"{len(drift)} cell(s) out of sync in {name}."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Fixed {len(drift)} cell(s) in {name}."))
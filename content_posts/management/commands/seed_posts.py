@@ -0,0 +1,45 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from content_posts.seeding import seed_posts
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert realistic generated posts for load testing: skewed platform/status mixes, "
+        "platform-dependent content lengths, hashtags and a year of history. Deterministic per --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('rows', type=int, nargs='?', default=1000, help="Number of posts to insert.")
+        parser.add_argument('--seed', type=int, default=0, help="Same seed and --now, same rows.")
+        parser.add_argument(
+            '--workers', type=int, default=1,
+            help="Processes generating rows; 0 for one per CPU. Inserts stay in this process.",
+        )
+        parser.add_argument(
+            '--now',
+            help="ISO datetime the generated dates are relative to (default: the current time).",
+        )
+
+    def handle(self, *args, **options):
+        if options['rows'] < 0:
+            raise CommandError("rows must not be negative")
+        now = None
+        if options['now']:
+            now = parse_datetime(options['now'])
+            if now is None:
+                raise CommandError(f"Invalid --now: {options['now']!r}")
+            if timezone.is_naive(now):
+                now = timezone.make_aware(now)
+        workers = options['workers'] or os.cpu_count() or 1
+
+        started = time.perf_counter()
+        inserted = seed_posts(options['rows'], seed=options['seed'], workers=workers, now=now)
+        elapsed = time.perf_counter() - started
+        rate = f" ({inserted / elapsed:,.0f} rows/s)" if elapsed else ""
+        self.stdout.write(self.style.SUCCESS(f"Seeded {inserted} posts in {elapsed:.2f}s{rate}"))
@@ -0,0 +1,243 @@
+"""
+Request metrics in the Prometheus text format, served at /api/metrics.
+
+``MetricsMiddleware`` records per-view counters, latency histograms and
+in-flight gauges. It also counts DB queries and time, and outbound HTTP
+time, for each request. Views are labelled by their resolved URL name.
+
+In a single process, the endpoint renders this process's registry. With
+``METRICS_DIR`` set (default: ``$PROMETHEUS_MULTIPROC_DIR``), every
+gunicorn worker writes its snapshot to ``<dir>/<pid>.json``. A background
+thread does this at most every ``METRICS_FLUSH_INTERVAL`` seconds, and it
+is also done just before a scrape. The endpoint sums the files, so any
+worker can answer. Counters and histograms of workers that have exited
+are kept. Their gauges are dropped. Clear the directory when the server
+is (re)started.
+
+Only the standard library is used.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+COUNTER, GAUGE, HISTOGRAM = 'counter', 'gauge', 'histogram'
+
+METRICS = {
+    'http_requests_total': (COUNTER, 'HTTP requests by view, method and status.'),
+    'http_request_duration_seconds': (HISTOGRAM, 'HTTP request latency by view.'),
+    'http_requests_in_flight': (GAUGE, 'HTTP requests currently being handled, by view.'),
+    'db_queries_total': (COUNTER, 'Database queries run while handling requests, by view.'),
+    'db_query_duration_seconds_total': (COUNTER, 'Time spent in database queries, by view.'),
+    'outbound_requests_total': (COUNTER, 'Outbound HTTP calls made while handling requests, by view.'),
+    'outbound_request_duration_seconds_total': (COUNTER, 'Time spent in outbound HTTP calls, by view.'),
+}
+
+
+def _key(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+        self.values = {}
+        # {key: [count per bucket..., count above the last bucket, sum]}
+        self.histograms = {}
+        self.dirty = False
+
+    def _check_fork(self):
+        # Caller holds the lock. A worker forked from a process that already
+        # recorded metrics starts from zero rather than re-reporting them.
+        if self.pid != os.getpid():
+            self.pid = os.getpid()
+            self.values.clear()
+            self.histograms.clear()
+
+    def inc(self, name, labels, amount=1):
+        key = _key(name, labels)
+        with self.lock:
+            self._check_fork()
+            self.values[key] = self.values.get(key, 0) + amount
+            self.dirty = True
+
+    def observe(self, name, labels, value):
+        key = _key(name, labels)
+        with self.lock:
+            self._check_fork()
+            counts = self.histograms.get(key)
+            if counts is None:
+                counts = self.histograms[key] = [0] * (len(DURATION_BUCKETS) + 2)
+            counts[bisect_left(DURATION_BUCKETS, value)] += 1
+            counts[-1] += value
+            self.dirty = True
+
+    def snapshot(self):
+        with self.lock:
+            self._check_fork()
+            self.dirty = False
+            return {
+                'pid': self.pid,
+                'values': [[name, list(labels), value] for (name, labels), value in self.values.items()],
+                'histograms': [[name, list(labels), list(counts)] for (name, labels), counts in self.histograms.items()],
+            }
+
+
+registry = Registry()
+
+
+def merge(snapshots, live_pids=None):
+    """Sum snapshots into ``(values, histograms)``; gauges only count for ``live_pids`` (None: all)."""
+    values, histograms = {}, {}
+    for snapshot in snapshots:
+        alive = live_pids is None or snapshot['pid'] in live_pids
+        for name, labels, value in snapshot['values']:
+            if METRICS[name][0] == GAUGE and not alive:
+                continue
+            key = (name, tuple(tuple(pair) for pair in labels))
+            values[key] = values.get(key, 0) + value
+        for name, labels, counts in snapshot['histograms']:
+            key = (name, tuple(tuple(pair) for pair in labels))
+            total = histograms.setdefault(key, [0] * len(counts))
+            for i, count in enumerate(counts):
+                total[i] += count
+    return values, histograms
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _number(value):
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render(values, histograms):
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == HISTOGRAM:
+            for (metric, labels), counts in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(DURATION_BUCKETS, counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_labels(labels, [("le", bound)])} {cumulative}')
+                cumulative += counts[-2]
+                lines.append(f'{name}_bucket{_labels(labels, [("le", "+Inf")])} {cumulative}')
+                lines.append(f'{name}_sum{_labels(labels)} {_number(counts[-1])}')
+                lines.append(f'{name}_count{_labels(labels)} {cumulative}')
+        else:
+            for (metric, labels), value in sorted(values.items()):
+                if metric == name:
+                    lines.append(f'{name}{_labels(labels)} {_number(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SnapshotWriter:
+    """Writes ``registry`` to ``<directory>/<pid>.json`` whenever it changed, from a daemon thread."""
+
+    def __init__(self, directory, interval=1.0):
+        self.directory = directory
+        self.interval = interval
+        self.pid = None
+        self.lock = threading.Lock()
+
+    def ensure_started(self):
+        # Started lazily, in each worker, after gunicorn has forked.
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid != os.getpid():
+                self.pid = os.getpid()
+                os.makedirs(self.directory, exist_ok=True)
+                threading.Thread(target=self._run, name='metrics-writer', daemon=True).start()
+                atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            if registry.dirty:
+                self.flush()
+
+    def flush(self):
+        try:
+            self.write()
+        except OSError:
+            # Directory gone or full; the next flush or scrape retries.
+            pass
+
+    def write(self):
+        snapshot = registry.snapshot()
+        path = os.path.join(self.directory, f"{snapshot['pid']}.json")
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(snapshot, f)
+        os.replace(tmp, path)
+
+    def collect(self):
+        self.write()
+        snapshots = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        live = {s['pid'] for s in snapshots if _pid_alive(s['pid'])}
+        return merge(snapshots, live)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    """The process's SnapshotWriter, or None when METRICS_DIR is not set."""
+    global _writer
+    from django.conf import settings
+
+    directory = getattr(settings, 'METRICS_DIR', None)
+    if not directory:
+        return None
+    with _writer_lock:
+        if _writer is None or _writer.directory != directory:
+            _writer = SnapshotWriter(directory, getattr(settings, 'METRICS_FLUSH_INTERVAL', 1.0))
+        return _writer
+
+
+def exposition():
+    """The Prometheus text for this process, or for every worker in multi-process mode."""
+    writer = get_writer()
+    if writer is None:
+        return render(*merge([registry.snapshot()]))
+    return render(*writer.collect())
+
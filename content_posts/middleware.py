@@ -0,0 +1,131 @@
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+
+from . import metrics, outbound
+from .instrumentation import QueryInspector, QueryTimer
+from .logger import bind_request, unbind
+from .outbound import deadline
+
+access_logger = logging.getLogger('content_posts.access')
+query_logger = logging.getLogger('content_posts.queries')
+
+
+class OutboundDeadlineMiddleware:
+    """Give each request a total budget for its outbound HTTP calls (OUTBOUND_DEADLINE_SECONDS)."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with deadline(getattr(settings, 'OUTBOUND_DEADLINE_SECONDS', 8)):
+            return self.get_response(request)
+
+
+class RequestLogMiddleware:
+    """
+    Bind a request id (the caller's X-Request-ID, or a fresh one) to every
+    log record made while handling the request, echo it back in the
+    response, and log one access line with the route, status and duration.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+        token = bind_request(request_id=request_id, method=request.method)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            unbind(token)
+        match = request.resolver_match
+        access_logger.info(
+            '%s %s %s', request.method, request.path, response.status_code,
+            extra={
+                'request_id': request_id,
+                'method': request.method,
+                'route': match.route if match else None,
+                'status': response.status_code,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+            },
+        )
+        response['X-Request-ID'] = request_id
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # Undone with the rest of the context by unbind() in __call__.
+        bind_request(route=request.resolver_match.route)
+
+
+class MetricsMiddleware:
+    """
+    Record request count, latency, in-flight requests, DB queries and
+    outbound HTTP time per resolved URL name (see content_posts.metrics).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        writer = metrics.get_writer()
+        if writer is not None:
+            writer.ensure_started()
+        queries = QueryTimer()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(queries), outbound.track() as calls:
+                response = self.get_response(request)
+        finally:
+            view = getattr(request, '_metrics_view', None)
+            if view is not None:
+                metrics.registry.inc('http_requests_in_flight', {'view': view}, -1)
+        elapsed = time.perf_counter() - started
+
+        labels = {'view': view or 'unmatched'}
+        registry = metrics.registry
+        registry.inc('http_requests_total', {**labels, 'method': request.method, 'status': response.status_code})
+        registry.observe('http_request_duration_seconds', labels, elapsed)
+        if queries.count:
+            registry.inc('db_queries_total', labels, queries.count)
+            registry.inc('db_query_duration_seconds_total', labels, queries.seconds)
+        if calls.calls:
+            registry.inc('outbound_requests_total', labels, calls.calls)
+            registry.inc('outbound_request_duration_seconds_total', labels, calls.seconds)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        request._metrics_view = match.view_name or match.route
+        metrics.registry.inc('http_requests_in_flight', {'view': request._metrics_view})
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Opt-in (QUERY_INSTRUMENTATION): count each request's queries and their
+    time, reported in a Server-Timing header and a DEBUG log line, and log
+    queries slower than SLOW_QUERY_MS with their EXPLAIN plan.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_INSTRUMENTATION', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_query_ms = getattr(settings, 'SLOW_QUERY_MS', 200)
+
+    def __call__(self, request):
+        inspector = QueryInspector(self.slow_query_ms)
+        with connection.execute_wrapper(inspector):
+            response = self.get_response(request)
+        db_ms = round(inspector.seconds * 1000, 2)
+        response['Server-Timing'] = f'db;desc="{inspector.count} queries";dur={db_ms}'
+        query_logger.debug(
+            '%s queries in %.1f ms', inspector.count, db_ms,
+            extra={'queries': inspector.count, 'db_ms': db_ms, 'slow_queries': len(inspector.slow)},
+        )
+        return response
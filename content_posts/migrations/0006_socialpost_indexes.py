@@ -0,0 +1,29 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_posts', '0005_alter_socialpost_platform'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='socialpost',
+            index=models.Index(fields=['-created_at', '-id'], name='post_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialpost',
+            index=models.Index(fields=['platform', '-created_at'], name='post_platform_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialpost',
+            index=models.Index(fields=['status', 'scheduled_time'], name='post_status_scheduled_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='socialpost',
+            index=models.Index(condition=models.Q(('status', 'Scheduled')), fields=['scheduled_time'], name='post_due_scheduled_idx'),
+        ),
+    ]
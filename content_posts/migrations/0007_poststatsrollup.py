@@ -0,0 +1,47 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:05
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_rollup(apps, schema_editor):
+    SocialPost = apps.get_model('content_posts', 'SocialPost')
+    PostStatsRollup = apps.get_model('content_posts', 'PostStatsRollup')
+    rows = (
+        SocialPost.objects.order_by()
+        .values('platform', 'status')
+        .annotate(count=Count('id'), engagement=Sum('engagement_score'))
+    )
+    PostStatsRollup.objects.bulk_create([
+        PostStatsRollup(
+            platform=row['platform'],
+            status=row['status'],
+            post_count=row['count'],
+            engagement_total=row['engagement'] or 0,
+        )
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_posts', '0006_socialpost_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostStatsRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(max_length=50)),
+                ('status', models.CharField(max_length=20)),
+                ('post_count', models.BigIntegerField(default=0)),
+                ('engagement_total', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('platform', 'status'), name='unique_stats_rollup_cell')],
+            },
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
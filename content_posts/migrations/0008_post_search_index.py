@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from content_posts import search
+
+
+def install_search(apps, schema_editor):
+    search.get_backend(schema_editor.connection).install(schema_editor.connection)
+
+
+def uninstall_search(apps, schema_editor):
+    search.get_backend(schema_editor.connection).uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_posts', '0007_poststatsrollup'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
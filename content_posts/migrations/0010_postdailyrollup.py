@@ -0,0 +1,52 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:25
+
+from datetime import timezone
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def populate_daily_rollup(apps, schema_editor):
+    SocialPost = apps.get_model('content_posts', 'SocialPost')
+    PostDailyRollup = apps.get_model('content_posts', 'PostDailyRollup')
+    rows = (
+        SocialPost.objects.order_by()
+        .annotate(day=TruncDate('created_at', tzinfo=timezone.utc))
+        .values('platform', 'day')
+        .annotate(count=Count('id'), engagement=Sum('engagement_score'))
+    )
+    PostDailyRollup.objects.bulk_create([
+        PostDailyRollup(
+            platform=row['platform'],
+            day=row['day'],
+            post_count=row['count'],
+            engagement_total=row['engagement'] or 0,
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_posts', '0009_socialpost_versions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('platform', models.CharField(max_length=50)),
+                ('day', models.DateField()),
+                ('post_count', models.BigIntegerField(default=0)),
+                ('engagement_total', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='daily_rollup_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('platform', 'day'), name='unique_daily_rollup_cell')],
+            },
+        ),
+        migrations.RunPython(populate_daily_rollup, migrations.RunPython.noop),
+    ]
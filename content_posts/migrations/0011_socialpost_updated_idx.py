@@ -0,0 +1,17 @@
+# Generated by Django 5.2.10 on 2026-10-18 10:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_posts', '0010_postdailyrollup'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='socialpost',
+            index=models.Index(fields=['updated_at'], name='post_updated_idx'),
+        ),
+    ]
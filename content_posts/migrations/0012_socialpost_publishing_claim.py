@@ -0,0 +1,23 @@
+# Generated by Django 5.2.10 on 2026-10-18 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content_posts', '0011_socialpost_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='socialpost',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name='socialpost',
+            name='status',
+            field=models.CharField(choices=[('Draft', 'Draft'), ('Scheduled', 'Scheduled'), ('Publishing', 'Publishing'), ('Published', 'Published')], default='Draft', max_length=20),
+        ),
+    ]
@@ -1,4 +1,181 @@
-from django.db import models
+from datetime import timezone as dt_timezone
+
+from django.db import connections, models, router, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+# Fields that feed the rollup tables (PostStatsRollup, PostDailyRollup).
+STATS_FIELDS = ('platform', 'status', 'engagement_score', 'created_at')
+
+# Keeps IN (...) lists well below SQLite's bound-parameter limit.
+PK_CHUNK_SIZE = 500
+
+# Rollup cells per INSERT ... ON CONFLICT; four parameters each.
+ROLLUP_UPSERT_CHUNK_SIZE = 200
+
+
+def _chunks(items, size=PK_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _merge_grid(grid, other):
+    for key, (count, engagement) in other.items():
+        cell = grid.setdefault(key, [0, 0])
+        cell[0] += count
+        cell[1] += engagement
+    return grid
+
+
+def _stats_grid(rows):
+    """Build a {(platform, status): [count, engagement]} grid from STATS_FIELDS rows."""
+    grid = {}
+    for platform, status, engagement, _ in rows:
+        cell = grid.setdefault((platform, status), [0, 0])
+        cell[0] += 1
+        cell[1] += engagement or 0
+    return grid
+
+
+def queryset_stats_grid(queryset):
+    """Same grid as _stats_grid, computed with a single GROUP BY over ``queryset``."""
+    rows = (
+        queryset.order_by()
+        .values('platform', 'status')
+        .annotate(count=Count('id'), engagement=Sum('engagement_score'))
+    )
+    return {(row['platform'], row['status']): [row['count'], row['engagement'] or 0] for row in rows}
+
+
+def utc_day(moment):
+    return moment.astimezone(dt_timezone.utc).date() if timezone.is_aware(moment) else moment.date()
+
+
+def _daily_grid(rows):
+    """Build a {(platform, day): [count, engagement]} grid from STATS_FIELDS rows; days are UTC dates."""
+    grid = {}
+    for platform, _, engagement, created_at in rows:
+        cell = grid.setdefault((platform, utc_day(created_at)), [0, 0])
+        cell[0] += 1
+        cell[1] += engagement or 0
+    return grid
+
+
+class UTCDate(TruncDate):
+    """
+    UTC calendar date of a datetime. SQLite stores datetimes as naive UTC
+    text, so its native date() applies directly, rather than TruncDate's
+    per-row Python function.
+    """
+
+    def __init__(self, expression, **extra):
+        super().__init__(expression, tzinfo=dt_timezone.utc, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        sql, params = compiler.compile(self.lhs)
+        return f"date({sql})", params
+
+
+def queryset_daily_grid(queryset):
+    """Same grid as _daily_grid, computed with a single GROUP BY over ``queryset``."""
+    rows = (
+        queryset.order_by()
+        .annotate(day=UTCDate('created_at'))
+        .values('platform', 'day')
+        .annotate(count=Count('id'), engagement=Sum('engagement_score'))
+    )
+    return {(row['platform'], row['day']): [row['count'], row['engagement'] or 0] for row in rows}
+
+
+def _apply_rollups(added=(), removed=(), using=None):
+    """Apply the rollup deltas for STATS_FIELDS rows added to / removed from the posts table."""
+    for table in ROLLUP_TABLES:
+        table.apply(added=table.grid(added), removed=table.grid(removed), using=using)
+
+
+class SocialPostQuerySet(models.QuerySet):
+    """
+    QuerySet whose bulk write paths keep the rollup tables in step with the
+    posts table inside the same transaction.
+
+    Lock order, for every write path here and in SocialPost.save()/delete():
+    posts rows, then rollup cells (table by table, cells sorted, see
+    RollupTable.apply), then the TableVersion row. Taking them in any other
+    order can deadlock against a concurrent writer on PostgreSQL.
+    """
+
+    def _plain(self):
+        return models.QuerySet(self.model, using=self.db)
+
+    def _pk_grids(self, pks):
+        grids = {table: {} for table in ROLLUP_TABLES}
+        for chunk in _chunks(pks):
+            queryset = self._plain().filter(pk__in=chunk)
+            for table, grid in grids.items():
+                _merge_grid(grid, table.queryset_grid(queryset))
+        return grids
+
+    def bulk_create(self, objs, *args, **kwargs):
+        if kwargs.get('ignore_conflicts') or kwargs.get('update_conflicts'):
+            # Skipped or updated rows would be counted as inserted.
+            raise ValueError("SocialPost.objects.bulk_create() does not support ignore_conflicts/update_conflicts.")
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(objs, *args, **kwargs)
+            _apply_rollups(added=[obj._stats_values() for obj in objs], using=self.db)
+            TableVersion.bump(self.model, using=self.db)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        # bulk_update() issues its writes through update(), which keeps the
+        # rollups in step.
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        for obj in objs:
+            obj.version += 1
+        return rows
+
+    def update(self, **kwargs):
+        kwargs.setdefault('version', F('version') + 1)
+        kwargs.setdefault('updated_at', timezone.now())
+        with transaction.atomic(using=self.db):
+            if self.query.is_sliced or not set(kwargs) & set(STATS_FIELDS):
+                rows = super().update(**kwargs)
+            else:
+                pks = list(self.select_for_update().values_list('pk', flat=True))
+                removed = self._pk_grids(pks)
+                rows = 0
+                for chunk in _chunks(pks):
+                    rows += self._plain().filter(pk__in=chunk).update(**kwargs)
+                added = self._pk_grids(pks)
+                for table in ROLLUP_TABLES:
+                    table.apply(added=added[table], removed=removed[table], using=self.db)
+            if rows:
+                TableVersion.bump(self.model, using=self.db)
+        return rows
+
+    update.alters_data = True
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            # Lock the rows first, as update() does, so the grids match
+            # exactly the rows deleted.
+            pks = list(self.select_for_update().values_list('pk', flat=True))
+            removed = self._pk_grids(pks)
+            deleted, per_model = 0, {}
+            for chunk in _chunks(pks):
+                count, counts = self._plain().filter(pk__in=chunk).delete()
+                deleted += count
+                for label, n in counts.items():
+                    per_model[label] = per_model.get(label, 0) + n
+            for table, grid in removed.items():
+                table.apply(removed=grid, using=self.db)
+            if deleted:
+                TableVersion.bump(self.model, using=self.db)
+        return deleted, per_model
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
 
 class SocialPost(models.Model):
     PLATFORM_CHOICES = [
@@ -7,10 +184,12 @@ class SocialPost(models.Model):
         ('twitter', 'Twitter'),
         ('linkedin', 'LinkedIn'),
     ]
-    
+
     STATUS_CHOICES = [
         ('Draft', 'Draft'),
         ('Scheduled', 'Scheduled'),
+        # Claimed by publish_scheduled_posts --dispatch and being pushed out.
+        ('Publishing', 'Publishing'),
         ('Published', 'Published'),
     ]
 
@@ -22,6 +201,269 @@ class SocialPost(models.Model):
     engagement_score = models.IntegerField(default=0)
     image_url = models.URLField(max_length=500, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Bumped on every write; detail ETags are built from it.
+    version = models.PositiveIntegerField(default=1, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    # When the publisher claimed the post; stale Publishing claims are retried.
+    claimed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    objects = SocialPostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Default list ordering and keyset pagination.
+            models.Index(fields=['-created_at', '-id'], name='post_created_id_idx'),
+            # Per-platform feeds and GROUP BY platform counts.
+            models.Index(fields=['platform', '-created_at'], name='post_platform_created_idx'),
+            # Status counts and planner range queries on scheduled_time.
+            models.Index(fields=['status', 'scheduled_time'], name='post_status_scheduled_idx'),
+            # Incremental readers (best-time recommender) fetching recent changes.
+            models.Index(fields=['updated_at'], name='post_updated_idx'),
+            # Small index holding only the posts still waiting to be published.
+            models.Index(
+                fields=['scheduled_time'],
+                condition=Q(status='Scheduled'),
+                name='post_due_scheduled_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.platform}"
+
+    def _stats_values(self):
+        return tuple(getattr(self, field) for field in STATS_FIELDS)
+
+    def _stored_stats_values(self, using=None):
+        # Read under a row lock inside the write's transaction: values loaded
+        # with the instance may be stale, and two stale saves would both
+        # subtract the same old cell.
+        if self.pk is None:
+            return None
+        return (
+            type(self)._base_manager.using(using or self._state.db or 'default')
+            .select_for_update().filter(pk=self.pk).values_list(*STATS_FIELDS).first()
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if not self._state.adding:
+            self.version += 1
+        if update_fields is not None:
+            update_fields = kwargs['update_fields'] = {*update_fields, 'version', 'updated_at'}
+        if update_fields is not None and not update_fields & set(STATS_FIELDS):
+            with transaction.atomic(using=kwargs.get('using')):
+                super().save(*args, **kwargs)
+                TableVersion.bump(type(self), using=self._state.db)
+            return
+
+        with transaction.atomic(using=kwargs.get('using')):
+            previous = self._stored_stats_values(kwargs.get('using'))
+            super().save(*args, **kwargs)
+            current = self._stats_values()
+            if previous is not None and update_fields is not None:
+                current = tuple(
+                    value if field in update_fields else old
+                    for field, value, old in zip(STATS_FIELDS, current, previous)
+                )
+            if current != previous:
+                _apply_rollups(
+                    added=[current],
+                    removed=[previous] if previous is not None else [],
+                    using=self._state.db,
+                )
+            # After the rollup cells: see the lock order on SocialPostQuerySet.
+            TableVersion.bump(type(self), using=self._state.db)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            previous = self._stored_stats_values(kwargs.get('using'))
+            result = super().delete(*args, **kwargs)
+            if previous is not None:
+                _apply_rollups(removed=[previous], using=kwargs.get('using'))
+            TableVersion.bump(type(self), using=kwargs.get('using'))
+        return result
+
+
+class RollupTable:
+    """
+    Shared maintenance for the rollup models. Each one keeps a post count and
+    an engagement total per ``key_fields`` cell. ``grid`` builds the cells from
+    STATS_FIELDS rows and ``queryset_grid`` builds them with a GROUP BY.
+    """
+
+    key_fields = ()
+
+    @classmethod
+    def apply(cls, added=None, removed=None, using=None):
+        """Add the ``added`` grid and subtract the ``removed`` grid."""
+        deltas = {}
+        for grid, sign in ((added, 1), (removed, -1)):
+            for key, (count, engagement) in (grid or {}).items():
+                cell = deltas.setdefault(key, [0, 0])
+                cell[0] += sign * count
+                cell[1] += sign * engagement
+
+        # Sorted so concurrent writers lock rollup rows in the same order.
+        cells = [(key, delta) for key, delta in sorted(deltas.items()) if delta[0] or delta[1]]
+        if not cells:
+            return
+        connection = connections[using or router.db_for_write(cls)]
+        if connection.features.supports_update_conflicts_with_target:
+            for chunk in _chunks(cells, ROLLUP_UPSERT_CHUNK_SIZE):
+                cls._upsert(connection, chunk)
+            return
+        for key, (count, engagement) in cells:
+            lookup = dict(zip(cls.key_fields, key))
+            rows = cls.objects.using(connection.alias).filter(**lookup)
+            changes = {
+                'post_count': F('post_count') + count,
+                'engagement_total': F('engagement_total') + engagement,
+            }
+            if not rows.update(**changes):
+                cls.objects.using(connection.alias).bulk_create([cls(**lookup)], ignore_conflicts=True)
+                rows.update(**changes)
+
+    @classmethod
+    def _upsert(cls, connection, cells):
+        """Add ``(key, (count, engagement))`` cells with one INSERT ... ON CONFLICT."""
+        qn = connection.ops.quote_name
+        table = qn(cls._meta.db_table)
+        keys = [cls._meta.get_field(name) for name in cls.key_fields]
+        key_columns = ', '.join(qn(field.column) for field in keys)
+        count, engagement = qn('post_count'), qn('engagement_total')
+        row = '(%s)' % ', '.join(['%s'] * (len(keys) + 2))
+        params = []
+        for key, delta in cells:
+            params.extend(field.get_db_prep_value(value, connection) for field, value in zip(keys, key))
+            params.extend(delta)
+        sql = (
+            f"INSERT INTO {table} ({key_columns}, {count}, {engagement}) "
+            f"VALUES {', '.join([row] * len(cells))} "
+            f"ON CONFLICT ({key_columns}) DO UPDATE SET "
+            f"{count} = {table}.{count} + EXCLUDED.{count}, "
+            f"{engagement} = {table}.{engagement} + EXCLUDED.{engagement}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    @classmethod
+    def rebuild(cls, dry_run=False):
+        """
+        Recompute every cell from the posts table and fix any drift.
+
+        Returns a list of ``(*key, stored, actual)`` tuples for the cells
+        that were wrong, where stored/actual are ``(count, engagement)`` pairs.
+        """
+        with transaction.atomic():
+            stored = {
+                tuple(row[:-2]): tuple(row[-2:])
+                for row in cls.objects.select_for_update().values_list(
+                    *cls.key_fields, 'post_count', 'engagement_total',
+                )
+            }
+            actual = {key: tuple(cell) for key, cell in cls.queryset_grid(SocialPost.objects.all()).items()}
+            drift = []
+            for key in sorted(set(stored) | set(actual)):
+                expected = actual.get(key, (0, 0))
+                current = stored.get(key, (0, 0))
+                if expected == current:
+                    continue
+                drift.append((*key, current, expected))
+                if dry_run:
+                    continue
+                cls.objects.update_or_create(
+                    **dict(zip(cls.key_fields, key)),
+                    defaults={'post_count': expected[0], 'engagement_total': expected[1]},
+                )
+        return drift
+
+
+class PostStatsRollup(RollupTable, models.Model):
+    """
+    Running post count and engagement total per (platform, status).
+
+    Maintained by the SocialPost write paths so the stats endpoints read a
+    handful of rows instead of aggregating the posts table. ``rebuild_stats``
+    reconciles it against the posts table.
+    """
+
+    platform = models.CharField(max_length=50)
+    status = models.CharField(max_length=20)
+    post_count = models.BigIntegerField(default=0)
+    engagement_total = models.BigIntegerField(default=0)
+
+    key_fields = ('platform', 'status')
+    grid = staticmethod(_stats_grid)
+    queryset_grid = staticmethod(queryset_stats_grid)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['platform', 'status'], name='unique_stats_rollup_cell'),
+        ]
+
+    def __str__(self):
+        return f"{self.platform}/{self.status}: {self.post_count}"
+
+
+class PostDailyRollup(RollupTable, models.Model):
+    """
+    Post count and engagement total per platform and UTC day of created_at.
+
+    Backs the day and week time series, so a year-long chart reads a few
+    hundred rows. Maintained by the same write paths as PostStatsRollup
+    and reconciled by ``rebuild_stats``.
+    """
+
+    platform = models.CharField(max_length=50)
+    day = models.DateField()
+    post_count = models.BigIntegerField(default=0)
+    engagement_total = models.BigIntegerField(default=0)
+
+    key_fields = ('platform', 'day')
+    grid = staticmethod(_daily_grid)
+    queryset_grid = staticmethod(queryset_daily_grid)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['platform', 'day'], name='unique_daily_rollup_cell'),
+        ]
+        indexes = [
+            models.Index(fields=['day'], name='daily_rollup_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.platform}/{self.day}: {self.post_count}"
+
+
+class TableVersion(models.Model):
+    """
+    Write counter per table, bumped in the same transaction as every write.
+
+    List and stats endpoints build their ETag / Last-Modified from this one
+    row, so a conditional GET can be answered without reading the table.
+    """
+
+    table = models.CharField(max_length=100, unique=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
+
+    @classmethod
+    def bump(cls, model, using=None):
+        table = model._meta.db_table
+        rows = cls.objects.using(using).filter(table=table)
+        changes = {'version': F('version') + 1, 'updated_at': timezone.now()}
+        if not rows.update(**changes):
+            cls.objects.using(using).bulk_create([cls(table=table)], ignore_conflicts=True)
+            rows.update(**changes)
+
+    @classmethod
+    def current(cls, model, using=None):
+        """``(version, updated_at)`` for ``model``'s table; ``(0, None)`` before its first write."""
+        row = cls.objects.using(using).filter(table=model._meta.db_table).values_list('version', 'updated_at').first()
+        return row or (0, None)
+
+
+ROLLUP_TABLES = (PostStatsRollup, PostDailyRollup)
@@ -0,0 +1,236 @@
+"""
+Shared client for outbound HTTP calls.
+
+* One pooled ``requests.Session`` per process.
+* A circuit breaker per host. After ``failure_threshold`` consecutive
+  failures (connection errors, timeouts or 5xx) the host is short-circuited
+  for ``reset_timeout`` seconds. After that, one trial request is let
+  through (half-open); its outcome closes or re-opens the breaker.
+* Deadline budgets. ``with deadline(seconds):`` bounds everything inside
+  it, and each request's timeout is capped by the time left. Once the
+  budget is spent, requests fail fast with DeadlineExceeded.
+* Per-host breaker state and latency stats via ``client.stats()``.
+* ``with track() as timing:`` totals the calls made inside the block and
+  their time (used by the metrics middleware).
+
+Only ``requests`` and the standard library are used, so the module does
+not depend on Django.
+
+backend/posts/outbound.py is a copy for the separately deployed ``backend``
+project, which cannot import this app. Change both; OutboundCopyTests
+fails when their code differs.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+_deadline = contextvars.ContextVar('outbound_deadline', default=None)
+_timing = contextvars.ContextVar('outbound_timing', default=None)
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """The host's breaker is open; the request was not attempted."""
+
+
+class DeadlineExceeded(requests.Timeout):
+    """The caller's time budget ran out before the request could be made."""
+
+
+class Deadline:
+    def __init__(self, seconds):
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return self.expires_at - time.monotonic()
+
+
+@contextmanager
+def deadline(seconds):
+    """Bound every outbound call made inside the block by ``seconds`` in total."""
+    current = _deadline.get()
+    budget = Deadline(seconds)
+    if current is not None and current.expires_at < budget.expires_at:
+        budget = current
+    token = _deadline.set(budget)
+    try:
+        yield budget
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline():
+    return _deadline.get()
+
+
+class Timing:
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+
+@contextmanager
+def track():
+    """Count the outbound calls made inside the block and the time spent in them."""
+    timing = Timing()
+    token = _timing.set(timing)
+    try:
+        yield timing
+    finally:
+        _timing.reset(token)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                return True
+            # Open, or half-open with the trial request still in flight.
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+
+class HostStats:
+    def __init__(self, window=512):
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.latencies = deque(maxlen=window)
+
+    def as_dict(self):
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 2)
+
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'rejected': self.rejected,
+            'p50_ms': percentile(0.50),
+            'p95_ms': percentile(0.95),
+            'max_ms': round(latencies[-1] * 1000, 2) if latencies else None,
+        }
+
+
+class OutboundClient:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, default_timeout=(3.05, 10), pool_maxsize=20):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.default_timeout = default_timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.breakers = {}
+        self.host_stats = {}
+        self.lock = threading.Lock()
+
+    def breaker(self, host):
+        with self.lock:
+            if host not in self.breakers:
+                self.breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self.host_stats[host] = HostStats()
+            return self.breakers[host]
+
+    def effective_timeout(self, timeout):
+        timeout = timeout if timeout is not None else self.default_timeout
+        budget = current_deadline()
+        if budget is None:
+            return timeout
+        remaining = budget.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded("Outbound deadline exceeded")
+        if isinstance(timeout, tuple):
+            return tuple(min(part, remaining) for part in timeout)
+        return min(timeout, remaining)
+
+    def request(self, method, url, timeout=None, **kwargs):
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        stats = self.host_stats[host]
+        if not breaker.allow():
+            stats.rejected += 1
+            raise CircuitOpenError(f"Circuit open for {host}")
+        try:
+            timeout = self.effective_timeout(timeout)
+        except DeadlineExceeded:
+            # No request was made, so the host is not to blame.
+            if breaker.state == HALF_OPEN:
+                breaker.state = OPEN
+            raise
+
+        started = time.monotonic()
+        try:
+            response = self.session.request(method, url, timeout=timeout, **kwargs)
+        except requests.RequestException:
+            breaker.record_failure()
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            stats.requests += 1
+            stats.latencies.append(elapsed)
+            timing = _timing.get()
+            if timing is not None:
+                timing.calls += 1
+                timing.seconds += elapsed
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+            stats.errors += 1
+        else:
+            breaker.record_success()
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def stats(self):
+        with self.lock:
+            hosts = list(self.breakers)
+        return {
+            host: {
+                'state': self.breakers[host].state,
+                'consecutive_failures': self.breakers[host].failures,
+                **self.host_stats[host].as_dict(),
+            }
+            for host in hosts
+        }
+
+
+client = OutboundClient()
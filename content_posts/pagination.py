@@ -0,0 +1,137 @@
+import base64
+import binascii
+
+from functools import cached_property
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q, Sum
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .models import PostStatsRollup
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over (created_at, id), newest first.
+
+    Every page is fetched with a seek predicate on the last row of the
+    previous page instead of an OFFSET, so a deep page costs the same as the
+    first one. Pagination only kicks in when the client sends ``cursor`` or a
+    page size (``page_size``, or ``limit`` as used by the dashboard), so
+    clients that expect a plain list keep getting one.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size_query_params = ('page_size', 'limit')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self):
+        self.page_size = getattr(settings, 'POSTS_PAGE_SIZE', 50)
+        self.max_page_size = getattr(settings, 'POSTS_MAX_PAGE_SIZE', 500)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        cursor = request.query_params.get(self.cursor_query_param)
+        page_size = self.get_page_size(request)
+        if cursor is None and page_size is None:
+            return None
+
+        self.request = request
+        self.page_size = page_size or self.page_size
+        queryset = queryset.order_by('-created_at', '-id')
+        if cursor:
+            created_at, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+            )
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        # Encoded now: callers may convert the rows in place before
+        # asking for the paginated response.
+        self.next_cursor = self.encode_cursor(self.page[-1]) if self.has_next else None
+        return self.page
+
+    def get_page_size(self, request):
+        for param in self.page_size_query_params:
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            try:
+                size = int(value)
+            except ValueError:
+                continue
+            if size > 0:
+                return min(size, self.max_page_size)
+        return None
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def encode_cursor(self, row):
+        # Rows are model instances or .values() dicts.
+        if isinstance(row, dict):
+            created_at, pk = row['created_at'], row['id']
+        else:
+            created_at, pk = row.created_at, row.pk
+        position = f"{created_at.isoformat()}|{pk}"
+        return base64.urlsafe_b64encode(position.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().rsplit('|', 1)
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, pk
+
+
+class RollupCountPaginator(Paginator):
+    """
+    Page-number paginator for the whole posts table that takes its count from
+    PostStatsRollup instead of running COUNT(*) over every row. With a
+    ``version`` (the posts table version) the count is also kept in the
+    default cache until the next write.
+    """
+
+    def __init__(self, object_list, per_page, version=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.version = version
+
+    def rollup_count(self):
+        return PostStatsRollup.objects.aggregate(total=Sum('post_count'))['total'] or 0
+
+    @cached_property
+    def count(self):
+        if self.version is None:
+            return self.rollup_count()
+        return cache.get_or_set(f'post-count:{self.version}', self.rollup_count, settings.HTML_FRAGMENT_CACHE_TTL)
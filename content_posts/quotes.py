@@ -0,0 +1,88 @@
+"""
+Quote buffer for RandomQuoteView.
+
+Requests are served from an in-memory ring buffer, so they never wait on
+an upstream call. When the buffer drops below its low-water mark, a
+background refill queries every provider in parallel and keeps the first
+batch that comes back (hedging). Users only see the built-in fallback
+quotes while the buffer is still empty.
+"""
+import random
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from . import outbound
+
+FALLBACK_QUOTES = [
+    {"content": "The best time to plant a tree was 20 years ago. The second best time is now.", "author": "Chinese Proverb"},
+    {"content": "Your limitation—it's only your imagination.", "author": "Unknown"},
+    {"content": "Great things never come from comfort zones.", "author": "Unknown"},
+    {"content": "Success doesn't just find you. You have to go out and get it.", "author": "Unknown"},
+    {"content": "Dream it. Wish it. Do it.", "author": "Unknown"},
+]
+
+def fetch_quotable(timeout=5):
+    # SSL verification stays disabled as before: quotable.io's certificate
+    # has been expired for a long time.
+    response = outbound.client.get("https://api.quotable.io/quotes/random", params={"limit": 50}, verify=False, timeout=timeout)
+    response.raise_for_status()
+    return [{"content": q["content"], "author": q.get("author", "Unknown")} for q in response.json()]
+
+
+def fetch_zenquotes(timeout=5):
+    response = outbound.client.get("https://zenquotes.io/api/quotes", timeout=timeout)
+    response.raise_for_status()
+    return [{"content": q["q"], "author": q.get("a", "Unknown")} for q in response.json()]
+
+
+class QuotePool:
+    def __init__(self, providers, capacity=200, low_water=20, timeout=5):
+        self.providers = providers
+        self.buffer = deque(maxlen=capacity)
+        self.low_water = low_water
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.refilling = False
+        self.refill_future = None
+        self.executor = ThreadPoolExecutor(max_workers=len(providers) + 1, thread_name_prefix="quote-refill")
+
+    def get(self):
+        """Return a quote right away, scheduling a refill when the buffer is low."""
+        with self.lock:
+            quote = self.buffer.popleft() if self.buffer else None
+            if len(self.buffer) < self.low_water:
+                self._schedule_refill()
+        return quote or random.choice(FALLBACK_QUOTES)
+
+    def _schedule_refill(self):
+        # Caller holds the lock.
+        if not self.refilling:
+            self.refilling = True
+            self.refill_future = self.executor.submit(self.refill)
+
+    def refill(self):
+        """Query every provider in parallel and buffer the first batch that arrives."""
+        try:
+            pending = {self.executor.submit(provider, self.timeout) for provider in self.providers}
+            while pending:
+                done, pending = wait(pending, timeout=self.timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    return 0
+                for future in done:
+                    try:
+                        quotes = future.result()
+                    except Exception:
+                        continue
+                    if quotes:
+                        random.shuffle(quotes)
+                        with self.lock:
+                            self.buffer.extend(quotes)
+                        return len(quotes)
+            return 0
+        finally:
+            with self.lock:
+                self.refilling = False
+
+
+quote_pool = QuotePool([fetch_quotable, fetch_zenquotes])
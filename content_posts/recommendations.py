@@ -0,0 +1,241 @@
+"""
+Best-time-to-post recommendations.
+
+Only posts with engagement history count: Published posts whose
+scheduled_time (or created_at, if never scheduled) is not in the future.
+Each falls into one of the 168 hour-of-week slots (UTC) of that time. The
+recommender keeps, per platform, the engagement total and post count of
+every slot as 2-D NumPy arrays. Slots are ranked by mean engagement.
+
+The histograms are built once from a columnar fetch of small integers
+(platform code, weekday, hour, score). After that they are updated
+incrementally. Per-post slot and score arrays, indexed by post id, let a
+changed post's old contribution be swapped for its new one. A refresh
+only reads posts whose updated_at is past the last watermark, plus
+Published posts whose time has come since then, and it only runs when the
+posts table's TableVersion has moved. A refresh whose per-platform totals
+disagree with the Published cells of PostStatsRollup, less the
+future-dated Published posts (e.g. after deletes), falls back to a full
+rebuild.
+"""
+import threading
+from datetime import timedelta
+
+from django.db.models import Case, Count, F, Func, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import PostStatsRollup, SocialPost, TableVersion
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+PLATFORMS = [platform for platform, _ in SocialPost.PLATFORM_CHOICES]
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+SLOTS = 7 * 24
+PUBLISHED = 'Published'
+FETCH_CHUNK_SIZE = 50_000
+# Rows updated this long before the last refresh are read again; re-applying
+# a post is idempotent, and the overlap covers transactions that committed
+# after a refresh with an earlier updated_at, and clock skew between workers.
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+
+class HourOfWeek(Func):
+    """
+    UTC hour of the week of a datetime, 0 (Monday 00:00) to 167, computed
+    natively by the database. The expression appears twice in the SQL, so it
+    must not carry query parameters (plain columns are fine).
+    """
+
+    template = (
+        "CAST((EXTRACT(ISODOW FROM %(expressions)s AT TIME ZONE 'UTC') - 1) * 24"
+        " + EXTRACT(HOUR FROM %(expressions)s AT TIME ZONE 'UTC') AS integer)"
+    )
+    output_field = IntegerField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Datetimes are stored as UTC text, which strftime() reads directly
+        # (Django's Extract* go through Python functions on SQLite). %w is
+        # 0 for Sunday. Percent signs are doubled for the template and again
+        # for the backend's parameter formatting.
+        return self.as_sql(
+            compiler, connection,
+            template=(
+                "(((CAST(strftime('%%%%w', %(expressions)s) AS INTEGER) + 6) %%%% 7) * 24"
+                " + CAST(strftime('%%%%H', %(expressions)s) AS INTEGER))"
+            ),
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template='(WEEKDAY(%(expressions)s) * 24 + HOUR(%(expressions)s))', **extra_context,
+        )
+
+
+def with_posted_at(queryset):
+    """Annotate ``posted_at``: the scheduled_time, or created_at for posts never scheduled."""
+    return queryset.annotate(posted_at=Coalesce('scheduled_time', 'created_at'))
+
+
+def slot_rows(queryset, now):
+    """
+    ``(id, platform code, slot, score)`` rows, with code and slot worked out by
+    the database. Posts without engagement history as of ``now`` get code -1.
+    """
+    return with_posted_at(queryset).order_by().annotate(
+        platform_code=Case(
+            When(~Q(status=PUBLISHED) | Q(posted_at__gt=now), then=Value(-1)),
+            *[When(platform=platform, then=Value(code)) for code, platform in enumerate(PLATFORMS)],
+            default=Value(-1),
+            output_field=IntegerField(),
+        ),
+        slot=HourOfWeek(F('posted_at')),
+    ).values_list('id', 'platform_code', 'slot', 'engagement_score')
+
+
+class BestTimeRecommender:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.watermark = None
+        self.full_rebuilds = self.incremental_refreshes = 0
+        self._reset()
+
+    def _reset(self):
+        self.totals = np.zeros((len(PLATFORMS), SLOTS), dtype=np.int64)
+        self.counts = np.zeros((len(PLATFORMS), SLOTS), dtype=np.int64)
+        # Per post id: platform code (-1 when unknown/absent), slot and score.
+        self.post_platform = np.full(0, -1, dtype=np.int8)
+        self.post_slot = np.zeros(0, dtype=np.int16)
+        self.post_score = np.zeros(0, dtype=np.int64)
+
+    def _grow(self, max_id):
+        size = len(self.post_platform)
+        if max_id < size:
+            return
+        extra = max(max_id + 1, size * 2) - size
+        self.post_platform = np.concatenate([self.post_platform, np.full(extra, -1, dtype=np.int8)])
+        self.post_slot = np.concatenate([self.post_slot, np.zeros(extra, dtype=np.int16)])
+        self.post_score = np.concatenate([self.post_score, np.zeros(extra, dtype=np.int64)])
+
+    def _histogram(self, platforms, slots, weights):
+        cells = platforms.astype(np.int64) * SLOTS + slots
+        return np.bincount(cells, weights=weights, minlength=len(PLATFORMS) * SLOTS).reshape(len(PLATFORMS), SLOTS)
+
+    def _apply(self, rows):
+        """Replace the stored contribution of every post in ``rows`` with its current one."""
+        rows = np.asarray(rows, dtype=np.int64).reshape(-1, 4)
+        ids, platforms, slots, scores = rows.T
+        self._grow(int(ids.max()))
+
+        old = self.post_platform[ids] >= 0
+        if old.any():
+            old_ids = ids[old]
+            old_platforms, old_slots = self.post_platform[old_ids], self.post_slot[old_ids].astype(np.int64)
+            self.totals -= self._histogram(old_platforms, old_slots, self.post_score[old_ids]).astype(np.int64)
+            self.counts -= self._histogram(old_platforms, old_slots, None).astype(np.int64)
+
+        new = platforms >= 0
+        self.totals += self._histogram(platforms[new], slots[new], scores[new]).astype(np.int64)
+        self.counts += self._histogram(platforms[new], slots[new], None).astype(np.int64)
+        self.post_platform[ids] = np.where(new, platforms, -1)
+        self.post_slot[ids] = slots
+        self.post_score[ids] = scores
+
+    def _load(self, queryset, now):
+        rows = slot_rows(queryset, now).iterator(chunk_size=FETCH_CHUNK_SIZE)
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= FETCH_CHUNK_SIZE:
+                self._apply(chunk)
+                chunk = []
+        if chunk:
+            self._apply(chunk)
+
+    def _matches_rollup(self, now):
+        expected = np.zeros((len(PLATFORMS), 2), dtype=np.int64)
+        published = PostStatsRollup.objects.filter(status=PUBLISHED)
+        for platform, count, total in published.values_list('platform', 'post_count', 'engagement_total'):
+            if platform in PLATFORMS:
+                expected[PLATFORMS.index(platform)] += (count, total)
+        # Published posts dated in the future are in the rollup but not (yet) in the histograms.
+        upcoming = with_posted_at(SocialPost.objects.filter(status=PUBLISHED)).filter(posted_at__gt=now)
+        for platform, count, total in upcoming.order_by().values('platform').annotate(
+            count=Count('id'), total=Sum('engagement_score'),
+        ).values_list('platform', 'count', 'total'):
+            if platform in PLATFORMS:
+                expected[PLATFORMS.index(platform)] -= (count, total)
+        actual = np.stack([self.counts.sum(axis=1), self.totals.sum(axis=1)], axis=1)
+        return np.array_equal(expected, actual)
+
+    def refresh(self):
+        """Bring the histograms up to date; a no-op while the posts table is unchanged."""
+        version, _ = TableVersion.current(SocialPost)
+        if version == self.version:
+            return
+        with self.lock:
+            if version == self.version:
+                return
+            started = timezone.now()
+            if self.watermark is not None:
+                since = self.watermark - WATERMARK_OVERLAP
+                self._load(
+                    with_posted_at(SocialPost.objects.all()).filter(
+                        Q(updated_at__gte=since) | Q(status=PUBLISHED, posted_at__gte=since, posted_at__lte=started),
+                    ),
+                    started,
+                )
+                self.incremental_refreshes += 1
+            if self.watermark is None or not self._matches_rollup(started):
+                self._reset()
+                self._load(with_posted_at(SocialPost.objects.filter(status=PUBLISHED)).filter(posted_at__lte=started), started)
+                self.full_rebuilds += 1
+            self.watermark = started
+            self.version = version
+
+    def best_slots(self, platform=None, limit=5, min_posts=1):
+        """The top ``limit`` slots by mean engagement among slots with at least ``min_posts`` posts."""
+        self.refresh()
+        with self.lock:
+            if platform is None:
+                totals, counts = self.totals.sum(axis=0), self.counts.sum(axis=0)
+            else:
+                # Copies, not views: refresh() updates the arrays in place once the lock is released.
+                index = PLATFORMS.index(platform)
+                totals, counts = self.totals[index].copy(), self.counts[index].copy()
+            means = np.divide(totals, counts, out=np.zeros(SLOTS), where=counts > 0)
+        eligible = np.flatnonzero(counts >= max(min_posts, 1))
+        ranked = eligible[np.lexsort((-counts[eligible], -means[eligible]))][:limit]
+        return {
+            'posts': int(counts.sum()),
+            'slots': [
+                {
+                    'weekday': WEEKDAYS[slot // 24],
+                    'day': int(slot // 24),
+                    'hour': int(slot % 24),
+                    'avg_engagement': round(float(means[slot]), 2),
+                    'posts': int(counts[slot]),
+                }
+                for slot in ranked
+            ],
+        }
+
+
+_recommender = None
+_recommender_lock = threading.Lock()
+
+
+def get_recommender():
+    """The process-wide recommender, or None when NumPy is not installed."""
+    global _recommender
+    if np is None:
+        return None
+    with _recommender_lock:
+        if _recommender is None:
+            _recommender = BestTimeRecommender()
+        return _recommender
@@ -0,0 +1,32 @@
+"""
+JSON renderer backed by orjson, used for every DRF response when
+REST_FRAMEWORK's DEFAULT_RENDERER_CLASSES points at it.
+
+Output matches rest_framework's JSONRenderer: types orjson does not handle
+natively (and datetimes, for DRF's ``Z`` suffix) go through DRF's encoder.
+Without orjson installed, or with the UNICODE_JSON / COMPACT_JSON settings
+turned off (orjson always writes compact UTF-8), it behaves exactly like
+JSONRenderer.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=self.encoder_class().default, option=options)
+        # Same escaping as JSONRenderer, so the output is also valid JavaScript.
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -0,0 +1,89 @@
+"""
+Read-only fast path for post lists.
+
+Response dicts are built straight from ``.values()`` rows. The per-field
+converters are worked out once from SocialPostSerializer's fields, so the
+output matches the serializer's without running it for every row.
+"""
+from functools import cached_property, lru_cache
+
+from rest_framework import ISO_8601, fields as drf_fields
+from rest_framework.settings import api_settings
+
+from .serializers import SocialPostSerializer
+
+# Field types whose to_representation() returns database values unchanged.
+PASSTHROUGH_FIELDS = (
+    drf_fields.BooleanField,
+    drf_fields.CharField,
+    drf_fields.ChoiceField,
+    drf_fields.IntegerField,
+    drf_fields.ReadOnlyField,
+)
+
+
+def _iso_datetime(tz):
+    def convert(value):
+        if tz is not None and value.tzinfo is not None:
+            value = value.astimezone(tz)
+        text = value.isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+class PostRowReader:
+    """Represent ``.values()`` rows exactly as ``serializer_class`` would represent the instances."""
+
+    def __init__(self, serializer_class=SocialPostSerializer, fields=None):
+        self.serializer_class = serializer_class
+        self.fields = fields
+
+    @cached_property
+    def serializer_fields(self):
+        serializer = self.serializer_class(fields=self.fields) if self.fields else self.serializer_class()
+        return {name: field for name, field in serializer.fields.items() if not field.write_only}
+
+    @property
+    def field_names(self):
+        return list(self.serializer_fields)
+
+    def values(self, queryset):
+        return queryset.values(*self.field_names)
+
+    def converters(self):
+        # Built per call: datetime output follows the active timezone.
+        converters = []
+        for name, field in self.serializer_fields.items():
+            if isinstance(field, drf_fields.DateTimeField):
+                if getattr(field, 'format', api_settings.DATETIME_FORMAT) == ISO_8601:
+                    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+                    converters.append((name, _iso_datetime(tz)))
+                else:
+                    converters.append((name, field.to_representation))
+            elif not isinstance(field, PASSTHROUGH_FIELDS):
+                converters.append((name, field.to_representation))
+        return converters
+
+    def represent(self, rows):
+        """Convert ``rows`` (dicts from :meth:`values`) in place and return them as a list."""
+        converters = self.converters()
+        rows = list(rows)
+        for row in rows:
+            for name, convert in converters:
+                value = row[name]
+                if value is not None:
+                    row[name] = convert(value)
+        return rows
+
+
+post_rows = PostRowReader()
+
+
+@lru_cache(maxsize=64)
+def _sparse_reader(fields):
+    return PostRowReader(fields=list(fields))
+
+
+def post_rows_for(fields=None):
+    """The shared reader for a sparse fieldset (see serializers.sparse_fieldset)."""
+    return _sparse_reader(tuple(fields)) if fields else post_rows
@@ -0,0 +1,205 @@
+"""
+Full-text search over post titles and content.
+
+The backend is chosen from the database vendor:
+
+* PostgreSQL: a stored generated ``search_vector`` tsvector column with a
+  GIN index, queried with ``websearch_to_tsquery``.
+* SQLite: an FTS5 table over the posts table, kept in sync by triggers.
+* Anything else (or SQLite built without FTS5): ``icontains`` matching.
+
+``install()`` is idempotent. It runs from migration 0008 and again after
+every ``migrate`` (see ContentPostsConfig.ready), because SQLite drops the
+triggers whenever Django rebuilds the posts table during an AlterField.
+The post-migrate run is skipped while the posts table is missing or 0008
+is not applied, so unapplying the migration really removes the index.
+"""
+import re
+
+from django.db import connection as default_connection
+from django.db.models import BooleanField, FloatField, Q, TextField, Value
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+POSTS_TABLE = 'content_posts_socialpost'
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+
+
+class SearchBackend:
+    """Plain ``icontains`` matching; used when no full-text index is available."""
+
+    def install(self, connection):
+        pass
+
+    def uninstall(self, connection):
+        pass
+
+    def filter(self, queryset, query):
+        condition = Q()
+        for term in query.split():
+            condition &= Q(title__icontains=term) | Q(content__icontains=term)
+        return queryset.filter(condition)
+
+    def ranked(self, queryset, query):
+        return self.filter(queryset, query).annotate(
+            search_rank=Value(0.0, output_field=FloatField()),
+            search_snippet=Value('', output_field=TextField()),
+        ).order_by('-created_at', '-id')
+
+
+class PostgresSearchBackend(SearchBackend):
+    config = 'english'
+    tsquery = "websearch_to_tsquery('english', %s)"
+
+    def install(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                ALTER TABLE {POSTS_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+                GENERATED ALWAYS AS (
+                    setweight(to_tsvector('{self.config}', coalesce(title, '')), 'A') ||
+                    setweight(to_tsvector('{self.config}', coalesce(content, '')), 'B')
+                ) STORED
+            """)
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS post_search_vector_idx ON {POSTS_TABLE} USING GIN (search_vector)"
+            )
+
+    def uninstall(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute("DROP INDEX IF EXISTS post_search_vector_idx")
+            cursor.execute(f"ALTER TABLE {POSTS_TABLE} DROP COLUMN IF EXISTS search_vector")
+
+    def filter(self, queryset, query):
+        return queryset.filter(RawSQL(
+            f"{POSTS_TABLE}.search_vector @@ {self.tsquery}", [query], output_field=BooleanField(),
+        ))
+
+    def ranked(self, queryset, query):
+        options = f"StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, MaxFragments=2"
+        return self.filter(queryset, query).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({POSTS_TABLE}.search_vector, {self.tsquery})", [query], output_field=FloatField(),
+            ),
+            search_snippet=RawSQL(
+                f"ts_headline('{self.config}', {POSTS_TABLE}.content, {self.tsquery}, %s)",
+                [query, options],
+                output_field=TextField(),
+            ),
+        ).order_by('-search_rank', '-id')
+
+
+class SQLiteSearchBackend(SearchBackend):
+    table = f'{POSTS_TABLE}_fts'
+
+    def install(self, connection):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+                [f'{self.table}_%'],
+            )
+            had_triggers = len(cursor.fetchall()) == 3
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {self.table}
+                USING fts5(title, content, content='{POSTS_TABLE}', content_rowid='id')
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {self.table}_ai AFTER INSERT ON {POSTS_TABLE} BEGIN
+                    INSERT INTO {self.table}(rowid, title, content) VALUES (new.id, new.title, new.content);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {self.table}_ad AFTER DELETE ON {POSTS_TABLE} BEGIN
+                    INSERT INTO {self.table}({self.table}, rowid, title, content)
+                    VALUES ('delete', old.id, old.title, old.content);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {self.table}_au AFTER UPDATE OF title, content ON {POSTS_TABLE} BEGIN
+                    INSERT INTO {self.table}({self.table}, rowid, title, content)
+                    VALUES ('delete', old.id, old.title, old.content);
+                    INSERT INTO {self.table}(rowid, title, content) VALUES (new.id, new.title, new.content);
+                END
+            """)
+            if not had_triggers:
+                # Writes may have happened while the triggers were missing.
+                cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+    def uninstall(self, connection):
+        with connection.cursor() as cursor:
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {self.table}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def match_expression(self, query):
+        # Quote every token so user input cannot inject FTS5 query syntax;
+        # the last token is a prefix match for search-as-you-type.
+        terms = re.findall(r'\w+', query)
+        if not terms:
+            return None
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += '*'
+        return ' '.join(quoted)
+
+    def filter(self, queryset, query):
+        match = self.match_expression(query)
+        if match is None:
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [match],
+        ))
+
+    def ranked(self, queryset, query):
+        match = self.match_expression(query)
+        if match is None:
+            return queryset.none()
+        # FTS5 auxiliary functions only work inside a MATCH query, hence the
+        # correlated lookups on the row's rowid. bm25() is lower-is-better and
+        # weights title matches over content matches.
+        lookup = f"FROM {self.table} WHERE {self.table} MATCH %s AND rowid = {POSTS_TABLE}.id"
+        return self.filter(queryset, query).annotate(
+            search_rank=RawSQL(
+                f"(SELECT -bm25({self.table}, 2.0, 1.0) {lookup})", [match], output_field=FloatField(),
+            ),
+            search_snippet=RawSQL(
+                f"(SELECT snippet({self.table}, -1, %s, %s, '…', 24) {lookup})",
+                [SNIPPET_START, SNIPPET_END, match],
+                output_field=TextField(),
+            ),
+        ).order_by('-search_rank', '-id')
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return any(option == 'ENABLE_FTS5' for option, in cursor.fetchall())
+
+
+_backends = {}
+
+
+def get_backend(connection=None):
+    connection = connection or default_connection
+    if connection.alias not in _backends:
+        if connection.vendor == 'postgresql':
+            backend = PostgresSearchBackend()
+        elif connection.vendor == 'sqlite' and sqlite_has_fts5(connection):
+            backend = SQLiteSearchBackend()
+        else:
+            backend = SearchBackend()
+        _backends[connection.alias] = backend
+    return _backends[connection.alias]
+
+
+def install(connection=None):
+    get_backend(connection).install(connection or default_connection)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """Drop-in replacement for SearchFilter backed by the full-text index."""
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return get_backend().filter(queryset, query)
@@ -0,0 +1,317 @@
+"""
+Synthetic SocialPost data for benchmarks and load testing.
+
+Rows are shaped like production data:
+
+* Skewed platform and status mixes.
+* Content lengths that depend on the platform, plus Zipf-distributed
+  hashtags.
+* ``created_at`` spread over the past year. Posting hours cluster around
+  morning, lunch and evening peaks.
+* Long-tailed engagement on published posts.
+
+Generation is deterministic for a given ``seed``. Rows are produced in
+fixed-size chunks, each with its own RNG, so the output does not depend on
+``workers``. Generation can be spread over several processes.
+
+``seed_posts()`` picks the fastest insert path for the database:
+
+* PostgreSQL: ``COPY FROM STDIN``.
+* SQLite: chunked ``executemany``.
+* Anything else: ``bulk_create``.
+
+The first two bypass the ORM's write hooks. Each chunk therefore also
+returns its rollup grids, which are applied once the rows are in, and the
+table version is bumped. Big loads drop the posts indexes and the search
+index and build them again in one pass at the end.
+"""
+import gc
+import io
+import multiprocessing
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import search
+from .models import ROLLUP_TABLES, SocialPost, TableVersion, _merge_grid
+
+PLATFORM_WEIGHTS = {'instagram': 45, 'facebook': 25, 'twitter': 20, 'linkedin': 10}
+STATUS_WEIGHTS = {'Published': 60, 'Scheduled': 25, 'Draft': 15}
+# Median words per post, by platform.
+CONTENT_WORDS = {'instagram': 40, 'facebook': 60, 'twitter': 22, 'linkedin': 140}
+# Median engagement of a published post, by platform.
+ENGAGEMENT = {'instagram': 180, 'facebook': 90, 'twitter': 60, 'linkedin': 40}
+# Relative posting volume per UTC hour: peaks at 9:00, 12:00 and 18:00.
+HOUR_WEIGHTS = [1, 1, 1, 1, 1, 2, 3, 5, 8, 12, 9, 8, 11, 9, 7, 6, 7, 9, 12, 10, 7, 4, 2, 1]
+
+WORDS = (
+    "launch product team today new update week customers share story behind scenes tips how why our "
+    "your we love thanks community growth brand design build ship learn data insight announce event "
+    "join live free offer summer winter sale limited exclusive guide ideas inspiration coffee morning "
+    "weekend goals success strategy marketing social content creator video photo reel thread post"
+).split()
+HASHTAGS = [
+    f"#{tag}" for tag in (
+        "marketing socialmedia business startup smallbusiness branding tech motivation design "
+        "contentcreator growth ai productivity entrepreneur digital sale travel food fitness news"
+    ).split()
+]
+# Zipf-like popularity: the first hashtags are far more common than the last.
+HASHTAG_WEIGHTS = [1 / rank for rank in range(1, len(HASHTAGS) + 1)]
+
+CHUNK_SIZE = 10_000
+# Loads at least this big drop the posts indexes and rebuild them afterwards.
+BULK_LOAD_MIN_ROWS = 50_000
+CORPUS_WORDS = 50_000
+MAX_CONTENT_WORDS = 600
+INSERT_COLUMNS = (
+    'title', 'content', 'platform', 'status', 'scheduled_time', 'engagement_score',
+    'image_url', 'created_at', 'version', 'updated_at',
+)
+
+
+def _cumulative(weights):
+    total, out = 0, []
+    for weight in weights:
+        total += weight
+        out.append(total)
+    return out
+
+
+_PLATFORM_CUM = _cumulative(PLATFORM_WEIGHTS.values())
+_STATUS_CUM = _cumulative(STATUS_WEIGHTS.values())
+_HOUR_CUM = _cumulative(HOUR_WEIGHTS)
+_HASHTAG_CUM = _cumulative(HASHTAG_WEIGHTS)
+_PLATFORMS = list(PLATFORM_WEIGHTS)
+# Average characters per word, separator included.
+_WORD_CHARS = round(sum(len(word) + 1 for word in WORDS) / len(WORDS))
+_STATUSES = list(STATUS_WEIGHTS)
+
+
+def generate_rows(chunk, size, seed=0, now=None):
+    """
+    The ``size`` rows of chunk number ``chunk`` as tuples in INSERT_COLUMNS
+    order, with aware UTC datetimes. Each chunk has its own RNG, so a
+    chunk's rows depend only on ``seed``, its number and size, and ``now``.
+    """
+    return [
+        row[:4] + (_datetime(row[4]),) + row[5:7] + (_datetime(row[7]), 1, _datetime(row[7]))
+        for row in _raw_rows(chunk, size, seed, now)
+    ]
+
+
+def _datetime(timestamp):
+    return None if timestamp is None else datetime.fromtimestamp(timestamp, dt_timezone.utc)
+
+
+def _raw_rows(chunk, size, seed, now):
+    """generate_rows() with ``(scheduled, created)`` UNIX timestamps in place of the datetime columns."""
+    now = (now or timezone.now()).astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+    rng = random.Random(seed * 1_000_003 + chunk)
+    # Draw whole columns at once; per-row choices() calls dominate otherwise.
+    platforms = rng.choices(_PLATFORMS, cum_weights=_PLATFORM_CUM, k=size)
+    statuses = rng.choices(_STATUSES, cum_weights=_STATUS_CUM, k=size)
+    hours = rng.choices(range(24), cum_weights=_HOUR_CUM, k=size)
+    days = rng.choices(range(366), k=size)
+    hashtag_counts = rng.choices(range(7), k=size)
+    hashtags = rng.choices(HASHTAGS, cum_weights=_HASHTAG_CUM, k=sum(hashtag_counts))
+    next_hashtag = 0
+    lognormal = rng.lognormvariate
+    # Contents and titles are word-aligned slices of one random text per
+    # chunk, which is much cheaper than drawing every word separately.
+    corpus = ' '.join(rng.choices(WORDS, k=CORPUS_WORDS))
+    span = len(corpus) - MAX_CONTENT_WORDS * _WORD_CHARS
+    today = int(now.timestamp()) // 86400 * 86400
+    latest = int(now.timestamp())
+
+    rows = []
+    for n in range(size):
+        i = chunk * CHUNK_SIZE + n
+        platform, status = platforms[n], statuses[n]
+        words = min(MAX_CONTENT_WORDS, max(3, int(lognormal(0, 0.5) * CONTENT_WORDS[platform])))
+        content = _words(corpus, int(rng.random() * span), words)
+        if hashtag_counts[n]:
+            content += ' ' + ' '.join(hashtags[next_hashtag:next_hashtag + hashtag_counts[n]])
+            next_hashtag += hashtag_counts[n]
+        if platform == 'twitter' and len(content) > 280:
+            content = content[:281].rsplit(' ', 1)[0]
+        title = f"{_words(corpus, int(rng.random() * span), 3 + n % 6)} #{i}"
+
+        created = min(today - days[n] * 86400 + hours[n] * 3600 + int(rng.random() * 3600), latest)
+        engagement = 0
+        if status == 'Published':
+            # Published half an hour to five days after it was written.
+            scheduled = min(created + int(1800 + rng.random() * 5 * 86400), latest)
+            peak = 1.5 if HOUR_WEIGHTS[scheduled // 3600 % 24] >= 9 else 1.0
+            engagement = int(lognormal(0, 1.0) * ENGAGEMENT[platform] * peak)
+        elif status == 'Scheduled':
+            scheduled = today + int(rng.random() * 90) * 86400 + hours[size - 1 - n] * 3600
+        else:
+            scheduled = None
+        image_url = f"https://images.unsplash.com/photo-{rng.getrandbits(48):012x}" if rng.random() < 0.35 else None
+        rows.append((title, content, platform, status, scheduled, engagement, image_url, created))
+    return rows
+
+
+def _words(corpus, start, words):
+    start = corpus.find(' ', start) + 1
+    end = corpus.find(' ', start + words * _WORD_CHARS)
+    return corpus[start:end].capitalize()
+
+
+def _utc_text(timestamp):
+    # How Django's SQLite backend stores datetimes with USE_TZ: naive UTC
+    # text. Generated times are whole seconds, so there is no fraction.
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(timestamp))
+
+
+def _rollup_grids(raw):
+    """Each rollup table's grid for ``_raw_rows`` output, as ``bulk_create`` would apply it."""
+    midnights, rows = {}, []
+    for _, _, platform, status, _, engagement, _, created in raw:
+        # Only the UTC day matters to the grids; one datetime per day is enough.
+        day = created // 86400
+        midnight = midnights.get(day)
+        if midnight is None:
+            midnight = midnights[day] = _datetime(day * 86400)
+        rows.append((platform, status, engagement, midnight))
+    return {table: table.grid(rows) for table in ROLLUP_TABLES}
+
+
+def _sqlite_chunk(args):
+    raw = _raw_rows(*args)
+    rows = []
+    for title, content, platform, status, scheduled, engagement, image_url, created in raw:
+        created = _utc_text(created)
+        scheduled = None if scheduled is None else _utc_text(scheduled)
+        rows.append((title, content, platform, status, scheduled, engagement, image_url, created, 1, created))
+    return rows, _rollup_grids(raw)
+
+
+def _copy_text(value):
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+
+def _copy_chunk(args):
+    raw = _raw_rows(*args)
+    lines = []
+    for title, content, platform, status, scheduled, engagement, image_url, created in raw:
+        created = _utc_text(created) + '+00'
+        scheduled = '\\N' if scheduled is None else _utc_text(scheduled) + '+00'
+        lines.append('\t'.join((
+            _copy_text(title), _copy_text(content), platform, status, scheduled, str(engagement),
+            '\\N' if image_url is None else image_url, created, '1', created,
+        )))
+    return '\n'.join(lines) + '\n', _rollup_grids(raw)
+
+
+def _chunks(count, seed, now):
+    return [
+        (chunk, min(CHUNK_SIZE, count - chunk * CHUNK_SIZE), seed, now)
+        for chunk in range((count + CHUNK_SIZE - 1) // CHUNK_SIZE)
+    ]
+
+
+def _generate(build, count, seed, now, workers):
+    """Yield ``build(chunk)`` for each chunk in order, in a process pool when ``workers > 1``."""
+    chunks = _chunks(count, seed, now)
+    if workers > 1 and len(chunks) > 1:
+        try:
+            context = multiprocessing.get_context('fork')
+        except ValueError:
+            context = None
+        if context is not None:
+            with context.Pool(workers) as pool:
+                yield from pool.imap(build, chunks)
+            return
+    for chunk in chunks:
+        yield build(chunk)
+
+
+def seed_posts(count, seed=0, workers=1, now=None):
+    """
+    Insert ``count`` generated posts and return the number inserted. Dates
+    are relative to ``now`` (default: the current time); pass it too for
+    byte-identical datasets across runs.
+    """
+    if count <= 0:
+        return 0
+    now = now or timezone.now()
+    table = SocialPost._meta.db_table
+    columns = ', '.join(connection.ops.quote_name(column) for column in INSERT_COLUMNS)
+
+    # Generation allocates millions of tuples and no cycles; without this
+    # the cyclic GC keeps rescanning them.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with transaction.atomic():
+            if connection.vendor not in ('postgresql', 'sqlite'):
+                for rows in _generate(_bulk_chunk, count, seed, now, workers):
+                    SocialPost.objects.bulk_create(rows, batch_size=1000)
+                return count
+
+            with _bulk_load(connection, rebuild_indexes=count >= BULK_LOAD_MIN_ROWS) as grids:
+                with connection.cursor() as cursor:
+                    if connection.vendor == 'postgresql':
+                        for data, chunk_grids in _generate(_copy_chunk, count, seed, now, workers):
+                            _copy(cursor, f"COPY {table} ({columns}) FROM STDIN", data)
+                            for rollup, grid in chunk_grids.items():
+                                _merge_grid(grids[rollup], grid)
+                    else:
+                        placeholders = ', '.join(['%s'] * len(INSERT_COLUMNS))
+                        for rows, chunk_grids in _generate(_sqlite_chunk, count, seed, now, workers):
+                            cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows)
+                            for rollup, grid in chunk_grids.items():
+                                _merge_grid(grids[rollup], grid)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return count
+
+
+@contextmanager
+def _bulk_load(connection, rebuild_indexes):
+    """
+    Around a raw load into the posts table: optionally drop its indexes and
+    search index and build them once at the end. Yields a ``{table: grid}``
+    dict for the loaded rows, applied to the rollups afterwards, and bumps the
+    table version.
+    """
+    backend = search.get_backend(connection)
+    if rebuild_indexes:
+        backend.uninstall(connection)
+        with connection.cursor() as cursor:
+            for index in SocialPost._meta.indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+    grids = {table: {} for table in ROLLUP_TABLES}
+    yield grids
+    if rebuild_indexes:
+        # Not entered as a context manager: SQLite's refuses to open inside
+        # atomic(), and CREATE INDEX needs none of its table rebuilds.
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for index in SocialPost._meta.indexes:
+                cursor.execute(str(index.create_sql(SocialPost, editor)))
+        backend.install(connection)
+    for rollup, grid in grids.items():
+        rollup.apply(added=grid)
+    TableVersion.bump(SocialPost)
+
+
+def _bulk_chunk(args):
+    # created_at / updated_at are auto fields, so on this path they become the insert time.
+    return [SocialPost(**dict(zip(INSERT_COLUMNS, row))) for row in generate_rows(*args)]
+
+
+def _copy(cursor, sql, data):
+    raw = cursor.cursor
+    if hasattr(raw, 'copy_expert'):  # psycopg2
+        raw.copy_expert(sql, io.StringIO(data))
+    else:  # psycopg 3
+        with raw.copy(sql) as copy:
+            copy.write(data)
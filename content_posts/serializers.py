@@ -1,8 +1,57 @@
-from rest_framework import serializers
+import contextlib
+
+from django.utils.dateparse import parse_datetime
+from rest_framework import ISO_8601, serializers
 from .models import SocialPost
 
-class SocialPostSerializer(serializers.ModelSerializer):
-    scheduled_time = serializers.DateTimeField(
+
+class FastDateTimeField(serializers.DateTimeField):
+    """
+    DateTimeField that tries the input format that matched last time
+    before the others. Imports and bulk requests reuse one serializer, and
+    their rows nearly always share a format, so most values parse on the
+    first attempt.
+    """
+
+    last_format = None
+
+    def _parse(self, value, input_format):
+        with contextlib.suppress(ValueError, TypeError):
+            if input_format.lower() == ISO_8601:
+                return parse_datetime(value)
+            return self.datetime_parser(value, input_format)
+        return None
+
+    def to_internal_value(self, value):
+        if not isinstance(value, str):
+            return super().to_internal_value(value)
+        input_formats = getattr(self, 'input_formats', None) or []
+        if self.last_format is not None:
+            parsed = self._parse(value, self.last_format)
+            if parsed is not None:
+                return self.enforce_timezone(parsed)
+        for input_format in input_formats:
+            if input_format == self.last_format:
+                continue
+            parsed = self._parse(value, input_format)
+            if parsed is not None:
+                self.last_format = input_format
+                return self.enforce_timezone(parsed)
+        return super().to_internal_value(value)
+
+
+class SparseFieldsMixin:
+    """Accept a ``fields`` argument that keeps only the named fields."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SocialPostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    scheduled_time = FastDateTimeField(
         required=False,
         allow_null=True,
         input_formats=[
@@ -16,4 +65,40 @@ class SocialPostSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = SocialPost
-        fields = '__all__'
+        # claimed_at is the publisher's bookkeeping.
+        exclude = ('claimed_at',)
+
+    def validate_status(self, value):
+        # Only the publisher claims posts; a client-set Publishing would never be picked up.
+        if value == 'Publishing' and getattr(self.instance, 'status', None) != 'Publishing':
+            raise serializers.ValidationError("Publishing is set by the publisher.")
+        return value
+
+
+# Always part of a sparse fieldset: clients key rows on id, and keyset
+# pagination needs created_at for its cursor.
+ALWAYS_INCLUDED_FIELDS = ('id', 'created_at')
+
+
+def sparse_fieldset(query_params, serializer_class=SocialPostSerializer):
+    """
+    The field names selected by ``?fields=a,b`` or ``?omit=c,d``, or None
+    when neither is given. Raises ValidationError for unknown names.
+    """
+    fields, omit = query_params.get('fields'), query_params.get('omit')
+    if not fields and not omit:
+        return None
+    available = list(serializer_class().fields)
+    errors = {}
+    for param, value in (('fields', fields), ('omit', omit)):
+        unknown = [name for name in (value or '').split(',') if name.strip() and name.strip() not in available]
+        if unknown:
+            errors[param] = [f"Unknown field(s): {', '.join(unknown)}"]
+    if errors:
+        raise serializers.ValidationError(errors)
+
+    selected = {name.strip() for name in fields.split(',')} if fields else set(available)
+    selected -= {name.strip() for name in (omit or '').split(',')}
+    selected |= set(ALWAYS_INCLUDED_FIELDS)
+    return [name for name in available if name in selected]
+
@@ -1,9 +1,64 @@
 # pyright: reportAttributeAccessIssue=false
+import ast
+import csv
+import gzip
+import json
+import logging
+import os
+import queue
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+from io import StringIO
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
 
-from .models import SocialPost
+from .analytics import StatsGrid
+from .apps import install_search
+from .dispatch import Dispatcher, PublishError, TokenBucket
+from .export import EXPORT_FIELDS
+from .fake_platform import FakePlatformServer
+from .forms import SocialPostForm
+from .images import ImageCache
+from .instrumentation import QueryInspector
+from . import logger as log_pipeline
+from . import metrics
+from . import outbound as outbound_module
+from .quotes import FALLBACK_QUOTES, QuotePool
+from .recommendations import BestTimeRecommender
+from .outbound import CLOSED, HALF_OPEN, OPEN, CircuitOpenError, DeadlineExceeded, OutboundClient, deadline
+from .outbound import track as outbound_track
+from .management.commands.publish_scheduled_posts import DueQueue
+from .models import PostDailyRollup, PostStatsRollup, SocialPost, TableVersion
+from .renderers import ORJSONRenderer
+from .rows import post_rows
+from .seeding import generate_rows
+from .serializers import SocialPostSerializer
+
+
+def setUpModule():
+    # Every request logs an INFO access line; keep the test output readable.
+    # Tests that assert on log output lower the level themselves.
+    logger = logging.getLogger(log_pipeline.LOGGER_NAME)
+    unittest.addModuleCleanup(logger.setLevel, logger.level)
+    logger.setLevel(logging.WARNING)
 
 
 class SocialPostTests(APITestCase):
@@ -78,4 +133,1372 @@ class SocialPostTests(APITestCase):
         self.assertEqual(response.data["total_engagement"], 10)
         self.assertIn("platform_stats", response.data)
         self.assertIn("status_stats", response.data)
-        self.assertIn("engagement_stats", response.data)    
\ No newline at end of file
+        self.assertIn("engagement_stats", response.data)
+
+
+class BenchmarkQueriesCommandTests(TestCase):
+    def test_benchmark_rolls_back_seeded_rows(self):
+        out = StringIO()
+        call_command("benchmark_queries", rows=50, repeat=1, stdout=out)
+
+        self.assertIn("Before (no indexes)", out.getvalue())
+        self.assertIn("After (with indexes)", out.getvalue())
+        self.assertEqual(SocialPost.objects.count(), 0)
+
+
+class BenchmarkApiCommandTests(TestCase):
+    def test_records_baseline_and_flags_regressions(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        baseline_path = f"{directory}/baseline.json"
+        call_command("benchmark_api", rows=[20], calls=2, warmup=0, output=baseline_path, stdout=StringIO())
+
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        results = baseline["results"]["20"]
+        self.assertEqual(results["analytics"]["queries"], 2)
+        self.assertTrue({"list", "detail", "search (broad)", "create", "bulk create", "best time"} <= set(results))
+        self.assertTrue(all({"p50_ms", "p95_ms", "p99_ms", "queries"} <= set(r) for r in results.values()))
+        self.assertEqual(SocialPost.objects.count(), 0)
+
+        # A baseline in which analytics ran one query fewer.
+        results["analytics"]["queries"] = 1
+        with open(baseline_path, "w") as f:
+            json.dump(baseline, f)
+        out = StringIO()
+        with self.assertRaisesMessage(CommandError, "1 regression(s)"):
+            call_command(
+                "benchmark_api", rows=[20], calls=2, warmup=0, compare=baseline_path,
+                min_delta_ms=0, threshold=1000, stdout=out,
+            )
+        self.assertIn("20 posts, analytics: p95", out.getvalue())
+        self.assertIn("REGRESSION (queries 1 -> 2)", out.getvalue())
+
+
+class SeedPostsTests(APITestCase):
+    now = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+
+    def test_generation_is_deterministic(self):
+        rows = generate_rows(0, 200, seed=7, now=self.now)
+
+        self.assertEqual(rows, generate_rows(0, 200, seed=7, now=self.now))
+        self.assertNotEqual(rows, generate_rows(0, 200, seed=8, now=self.now))
+        self.assertTrue(all(row[7] <= self.now for row in rows))
+        self.assertTrue(all(len(row[1]) <= 280 for row in rows if row[2] == "twitter"))
+        self.assertEqual({row[3] for row in rows}, {"Published", "Scheduled", "Draft"})
+
+    def test_bulk_load_keeps_rollups_search_and_version_in_step(self):
+        version = TableVersion.current(SocialPost)[0]
+        out = StringIO()
+        # Small enough for a test, big enough to take the drop-and-rebuild-indexes path.
+        with mock.patch("content_posts.seeding.BULK_LOAD_MIN_ROWS", 1):
+            call_command("seed_posts", "30", seed=3, now="2026-01-01T00:00:00Z", stdout=out)
+
+        self.assertIn("Seeded 30 posts", out.getvalue())
+        expected = generate_rows(0, 30, seed=3, now=self.now)
+        stored = list(SocialPost.objects.order_by("id").values_list("title", "created_at", "scheduled_time"))
+        self.assertEqual(stored, [(row[0], row[7], row[4]) for row in expected])
+        self.assertEqual(PostStatsRollup.rebuild(dry_run=True), [])
+        self.assertEqual(PostDailyRollup.rebuild(dry_run=True), [])
+        self.assertGreater(TableVersion.current(SocialPost)[0], version)
+
+        # The search index was rebuilt, and its triggers index later writes.
+        response = self.client.get(reverse("posts-list"), {"search": expected[0][0].split()[0]})
+        self.assertIn(expected[0][0], [post["title"] for post in response.data])
+        post = SocialPost.objects.create(title="Zeppelin", content="After the load", platform="twitter")
+        response = self.client.get(reverse("posts-list"), {"search": "zeppelin"})
+        self.assertEqual([p["id"] for p in response.data], [post.id])
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.posts = [
+            SocialPost.objects.create(
+                title=f"Post {i}",
+                content="launch day" if i % 2 else "behind the scenes",
+                platform="instagram",
+            )
+            for i in range(5)
+        ]
+        self.list_url = reverse("posts-list")
+
+    def walk(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(post["id"] for post in response.data["results"])
+            url = response.data["next"]
+        return ids
+
+    def test_pages_follow_created_at_then_id(self):
+        ids = self.walk(f"{self.list_url}?page_size=2")
+
+        expected = list(
+            SocialPost.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_pagination_composes_with_search(self):
+        ids = self.walk(f"{self.list_url}?page_size=1&search=launch")
+
+        self.assertEqual(sorted(ids), sorted(p.id for p in self.posts if "launch" in p.content))
+
+    def test_unpaginated_without_page_params(self):
+        response = self.client.get(self.list_url)
+
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 5)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f"{self.list_url}?cursor=not-a-cursor")
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PostStatsRollupTests(TestCase):
+    def assertRollupMatchesPosts(self):
+        self.assertEqual(PostStatsRollup.rebuild(dry_run=True), [])
+
+    def cell(self, platform, status):
+        row = PostStatsRollup.objects.get(platform=platform, status=status)
+        return row.post_count, row.engagement_total
+
+    def test_save_and_delete_update_rollup(self):
+        post = SocialPost.objects.create(title="a", content="b", platform="twitter", engagement_score=7)
+        self.assertEqual(self.cell("twitter", "Draft"), (1, 7))
+
+        post.status = "Published"
+        post.engagement_score = 10
+        post.save()
+        self.assertEqual(self.cell("twitter", "Draft"), (0, 0))
+        self.assertEqual(self.cell("twitter", "Published"), (1, 10))
+
+        post.delete()
+        self.assertEqual(self.cell("twitter", "Published"), (0, 0))
+        self.assertRollupMatchesPosts()
+
+    def test_saving_stale_instances_does_not_double_apply(self):
+        post = SocialPost.objects.create(title="a", content="b", platform="twitter", engagement_score=5)
+        first = SocialPost.objects.get(pk=post.pk)
+        second = SocialPost.objects.get(pk=post.pk)
+
+        first.status = "Scheduled"
+        first.save()
+        second.status = "Published"
+        second.save()
+
+        self.assertEqual(self.cell("twitter", "Draft"), (0, 0))
+        self.assertEqual(self.cell("twitter", "Scheduled"), (0, 0))
+        self.assertEqual(self.cell("twitter", "Published"), (1, 5))
+        self.assertRollupMatchesPosts()
+
+        first.delete()
+        self.assertEqual(self.cell("twitter", "Published"), (0, 0))
+        self.assertRollupMatchesPosts()
+
+    def test_bulk_paths_update_rollup(self):
+        posts = SocialPost.objects.bulk_create([
+            SocialPost(title=str(i), content="x", platform="facebook", engagement_score=i)
+            for i in range(10)
+        ])
+        self.assertEqual(self.cell("facebook", "Draft"), (10, 45))
+
+        for post in posts[:3]:
+            post.platform = "linkedin"
+        SocialPost.objects.bulk_update(posts[:3], ["platform"])
+        self.assertRollupMatchesPosts()
+
+        SocialPost.objects.filter(engagement_score__gte=5).update(status="Scheduled")
+        self.assertRollupMatchesPosts()
+
+        SocialPost.objects.filter(platform="linkedin").delete()
+        self.assertRollupMatchesPosts()
+        self.assertEqual(StatsGrid.from_rollup().total_posts, 7)
+
+    def test_queryset_delete_reports_and_subtracts_exactly_the_deleted_rows(self):
+        for i in range(5):
+            SocialPost.objects.create(title=str(i), content="x", platform="twitter", engagement_score=i)
+
+        result = SocialPost.objects.filter(engagement_score__gte=2).delete()
+
+        self.assertEqual(result, (3, {"content_posts.SocialPost": 3}))
+        self.assertEqual(self.cell("twitter", "Draft"), (2, 1))
+        self.assertRollupMatchesPosts()
+
+    def test_bulk_create_rejects_conflict_handling(self):
+        post = SocialPost(title="a", content="b", platform="twitter")
+        for kwargs in ({"ignore_conflicts": True}, {"update_conflicts": True, "unique_fields": ["id"]}):
+            with self.subTest(kwargs=kwargs), self.assertRaises(ValueError):
+                SocialPost.objects.bulk_create([post], **kwargs)
+        self.assertFalse(SocialPost.objects.exists())
+
+    def test_rollup_cells_are_written_in_one_statement_per_table(self):
+        SocialPost.objects.bulk_create([
+            SocialPost(title=str(i), content="x", platform="twitter", engagement_score=1)
+            for i in range(30)
+        ])
+        for day, post in enumerate(SocialPost.objects.order_by("pk")):
+            SocialPost.objects.filter(pk=post.pk).update(created_at=post.created_at - timedelta(days=day))
+
+        with CaptureQueriesContext(connection) as queries:
+            SocialPost.objects.update(engagement_score=F("engagement_score") + 2)
+
+        rollup_writes = [q["sql"] for q in queries if "rollup" in q["sql"] and not q["sql"].startswith("SELECT")]
+        self.assertEqual(len(rollup_writes), 2, rollup_writes)
+        self.assertEqual(self.cell("twitter", "Draft"), (30, 90))
+        self.assertRollupMatchesPosts()
+        self.assertEqual(PostDailyRollup.rebuild(dry_run=True), [])
+
+    def test_rebuild_stats_fixes_drift(self):
+        SocialPost.objects.create(title="a", content="b", platform="instagram", engagement_score=3)
+        PostStatsRollup.objects.update(post_count=99)
+
+        out = StringIO()
+        call_command("rebuild_stats", stdout=out)
+
+        self.assertIn("Fixed 1 cell(s) in PostStatsRollup", out.getvalue())
+        self.assertIn("PostDailyRollup is in sync.", out.getvalue())
+        self.assertEqual(self.cell("instagram", "Draft"), (1, 3))
+
+
+class StatsGridTests(APITestCase):
+    def setUp(self):
+        for platform, status_, score in [
+            ("instagram", "Draft", 10),
+            ("instagram", "Published", 30),
+            ("twitter", "Scheduled", 5),
+        ]:
+            SocialPost.objects.create(
+                title="t", content="c", platform=platform, status=status_, engagement_score=score,
+            )
+
+    def test_rollup_and_posts_grids_agree_in_one_query_each(self):
+        with self.assertNumQueries(1):
+            from_rollup = StatsGrid.from_rollup()
+        with self.assertNumQueries(1):
+            from_posts = StatsGrid.from_posts()
+
+        self.assertEqual(from_rollup, from_posts)
+        self.assertEqual(from_posts.avg_engagement_by_platform(), {"instagram": 20, "twitter": 5})
+
+    def test_stats_endpoints_query_budget(self):
+        # One query for the table version (ETag), one for the rollup.
+        for name in ["post-analytics", "post-stats", "dashboard-stats", "post-stats-simple"]:
+            with self.subTest(endpoint=name), self.assertNumQueries(2):
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_payloads(self):
+        stats = self.client.get(reverse("post-stats")).data
+        self.assertEqual(stats["draft"], 1)
+        self.assertEqual(stats["scheduled"], 1)
+        self.assertEqual(stats["instagram"], 2)
+        self.assertEqual(stats["linkedin"], 0)
+
+        dashboard = self.client.get(reverse("dashboard-stats")).data
+        self.assertEqual(dashboard["total_posts"], 3)
+        self.assertEqual(dashboard["platform_stats"][0], {"platform": "instagram", "count": 2})
+
+
+class FullTextSearchTests(APITestCase):
+    def setUp(self):
+        self.launch = SocialPost.objects.create(
+            title="Product launch", content="Our spring launch is live", platform="twitter",
+        )
+        self.recipe = SocialPost.objects.create(
+            title="Recipe", content="Pancakes for the team breakfast", platform="instagram",
+        )
+        self.list_url = reverse("posts-list")
+
+    def search_ids(self, term):
+        response = self.client.get(self.list_url, {"search": term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post["id"] for post in response.data]
+
+    def test_search_filter_matches_title_and_content(self):
+        self.assertEqual(self.search_ids("launch"), [self.launch.id])
+        self.assertEqual(self.search_ids("pancake"), [self.recipe.id])
+        self.assertEqual(self.search_ids("launch pancakes"), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.recipe.content = "Waffles instead"
+        self.recipe.save()
+        self.assertEqual(self.search_ids("pancakes"), [])
+        self.assertEqual(self.search_ids("waffles"), [self.recipe.id])
+
+        self.recipe.delete()
+        self.assertEqual(self.search_ids("waffles"), [])
+
+    def test_ranked_search_returns_snippets(self):
+        SocialPost.objects.create(title="Notes", content="launch checklist", platform="facebook")
+
+        response = self.client.get(reverse("posts-search"), {"q": "launch"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["id"], self.launch.id)
+        self.assertIn("rank", results[0])
+        self.assertIn("<mark>", results[0]["snippet"])
+
+    def test_post_migrate_hook_skips_when_search_migration_unapplied(self):
+        with mock.patch("content_posts.search.install") as install:
+            with mock.patch(
+                "django.db.migrations.recorder.MigrationRecorder.applied_migrations", return_value={},
+            ):
+                install_search(using="default")
+            install.assert_not_called()
+
+            install_search(using="default")
+            install.assert_called_once()
+
+    def test_search_query_is_not_parsed_as_fts_syntax(self):
+        self.assertEqual(self.search_ids('"launch'), [self.launch.id])
+        self.assertEqual(self.search_ids('launch" OR NEAR('), [])
+
+
+class PublishScheduledPostsTests(TestCase):
+    def make_post(self, minutes, status_="Scheduled"):
+        return SocialPost.objects.create(
+            title="t", content="c", platform="linkedin", status=status_,
+            scheduled_time=timezone.now() + timedelta(minutes=minutes),
+        )
+
+    def test_publishes_only_due_scheduled_posts(self):
+        due = [self.make_post(-5) for _ in range(3)]
+        future = self.make_post(30)
+        draft = self.make_post(-5, status_="Draft")
+
+        call_command("publish_scheduled_posts", once=True, batch_size=2, stdout=StringIO())
+
+        statuses = dict(SocialPost.objects.values_list("id", "status"))
+        self.assertTrue(all(statuses[post.id] == "Published" for post in due))
+        self.assertEqual(statuses[future.id], "Scheduled")
+        self.assertEqual(statuses[draft.id], "Draft")
+        self.assertEqual(StatsGrid.from_rollup().count_by_status()["Published"], 3)
+
+    def test_due_queue_refreshes_incrementally(self):
+        first = self.make_post(10)
+        queue = DueQueue(timedelta(hours=1))
+        queue.refresh(timezone.now())
+        self.assertEqual(queue.next_due(), first.scheduled_time)
+
+        earlier = self.make_post(5)
+        with self.assertNumQueries(1):
+            queue.refresh(timezone.now())
+        self.assertEqual(queue.next_due(), earlier.scheduled_time)
+        self.assertEqual(len(queue.heap), 2)
+
+
+class DispatcherTests(TestCase):
+    def setUp(self):
+        self.server = FakePlatformServer().start()
+        self.addCleanup(self.server.stop)
+
+    def make_posts(self, count, **kwargs):
+        platforms = [choice for choice, _ in SocialPost.PLATFORM_CHOICES]
+        return [
+            SocialPost.objects.create(
+                title=f"Post {i}", content="Hello", platform=platforms[i % len(platforms)], **kwargs,
+            )
+            for i in range(count)
+        ]
+
+    def test_dispatch_publishes_to_every_platform(self):
+        posts = self.make_posts(8)
+
+        results = Dispatcher(base_url=self.server.url, max_workers=4).dispatch(posts)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(sum(self.server.published.values()), 8)
+        self.assertEqual(set(self.server.published), {"instagram", "facebook", "twitter", "linkedin"})
+
+    def test_retries_then_reports_transient_failure(self):
+        self.server.failure_rate = 1.0
+        [post] = self.make_posts(1)
+
+        with self.assertLogs("content_posts.dispatch", "WARNING"):
+            [result] = Dispatcher(base_url=self.server.url, max_attempts=3, backoff=0.001).dispatch([post])
+
+        self.assertFalse(result.ok)
+        self.assertTrue(result.retryable)
+        self.assertEqual(result.attempts, 3)
+
+    def test_token_bucket_limits_rate(self):
+        bucket = TokenBucket(rate=50, capacity=1)
+        started = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_publisher_dispatches_claimed_posts(self):
+        posts = self.make_posts(4, status="Scheduled", scheduled_time=timezone.now() - timedelta(minutes=1))
+
+        with override_settings(PUBLISHING_BASE_URL=self.server.url):
+            call_command("publish_scheduled_posts", once=True, dispatch=True, stdout=StringIO())
+
+        self.assertEqual(sum(self.server.published.values()), 4)
+        self.assertFalse(SocialPost.objects.filter(id__in=[p.id for p in posts]).exclude(status="Published").exists())
+
+    def test_unexpected_responses_become_non_retryable_results(self):
+        [post] = self.make_posts(1)
+        dispatcher = Dispatcher(base_url=self.server.url)
+        adapter = dispatcher.adapters[post.platform]
+        not_json = requests.Response()
+        not_json.status_code, not_json._content = 200, b"<html>ok</html>"
+
+        for outcome in (not_json, requests.TooManyRedirects("loop"), requests.exceptions.InvalidURL("bad")):
+            with mock.patch.object(adapter.session, "post", side_effect=[outcome]):
+                with self.assertLogs("content_posts.dispatch", "WARNING"):
+                    [result] = dispatcher.dispatch([post])
+            self.assertFalse(result.ok)
+            self.assertFalse(result.retryable)
+            self.assertEqual(result.attempts, 1)
+
+    def test_each_platform_has_its_own_workers(self):
+        posts = self.make_posts(8)
+        threads = {}
+
+        def publish(adapter, post):
+            threads.setdefault(post.platform, set()).add(threading.current_thread().name)
+            return "id"
+
+        with mock.patch("content_posts.dispatch.PlatformAdapter.publish", autospec=True, side_effect=publish):
+            results = Dispatcher(base_url=self.server.url, max_workers=1).dispatch(posts)
+
+        self.assertEqual([result.post_id for result in results], [post.id for post in posts])
+        for platform, names in threads.items():
+            self.assertTrue(all(name.startswith(f"dispatch-{platform}") for name in names))
+
+    def test_publisher_keeps_draining_when_one_platform_fails(self):
+        due = timezone.now() - timedelta(minutes=1)
+        posts = self.make_posts(8, status="Scheduled", scheduled_time=due)
+
+        def publish(adapter, post):
+            if post.platform == "twitter":
+                raise PublishError("twitter is down", retryable=True)
+            return "id"
+
+        with mock.patch("content_posts.dispatch.PlatformAdapter.publish", autospec=True, side_effect=publish), \
+                mock.patch("content_posts.dispatch.random.uniform", return_value=0), \
+                override_settings(PUBLISHING_BASE_URL=self.server.url), \
+                self.assertLogs("content_posts.dispatch", "WARNING"):
+            call_command("publish_scheduled_posts", once=True, dispatch=True, batch_size=2,
+                         stdout=StringIO(), stderr=StringIO())
+
+        statuses = dict(SocialPost.objects.values_list("id", "status"))
+        for post in posts:
+            self.assertEqual(statuses[post.id], "Scheduled" if post.platform == "twitter" else "Published")
+        self.assertFalse(SocialPost.objects.exclude(claimed_at=None).exists())
+
+    def test_posts_stay_claimed_when_dispatch_dies_and_stale_claims_are_retried(self):
+        due = timezone.now() - timedelta(minutes=1)
+        posts = self.make_posts(2, status="Scheduled", scheduled_time=due)
+
+        with mock.patch("content_posts.dispatch.Dispatcher.dispatch", side_effect=RuntimeError("crash")), \
+                override_settings(PUBLISHING_BASE_URL=self.server.url), self.assertRaises(RuntimeError):
+            call_command("publish_scheduled_posts", once=True, dispatch=True, stdout=StringIO())
+        self.assertEqual(set(SocialPost.objects.values_list("status", flat=True)), {"Publishing"})
+
+        # A fresh claim may still be in flight elsewhere; only a stale one is retried.
+        with override_settings(PUBLISHING_BASE_URL=self.server.url):
+            call_command("publish_scheduled_posts", once=True, dispatch=True, stdout=StringIO())
+        self.assertEqual(sum(self.server.published.values()), 0)
+
+        SocialPost.objects.filter(id=posts[0].id).update(claimed_at=timezone.now() - timedelta(hours=1))
+        with override_settings(PUBLISHING_BASE_URL=self.server.url):
+            call_command("publish_scheduled_posts", once=True, dispatch=True, stdout=StringIO())
+        statuses = dict(SocialPost.objects.values_list("id", "status"))
+        self.assertEqual(statuses, {posts[0].id: "Published", posts[1].id: "Publishing"})
+
+    def test_clients_cannot_claim_posts(self):
+        response = self.client.post(
+            reverse("posts-list"), {"title": "t", "content": "c", "platform": "twitter", "status": "Publishing"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("status", response.json())
+
+
+class BulkPostTests(APITestCase):
+    def setUp(self):
+        self.url = reverse("posts-bulk")
+
+    def test_bulk_create(self):
+        SocialPost.objects.create(title="existing", content="c", platform="twitter")
+        query_counts = []
+        for size in (5, 50):
+            items = [
+                {"title": f"Post {i}", "content": "c", "platform": "twitter", "engagement_score": ""}
+                for i in range(size)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, items, format="json")
+            query_counts.append(len(queries))
+
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(len(response.data), size)
+
+        self.assertEqual(query_counts[0], query_counts[1])
+        self.assertEqual(SocialPost.objects.count(), 56)
+        self.assertEqual(StatsGrid.from_rollup().count_by_platform(), {"twitter": 56})
+
+    def test_bulk_create_reports_errors_per_item_and_writes_nothing(self):
+        items = [
+            {"title": "ok", "content": "c", "platform": "twitter"},
+            {"title": "bad", "content": "c", "platform": "myspace"},
+        ]
+
+        response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1])
+        self.assertIn("platform", response.data["errors"][0]["errors"])
+        self.assertEqual(SocialPost.objects.count(), 0)
+
+    def test_bulk_partial_update(self):
+        posts = [SocialPost.objects.create(title=str(i), content="c", platform="facebook") for i in range(3)]
+        items = [{"id": post.id, "status": "Published"} for post in posts[:2]]
+        items.append({"id": posts[2].id, "title": "Renamed"})
+
+        response = self.client.patch(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(SocialPost.objects.filter(status="Published").count(), 2)
+        self.assertEqual(SocialPost.objects.get(id=posts[2].id).title, "Renamed")
+        self.assertEqual(StatsGrid.from_rollup().count_by_status(), {"Published": 2, "Draft": 1})
+
+    def test_bulk_update_unknown_id(self):
+        response = self.client.patch(self.url, [{"id": 999, "title": "x"}], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["index"], 0)
+
+    def test_bulk_update_rejects_malformed_ids(self):
+        post = SocialPost.objects.create(title="a", content="c", platform="facebook")
+        items = [{"id": "abc"}, {"id": {"a": 1}}, {"id": True, "title": "x"}, {"id": str(post.id), "title": "ok"}]
+
+        response = self.client.patch(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [0, 1, 2])
+        self.assertTrue(all("id" in error["errors"] for error in response.data["errors"]))
+        self.assertEqual(SocialPost.objects.get(id=post.id).title, "a")
+
+    def test_bulk_delete_rejects_boolean_ids(self):
+        post = SocialPost.objects.create(title="a", content="c", platform="facebook")
+
+        response = self.client.delete(self.url, {"ids": [True]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(SocialPost.objects.filter(id=post.id).exists())
+
+    def test_bulk_delete(self):
+        posts = [SocialPost.objects.create(title=str(i), content="c", platform="facebook") for i in range(3)]
+
+        response = self.client.delete(self.url, {"ids": [posts[0].id, posts[1].id, 999]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["deleted"], [posts[0].id, posts[1].id])
+        self.assertEqual(response.data["not_found"], [999])
+        self.assertEqual(list(SocialPost.objects.values_list("id", flat=True)), [posts[2].id])
+
+
+class ImageCacheTests(TestCase):
+    def setUp(self):
+        self.calls = []
+
+        def fetch(query):
+            self.calls.append(query)
+            return [f"https://img/{query}/{i}" for i in range(3)]
+
+        self.cache = ImageCache(fetch, ttl=60, max_queries=2)
+        self.addCleanup(self.cache.executor.shutdown)
+
+    def test_serves_rotating_urls_from_memory_after_first_miss(self):
+        self.assertEqual(self.cache.get("Social  Media"), ("https://img/social media/0", False))
+        self.assertEqual(self.cache.get("social media"), ("https://img/social media/1", True))
+        self.assertEqual(self.cache.get("SOCIAL media"), ("https://img/social media/2", True))
+
+        self.assertEqual(self.calls, ["social media"])
+        self.assertEqual(self.cache.stats()["hits"], 2)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_evicts_least_recently_used_query(self):
+        for query in ["a", "b", "a", "c"]:
+            self.cache.get(query)
+
+        self.assertEqual(list(self.cache.entries), ["a", "c"])
+
+    def test_expired_pool_is_served_while_refreshing_in_background(self):
+        self.cache.ttl = 0
+        self.cache.get("cats")
+
+        _, hit = self.cache.get("cats")
+        self.cache.executor.shutdown(wait=True)
+
+        self.assertTrue(hit)
+        self.assertEqual(self.calls, ["cats", "cats"])
+        self.assertEqual(self.cache.stats()["refreshes"], 1)
+
+
+class QuotePoolTests(TestCase):
+    def make_pool(self, providers, **kwargs):
+        pool = QuotePool(providers, **kwargs)
+        self.addCleanup(pool.executor.shutdown)
+        return pool
+
+    def test_first_provider_to_answer_wins(self):
+        release = threading.Event()
+
+        def slow(timeout):
+            release.wait(timeout)
+            return [{"content": "slow", "author": "a"}]
+
+        def fast(timeout):
+            return [{"content": "fast", "author": "b"}]
+
+        pool = self.make_pool([slow, fast], timeout=2)
+        self.assertEqual(pool.refill(), 1)
+        release.set()
+
+        self.assertEqual(pool.get(), {"content": "fast", "author": "b"})
+
+    def test_failed_providers_fall_back_to_builtin_quotes(self):
+        def broken(timeout):
+            raise requests.ConnectionError("down")
+
+        pool = self.make_pool([broken, broken], timeout=1)
+
+        self.assertEqual(pool.refill(), 0)
+        self.assertIn(pool.get(), FALLBACK_QUOTES)
+
+    def test_get_refills_below_low_water_mark(self):
+        calls = []
+
+        def provider(timeout):
+            calls.append(1)
+            return [{"content": str(i), "author": "x"} for i in range(5)]
+
+        pool = self.make_pool([provider], low_water=3)
+        pool.get()
+        pool.refill_future.result(timeout=5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(pool.buffer), 5)
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.post = SocialPost.objects.create(title="a", content="a", platform="instagram")
+        self.list_url = reverse("posts-list")
+        self.detail_url = reverse("posts-detail", args=[self.post.id])
+
+    def test_matching_etag_returns_304_from_version_row_only(self):
+        for url in [self.list_url, self.detail_url, reverse("post-analytics"), reverse("dashboard-stats")]:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertIn("no-cache", response["Cache-Control"])
+                self.assertTrue(response.has_header("Last-Modified"))
+
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(len(queries), 1)
+                table = "content_posts_socialpost" if url == self.detail_url else "content_posts_tableversion"
+                self.assertIn(f'FROM "{table}"', queries[0]["sql"])
+
+    def test_every_write_path_changes_the_list_etag(self):
+        etags = {self.client.get(self.list_url)["ETag"]}
+        writes = [
+            lambda: SocialPost.objects.create(title="b", content="b", platform="twitter"),
+            lambda: self.client.patch(self.detail_url, {"title": "changed"}, format="json"),
+            lambda: SocialPost.objects.bulk_create([SocialPost(title="c", content="c", platform="facebook")]),
+            lambda: SocialPost.objects.filter(platform="twitter").update(status="Published"),
+            lambda: SocialPost.objects.filter(platform="facebook").delete(),
+        ]
+        for write in writes:
+            write()
+            etags.add(self.client.get(self.list_url)["ETag"])
+
+        self.assertEqual(len(etags), len(writes) + 1)
+        self.assertEqual(TableVersion.current(SocialPost)[0], len(writes) + 1)
+
+    def test_detail_etag_follows_row_version_only(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        SocialPost.objects.create(title="other", content="x", platform="twitter")
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.client.patch(self.detail_url, {"title": "changed"}, format="json")
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.version, 2)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["title"], "changed")
+
+
+class ServerRenderedPageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        SocialPost.objects.bulk_create([
+            SocialPost(title=f"post {i}", content="x", platform="instagram", status="Draft" if i % 2 else "Published")
+            for i in range(5)
+        ])
+
+    @override_settings(POST_LIST_PAGE_SIZE=2, POST_LIST_MAX_PAGES=2)
+    def test_post_list_is_paginated_and_caps_deep_pages(self):
+        response = self.client.get(reverse("post_list_root"))
+        self.assertEqual(len(response.context["page_obj"]), 2)
+        self.assertContains(response, "Page 1 of 3")
+        self.assertContains(response, "post 4")
+        self.assertNotContains(response, "post 2")
+        self.assertContains(self.client.get(reverse("post_list_root"), {"page": 2}), "post 2")
+        for page in ["3", "0", "abc"]:
+            with self.subTest(page=page):
+                self.assertEqual(self.client.get(reverse("post_list_root"), {"page": page}).status_code, 404)
+
+    def test_fragments_are_served_from_cache_until_posts_change(self):
+        for name in ["post_list_root", "dashboard"]:
+            with self.subTest(name=name):
+                self.client.get(reverse(name))
+                # Only the version row is read once the fragment is cached.
+                with self.assertNumQueries(1):
+                    cached = self.client.get(reverse(name))
+                self.assertEqual(cached.status_code, 200)
+
+        SocialPost.objects.create(title="fresh post", content="x", platform="twitter", status="Published")
+        self.assertContains(self.client.get(reverse("post_list_root")), "fresh post")
+        self.assertContains(self.client.get(reverse("dashboard")), "Total Posts: 6")
+
+
+    def test_create_form_does_not_offer_publishing(self):
+        self.assertNotIn("Publishing", [value for value, _ in SocialPostForm().fields["status"].choices])
+        response = self.client.post(
+            reverse("create_post"), {"title": "t", "content": "c", "platform": "twitter", "status": "Publishing"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("status", response.context["form"].errors)
+        self.assertFalse(SocialPost.objects.filter(status="Publishing").exists())
+
+
+class StructuredLoggingTests(TestCase):
+    def setUp(self):
+        self.output = StringIO()
+        handler = logging.StreamHandler(self.output)
+        handler.setFormatter(log_pipeline.JsonFormatter())
+        listener = log_pipeline._listener
+        original_handlers = listener.handlers
+        listener.handlers = (handler,)
+        logger = logging.getLogger(log_pipeline.LOGGER_NAME)
+        original_level = logger.level
+        logger.setLevel(logging.INFO)
+
+        def restore():
+            log_pipeline.flush()
+            listener.handlers = original_handlers
+            logger.setLevel(original_level)
+        self.addCleanup(restore)
+
+    def lines(self):
+        log_pipeline.flush()
+        return [json.loads(line) for line in self.output.getvalue().splitlines()]
+
+    def test_requests_log_one_json_access_line_with_context(self):
+        response = self.client.get(reverse("health"), HTTP_X_REQUEST_ID="abc123")
+        self.assertEqual(response["X-Request-ID"], "abc123")
+        [line] = self.lines()
+        self.assertEqual(line["logger"], "content_posts.access")
+        self.assertEqual(line["request_id"], "abc123")
+        self.assertEqual(line["route"], "api/health/")
+        self.assertEqual(line["status"], 200)
+        self.assertIsInstance(line["duration_ms"], float)
+
+        self.assertEqual(len(self.client.get(reverse("health"))["X-Request-ID"]), 32)
+
+    def test_records_pick_up_bound_context_and_exceptions(self):
+        token = log_pipeline.bind_request(request_id="r1", route="api/posts/")
+        try:
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                logging.getLogger("content_posts.views").exception("failed %s", "here", extra={"post_id": 7})
+        finally:
+            log_pipeline.unbind(token)
+        logging.getLogger("content_posts.views").info("outside")
+
+        failed, outside = self.lines()
+        self.assertEqual(failed["message"], "failed here")
+        self.assertEqual((failed["request_id"], failed["route"], failed["post_id"]), ("r1", "api/posts/", 7))
+        self.assertIn("ValueError: boom", failed["exc"])
+        self.assertNotIn("request_id", outside)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "needs os.fork")
+    def test_forked_child_gets_its_own_listener(self):
+        read_end, write_end = os.pipe()
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - runs in the child
+            try:
+                logging.getLogger("content_posts.views").warning("from child")
+                deadline = time.monotonic() + 5
+                while not self.output.getvalue() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                os.write(write_end, self.output.getvalue().encode())
+            finally:
+                os._exit(0)
+        os.close(write_end)
+        with os.fdopen(read_end) as child_output:
+            written = child_output.read()
+        os.waitpid(pid, 0)
+
+        self.assertEqual(json.loads(written)["message"], "from child")
+        self.assertEqual(self.lines(), [])
+
+    def test_setup_is_idempotent(self):
+        logger = log_pipeline.setup_logger()
+        self.assertIs(log_pipeline.setup_logger(), logger)
+        self.assertEqual(logger.handlers, [log_pipeline._handler])
+
+    def test_sampling_and_full_queue_drop_records_instead_of_blocking(self):
+        record = logging.makeLogRecord({"levelno": logging.DEBUG})
+        with mock.patch("content_posts.logger.random.random", return_value=0.5):
+            self.assertFalse(log_pipeline.SamplingFilter({"DEBUG": 0.1}).filter(record))
+            self.assertTrue(log_pipeline.SamplingFilter({"DEBUG": 0.6}).filter(record))
+        self.assertTrue(log_pipeline.SamplingFilter({"DEBUG": 0.1}).filter(logging.makeLogRecord({"levelno": logging.INFO})))
+
+        handler = log_pipeline.DroppingQueueHandler(queue.Queue(maxsize=1))
+        handler.handle(logging.makeLogRecord({"msg": "kept"}))
+        handler.handle(logging.makeLogRecord({"msg": "dropped"}))
+        self.assertEqual(handler.dropped, 1)
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(metrics, "registry", metrics.Registry())
+        self.registry = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_requests_are_recorded_per_url_name(self):
+        SocialPost.objects.create(title="a", content="a", platform="instagram")
+        self.client.get(reverse("health"))
+        self.client.get(reverse("health"))
+        self.client.get(reverse("posts-list"))
+        self.client.get("/api/no-such-page/")
+
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response["Content-Type"], "text/plain; version=0.0.4; charset=utf-8")
+        body = response.content.decode()
+        self.assertIn('http_requests_total{method="GET",status="200",view="health"} 2', body)
+        self.assertIn('http_requests_total{method="GET",status="404",view="unmatched"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="health",le="+Inf"} 2', body)
+        self.assertIn('http_request_duration_seconds_count{view="posts-list"} 1', body)
+        self.assertIn('http_requests_in_flight{view="health"} 0', body)
+        self.assertIn('http_requests_in_flight{view="metrics"} 1', body)
+        self.assertRegex(body, r'db_queries_total\{view="posts-list"\} [1-9]')
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+
+    def test_histogram_buckets_are_cumulative(self):
+        for seconds in [0.001, 0.02, 0.02, 30]:
+            self.registry.observe("http_request_duration_seconds", {"view": "v"}, seconds)
+        body = metrics.exposition()
+        self.assertIn('http_request_duration_seconds_bucket{view="v",le="0.005"} 1', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="v",le="0.025"} 3', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="v",le="10.0"} 3', body)
+        self.assertIn('http_request_duration_seconds_bucket{view="v",le="+Inf"} 4', body)
+        self.assertIn('http_request_duration_seconds_sum{view="v"} 30.041', body)
+
+    def test_workers_aggregate_through_the_metrics_directory(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        exited_worker = {
+            "pid": 2 ** 22 + 1,  # above Linux's pid_max, so never alive
+            "values": [
+                ["http_requests_total", [["method", "GET"], ["status", 200], ["view", "health"]], 5],
+                ["http_requests_in_flight", [["view", "health"]], 3],
+            ],
+            "histograms": [],
+        }
+        with open(f"{directory}/{exited_worker['pid']}.json", "w") as f:
+            json.dump(exited_worker, f)
+
+        with override_settings(METRICS_DIR=directory), mock.patch.object(metrics, "_writer", None):
+            self.client.get(reverse("health"))
+            body = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn('http_requests_total{method="GET",status="200",view="health"} 6', body)
+        # Gauges of exited workers are dropped; this process has none in flight.
+        self.assertIn('http_requests_in_flight{view="health"} 0', body)
+
+    def test_outbound_calls_are_timed_per_request(self):
+        client = OutboundClient()
+        client.session.request = mock.Mock(return_value=mock.Mock(status_code=200))
+        with outbound_track() as timing:
+            client.get("https://a.example/")
+            client.get("https://b.example/")
+        client.get("https://a.example/")
+        self.assertEqual(timing.calls, 2)
+        self.assertGreaterEqual(timing.seconds, 0)
+
+
+class QueryBudgetMixin:
+    """Fail when a request runs more queries than its budget, listing the SQL."""
+
+    def assertQueryBudget(self, url, budget):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        self.assertLessEqual(
+            len(queries), budget,
+            f"{url} ran {len(queries)} queries (budget {budget}):\n"
+            + "\n".join(query["sql"] for query in queries.captured_queries),
+        )
+        return response
+
+
+# Per-endpoint query budgets with 30 posts on record. Lower a budget when an
+# endpoint gets cheaper; raising one needs a reason.
+QUERY_BUDGETS = {
+    "posts-list": 2,  # version row (ETag) + page
+    "posts-detail": 2,  # post version (ETag) + row
+    "posts-search": 1,
+    "posts-export": 1,
+    "post-analytics": 2,  # version row + rollup
+    "post-stats": 2,
+    "post-stats-simple": 2,
+    "dashboard-stats": 2,
+    "analytics-timeseries": 2,
+    "post_list_root": 3,  # version row + rollup count + page, on a cold fragment cache
+    "dashboard": 2,
+    "health": 0,
+    "metrics": 0,
+}
+
+
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        for i in range(30):
+            SocialPost.objects.create(
+                title=f"post {i}", content="c", platform=["instagram", "twitter", "facebook"][i % 3],
+                status=["Draft", "Scheduled", "Published"][i % 3], engagement_score=i,
+            )
+
+    def test_endpoints_stay_within_query_budget(self):
+        for name, budget in QUERY_BUDGETS.items():
+            args = [SocialPost.objects.values_list("pk", flat=True).first()] if name == "posts-detail" else []
+            url = reverse(name, args=args) + ("?q=post" if name == "posts-search" else "")
+            with self.subTest(endpoint=name):
+                cache.clear()
+                self.assertQueryBudget(url, budget)
+
+
+class QueryInstrumentationTests(TestCase):
+    def test_slow_queries_are_logged_with_their_plan(self):
+        SocialPost.objects.create(title="a", content="a", platform="instagram")
+        inspector = QueryInspector(slow_query_ms=0)
+        with self.assertLogs("content_posts.queries", "WARNING") as logs, connection.execute_wrapper(inspector):
+            list(SocialPost.objects.filter(platform="instagram"))
+            SocialPost.objects.filter(platform="instagram").update(engagement_score=1)
+
+        # Every query was over the threshold; the EXPLAINs themselves are not counted.
+        self.assertEqual(inspector.count, len(inspector.slow))
+        self.assertEqual(len(logs.records), inspector.count)
+        read = inspector.slow[0]
+        self.assertIn('FROM "content_posts_socialpost"', read["sql"])
+        self.assertTrue(read["plan"])
+        self.assertEqual(logs.records[0].plan, read["plan"])
+        update = next(q for q in inspector.slow if q["sql"].startswith('UPDATE "content_posts_socialpost"'))
+        self.assertIsNone(update["plan"])
+
+    def test_middleware_is_opt_in(self):
+        self.assertFalse(self.client.get(reverse("post-stats")).has_header("Server-Timing"))
+        with override_settings(QUERY_INSTRUMENTATION=True):
+            response = self.client_class().get(reverse("post-stats"))
+        self.assertRegex(response["Server-Timing"], r'^db;desc="2 queries";dur=[\d.]+$')
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.posts = [
+            SocialPost.objects.create(title=f"post {i}", content="line\nbreak, \"quoted\"", platform=platform)
+            for i, platform in enumerate(["instagram", "twitter", "instagram"])
+        ]
+        self.url = reverse("posts-export")
+
+    def get(self, **params):
+        response = self.client.get(self.url, params)
+        return response, b"".join(response.streaming_content)
+
+    def test_ndjson_streams_one_object_per_post(self):
+        response, body = self.get()
+        rows = [json.loads(line) for line in body.decode().splitlines()]
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual([row["id"] for row in rows], [post.id for post in self.posts])
+        self.assertEqual(rows[0]["content"], self.posts[0].content)
+        self.assertTrue(rows[0]["created_at"].endswith("Z"))
+
+    def test_exports_the_serializer_fields(self):
+        _, body = self.get()
+        self.assertEqual(list(json.loads(body.decode().splitlines()[0])), list(SocialPostSerializer().fields))
+        self.assertNotIn("claimed_at", EXPORT_FIELDS)
+
+    def test_csv_with_filters(self):
+        _, body = self.get(format="csv", platform="instagram")
+        rows = list(csv.DictReader(body.decode().splitlines(keepends=True)))
+
+        self.assertEqual([int(row["id"]) for row in rows], [self.posts[0].id, self.posts[2].id])
+        self.assertEqual(rows[1]["content"], self.posts[2].content)
+
+    def test_date_range_and_bad_input(self):
+        SocialPost.objects.filter(pk=self.posts[0].pk).update(created_at=timezone.now() - timedelta(days=10))
+        today = timezone.localdate().isoformat()
+
+        _, body = self.get(**{"from": today, "to": today})
+        self.assertEqual(len(body.splitlines()), 2)
+        self.assertEqual(self.client.get(self.url, {"from": "yesterday"}).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"format": "xml"}).status_code, 400)
+
+    def test_gzip_when_accepted(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+        body = gzip.decompress(b"".join(response.streaming_content))
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(len(body.splitlines()), 3)
+
+
+class ImportTests(TestCase):
+    def test_datetime_field_remembers_last_matching_format(self):
+        field = SocialPostSerializer().fields["scheduled_time"]
+        first = field.to_internal_value("05/11/2026 10:30")
+        self.assertEqual(field.last_format, "%d/%m/%Y %H:%M")
+        self.assertEqual(field.to_internal_value("06/11/2026 10:30") - first, timedelta(days=1))
+        field.to_internal_value("2026-11-05T10:30")
+        self.assertEqual(field.last_format, "%Y-%m-%dT%H:%M")
+        with self.assertRaises(Exception):
+            field.to_internal_value("not a date")
+
+    def test_ndjson_body_imports_valid_rows_and_reports_bad_lines(self):
+        body = "\n".join([
+            json.dumps({"title": "a", "content": "x", "platform": "instagram", "scheduled_time": "2026-11-05 10:30"}),
+            "{broken",
+            json.dumps({"title": "b", "content": "x", "platform": "myspace"}),
+            "",
+            json.dumps({"title": "c", "content": "x", "platform": "twitter", "engagement_score": ""}),
+        ])
+        response = self.client.post(reverse("posts-import"), body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        result = response.json()
+        self.assertEqual((result["lines"], result["created"], result["failed"]), (4, 2, 2))
+        self.assertEqual([error["line"] for error in result["errors"]], [2, 3])
+        self.assertIn("platform", result["errors"][1]["errors"])
+        self.assertEqual(sorted(SocialPost.objects.values_list("title", flat=True)), ["a", "c"])
+        self.assertEqual(PostStatsRollup.objects.get(platform="twitter", status="Draft").post_count, 1)
+
+    def test_csv_upload_and_command(self):
+        data = "title,content,platform,status,scheduled_time\nx,y,facebook,Scheduled,05-11-2026 10:30\nz,w,linkedin,Draft,\n"
+        upload = SimpleUploadedFile("calendar.csv", data.encode("utf-8-sig"), content_type="text/csv")
+        response = self.client.post(reverse("posts-import"), {"file": upload})
+        self.assertEqual(response.json()["created"], 2)
+
+        out = StringIO()
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as f:
+            f.write(data)
+            f.flush()
+            call_command("import_posts", f.name, "--chunk-size", "1", stdout=out)
+
+        self.assertEqual(SocialPost.objects.count(), 4)
+        self.assertIn("Imported 2 of 2 lines", out.getvalue())
+        self.assertEqual(SocialPost.objects.filter(status="Scheduled").first().scheduled_time.day, 5)
+
+
+class FastReadPathTests(APITestCase):
+    def setUp(self):
+        SocialPost.objects.create(title="plain", content="x", platform="instagram")
+        SocialPost.objects.create(
+            title="full \u2028 ünïcode", content="y", platform="twitter", status="Scheduled",
+            scheduled_time=timezone.now() + timedelta(days=1), image_url="https://example.com/a.png",
+        )
+        self.queryset = SocialPost.objects.order_by("-created_at", "-id")
+
+    def test_rows_match_serializer_output(self):
+        expected = SocialPostSerializer(self.queryset, many=True).data
+        self.assertEqual(post_rows.represent(post_rows.values(self.queryset)), [dict(row) for row in expected])
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        data = {"results": SocialPostSerializer(self.queryset, many=True).data, 1: timezone.now()}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_list_endpoint_uses_values(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("posts-list"), {"page_size": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["title"], "full \u2028 ünïcode")
+        self.assertIsNotNone(response.data["next"])
+        self.assertEqual(len(queries), 2)  # table version + one page
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.post = SocialPost.objects.create(title="t", content="long body " * 100, platform="instagram")
+
+    def test_list_fields_select_only_those_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("posts-list"), {"fields": "title,platform,status"})
+
+        self.assertEqual(list(response.data[0]), ["id", "title", "platform", "status", "created_at"])
+        self.assertNotIn('"content"', queries[-1]["sql"])
+
+    def test_omit_on_list_detail_and_paginated_list(self):
+        params = {"omit": "content,image_url"}
+        for response in [
+            self.client.get(reverse("posts-list"), params),
+            self.client.get(reverse("posts-detail", args=[self.post.id]), params),
+        ]:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            row = response.data[0] if isinstance(response.data, list) else response.data
+            self.assertNotIn("content", row)
+            self.assertNotIn("image_url", row)
+            self.assertIn("engagement_score", row)
+
+        page = self.client.get(reverse("posts-list"), {"fields": "title", "page_size": 1}).data
+        self.assertEqual(set(page["results"][0]), {"id", "title", "created_at"})
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse("posts-list"), {"fields": "title,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password", response.data["fields"][0])
+
+    def test_writes_ignore_fieldset(self):
+        response = self.client.patch(
+            reverse("posts-detail", args=[self.post.id]) + "?fields=title", {"title": "u"}, format="json",
+        )
+        self.assertIn("content", response.data)
+
+
+class TimeseriesTests(APITestCase):
+    def setUp(self):
+        self.now = timezone.now().replace(minute=0, second=0, microsecond=0)
+        self.today = self.now.date()
+        for platform, score, age in [("instagram", 5, 2), ("instagram", 7, 2), ("twitter", 3, 0)]:
+            post = SocialPost.objects.create(title="t", content="c", platform=platform, engagement_score=score)
+            SocialPost.objects.filter(pk=post.pk).update(created_at=self.now - timedelta(days=age))
+        self.url = reverse("analytics-timeseries")
+
+    def series(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [(row["bucket"], row["posts"], row["engagement"]) for row in response.data["series"]]
+
+    def test_daily_rollup_follows_writes(self):
+        post = SocialPost.objects.create(title="n", content="c", platform="linkedin", engagement_score=1)
+        post.engagement_score = 4
+        post.save()
+        SocialPost.objects.filter(platform="twitter").update(created_at=self.now - timedelta(days=40))
+        SocialPost.objects.filter(engagement_score=7).delete()
+
+        self.assertEqual(PostDailyRollup.rebuild(dry_run=True), [])
+        self.assertEqual(PostDailyRollup.objects.get(platform="linkedin").engagement_total, 4)
+
+    def test_day_buckets_are_zero_filled_and_read_from_rollup(self):
+        params = {"bucket": "day", "from": (self.today - timedelta(days=2)).isoformat(), "to": self.today.isoformat()}
+        with CaptureQueriesContext(connection) as queries:
+            series = self.series(**params)
+
+        day = timedelta(days=1)
+        self.assertEqual(series, [(self.today - 2 * day, 2, 12), (self.today - day, 0, 0), (self.today, 1, 3)])
+        self.assertFalse(any('FROM "content_posts_socialpost"' in query["sql"] for query in queries))
+        self.assertEqual(self.series(platform="twitter", **params)[-1], (self.today, 1, 3))
+
+    def test_week_and_hour_buckets(self):
+        monday = self.today - timedelta(days=self.today.weekday())
+        weeks = self.series(bucket="week", **{"from": (self.today - timedelta(days=2)).isoformat()})
+        self.assertEqual(sum(posts for _, posts, _ in weeks), 3)
+        self.assertEqual(weeks[-1][0], monday)
+
+        hours = self.series(bucket="hour", **{"from": (self.now - timedelta(hours=1)).isoformat()})
+        self.assertEqual(hours[1][1:], (1, 3))
+        self.assertEqual(hours[1][0], self.now)
+
+    def test_only_fixed_windows_are_conditional(self):
+        fixed = {"from": (self.today - timedelta(days=2)).isoformat(), "to": self.today.isoformat()}
+        etag = self.client.get(self.url, fixed)["ETag"]
+        self.assertEqual(self.client.get(self.url, fixed, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # An open window ends "now", so a validator from an earlier poll must not match.
+        open_window = self.client.get(self.url)
+        self.assertFalse(open_window.has_header("ETag"))
+        self.assertFalse(open_window.has_header("Last-Modified"))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bad_parameters(self):
+        for params in [{"bucket": "year"}, {"platform": "myspace"}, {"from": "soon"},
+                       {"bucket": "hour", "from": (self.today - timedelta(days=30)).isoformat()}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(self.url, params).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BestTimeTests(APITestCase):
+    monday = datetime(2026, 1, 5, tzinfo=dt_timezone.utc)
+
+    def setUp(self):
+        self.recommender = BestTimeRecommender()
+        patcher = mock.patch("content_posts.views.get_recommender", return_value=self.recommender)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.url = reverse("best-time")
+        self.posts = [
+            self.make("instagram", self.monday + timedelta(hours=9), 100),
+            self.make("instagram", self.monday + timedelta(weeks=1, hours=9, minutes=30), 80),
+            self.make("instagram", self.monday + timedelta(days=1, hours=18), 10),
+            self.make("twitter", self.monday + timedelta(days=2, hours=12), 500),
+        ]
+
+    def make(self, platform, when, score, status="Published"):
+        return SocialPost.objects.create(
+            title="t", content="c", platform=platform, status=status, scheduled_time=when, engagement_score=score,
+        )
+
+    def slots(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return [(slot["weekday"], slot["hour"], slot["avg_engagement"], slot["posts"]) for slot in response.data["slots"]]
+
+    def test_ranks_hour_of_week_slots_by_mean_engagement(self):
+        self.assertEqual(self.slots(platform="instagram"), [("Monday", 9, 90.0, 2), ("Tuesday", 18, 10.0, 1)])
+        self.assertEqual(self.slots(limit=1), [("Wednesday", 12, 500.0, 1)])
+        self.assertEqual(self.slots(min_posts=2), [("Monday", 9, 90.0, 2)])
+
+    def test_results_are_not_torn_by_a_concurrent_refresh(self):
+        self.recommender.refresh()
+        recommender, lock = self.recommender, self.recommender.lock
+
+        class RefreshOnRelease:
+            """Lets an in-place update land the moment best_slots() releases the lock."""
+
+            def __enter__(self):
+                lock.acquire()
+
+            def __exit__(self, *exc):
+                lock.release()
+                recommender.totals *= 2
+                recommender.counts[:] = 0
+
+        recommender.lock = RefreshOnRelease()
+        result = recommender.best_slots(platform="instagram")
+
+        self.assertEqual(result["posts"], 3)
+        self.assertEqual([(slot["avg_engagement"], slot["posts"]) for slot in result["slots"]], [(90.0, 2), (10.0, 1)])
+
+    def test_unchanged_table_is_served_from_cache(self):
+        self.slots()
+        with self.assertNumQueries(2):  # ETag and refresh check, both on the version row
+            self.client.get(self.url, {"platform": "twitter"})
+
+    def test_refreshes_incrementally_and_rebuilds_after_deletes(self):
+        self.slots()
+        post = self.posts[2]
+        post.engagement_score = 400
+        post.save()
+        self.make("linkedin", self.monday + timedelta(hours=7), 20)
+
+        self.assertEqual(self.slots(platform="instagram")[0], ("Tuesday", 18, 400.0, 1))
+        self.assertEqual(self.slots(platform="linkedin"), [("Monday", 7, 20.0, 1)])
+        self.assertEqual((self.recommender.full_rebuilds, self.recommender.incremental_refreshes), (1, 1))
+
+        self.posts[3].delete()
+        self.assertEqual(self.slots(platform="twitter"), [])
+        self.assertEqual(self.recommender.full_rebuilds, 2)
+
+
+    def test_only_published_posts_with_history_count(self):
+        self.make("twitter", self.monday + timedelta(hours=6), 900, status="Scheduled")
+        self.make("twitter", self.monday + timedelta(hours=6), 900, status="Draft")
+        upcoming = self.make("twitter", timezone.now() + timedelta(days=1), 900)
+        self.assertEqual(self.slots(platform="twitter"), [("Wednesday", 12, 500.0, 1)])
+
+        self.posts[3].status = "Draft"
+        self.posts[3].save()
+        self.assertEqual(self.slots(platform="twitter"), [])
+        self.assertEqual(self.recommender.full_rebuilds, 1)
+
+        later = timezone.now() + timedelta(days=2)
+        upcoming_slot = timezone.localtime(upcoming.scheduled_time, dt_timezone.utc)
+        with mock.patch("content_posts.recommendations.timezone.now", return_value=later):
+            self.make("linkedin", self.monday, 1)
+            self.assertEqual(
+                self.slots(platform="twitter"), [(upcoming_slot.strftime("%A"), upcoming_slot.hour, 900.0, 1)],
+            )
+        self.assertEqual(self.recommender.full_rebuilds, 1)
+
+
+class OutboundClientTests(TestCase):
+    def setUp(self):
+        self.server = FakePlatformServer(failure_rate=1.0).start()
+        self.addCleanup(self.server.stop)
+        self.outbound = OutboundClient(failure_threshold=2, reset_timeout=60)
+        self.url = f"{self.server.url}/instagram/posts"
+        self.host = self.url.split("/")[2]
+
+    def test_breaker_opens_after_consecutive_failures_and_short_circuits(self):
+        for _ in range(2):
+            self.assertEqual(self.outbound.post(self.url, json={}).status_code, 503)
+        self.assertEqual(self.outbound.breakers[self.host].state, OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            self.outbound.post(self.url, json={})
+
+        stats = self.outbound.stats()[self.host]
+        self.assertEqual((stats["requests"], stats["errors"], stats["rejected"]), (2, 2, 1))
+        self.assertIsNotNone(stats["p95_ms"])
+
+    def test_half_open_trial_closes_or_reopens_breaker(self):
+        self.outbound.reset_timeout = 0
+        breaker = self.outbound.breaker(self.host)
+        breaker.reset_timeout = 0
+        for _ in range(2):
+            self.outbound.post(self.url, json={})
+
+        self.assertTrue(breaker.allow())
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertFalse(breaker.allow())  # one trial at a time
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+        self.server.failure_rate = 0
+        self.assertEqual(self.outbound.post(self.url, json={}).status_code, 201)
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_deadline_caps_timeouts_and_fails_fast_once_spent(self):
+        self.server.latency = 1.0
+        started = time.monotonic()
+        with deadline(0.2):
+            with self.assertRaises(requests.Timeout):
+                self.outbound.post(self.url, json={})
+            time.sleep(0.2)
+            with self.assertRaises(DeadlineExceeded):
+                self.outbound.post(self.url, json={})
+
+        self.assertLess(time.monotonic() - started, 0.9)
+
+
+
+class OutboundCopyTests(TestCase):
+    """backend/posts/outbound.py is a copy of content_posts/outbound.py; only the docstrings may differ."""
+
+    def code(self, path):
+        tree = ast.parse(path.read_text())
+        del tree.body[0]  # module docstring
+        return ast.dump(tree)
+
+    def test_backend_copy_matches(self):
+        source = Path(outbound_module.__file__)
+        copy = Path(settings.BASE_DIR) / "backend" / "posts" / "outbound.py"
+        if not copy.exists():
+            self.skipTest("backend project not checked out")
+        self.assertEqual(self.code(copy), self.code(source), "backend/posts/outbound.py has drifted")
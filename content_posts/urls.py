@@ -10,6 +10,12 @@ from .views import (
     PostStatsView,
     post_stats,
     dashboard_stats,
+    outbound_stats,
+    export_posts,
+    import_posts,
+    analytics_timeseries,
+    best_time,
+    metrics_view,
 )
 
 router = DefaultRouter()
@@ -18,10 +24,17 @@ router.register(r"posts", PostViewSet, basename="posts")
 urlpatterns = [
     path("health/", health, name="health"),
     path("analytics/", PostAnalyticsView.as_view(), name="post-analytics"),
+    path("analytics/timeseries/", analytics_timeseries, name="analytics-timeseries"),
+    path("recommendations/best-time/", best_time, name="best-time"),
     path("fetch_image/", FetchImageView.as_view(), name="fetch-image"),
     path("random_quote/", RandomQuoteView.as_view(), name="random-quote"),
+    path("outbound/stats/", outbound_stats, name="outbound-stats"),
+    path("metrics", metrics_view, name="metrics"),
     path("", post_list, name="post-list"),
     path("posts/stats/", PostStatsView.as_view(), name="post-stats"),
+    # Before the router, whose posts/<pk>/ route would otherwise match "export".
+    path("posts/export/", export_posts, name="posts-export"),
+    path("posts/import/", import_posts, name="posts-import"),
     path("dashboard/stats/", dashboard_stats, name="dashboard-stats"),
     path("stats-simple/", post_stats, name="post-stats-simple"),
     path("", include(router.urls)),
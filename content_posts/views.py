@@ -1,63 +1,101 @@
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.filters import SearchFilter
 from .models import SocialPost
-from .serializers import SocialPostSerializer
+from .analytics import (
+    TIMESERIES_BUCKETS,
+    StatsGrid,
+    engagement_timeseries,
+    analytics_payload,
+    dashboard_stats_payload,
+    post_stats_payload,
+    simple_stats_payload,
+)
+from .serializers import SocialPostSerializer, sparse_fieldset
+from .bulk import bulk_create_posts, bulk_delete_posts, bulk_update_posts, normalize_post_data
+from .pagination import KeysetPagination, RollupCountPaginator
+from .rows import post_rows_for
+from .conditional import post_condition, posts_condition, posts_version
+from .export import EXPORT_FORMATS, export_queryset, export_response, parse_date_bound
+from .importer import IMPORT_FORMATS, guess_format, import_posts as run_import
+from .search import FullTextSearchFilter, get_backend
+from .images import get_image_cache
+from .quotes import quote_pool
+from .recommendations import get_recommender
+from . import metrics, outbound
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from django.db.models import Count, Avg, Sum, Q
+import gzip
+import logging
+from datetime import timedelta, timezone as dt_timezone
+
 import requests
 from decouple import config
+from django.conf import settings
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from rest_framework import status
-from rest_framework.decorators import api_view
-from .logger import setup_logger
+from rest_framework.decorators import action, api_view
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
 from django.shortcuts import render, redirect
+from django.utils.functional import SimpleLazyObject
 from .models import SocialPost as Post
 from .forms import SocialPostForm
 
-logger = setup_logger()
+logger = logging.getLogger(__name__)
 
 @api_view(['GET'])
+@posts_condition('stats-simple')
 def post_stats(request):
-    stats = {
-        "draft": Post.objects.filter(status="Draft").count(),
-        "published": Post.objects.filter(status="Published").count(),
-        "instagram": Post.objects.filter(platform="instagram").count(),
-        "twitter": Post.objects.filter(platform="twitter").count(),
-        "facebook": Post.objects.filter(platform="facebook").count(),
-    }
-    return Response(stats)
+    return Response(simple_stats_payload(StatsGrid.from_rollup()))
 
 @api_view(['GET'])
+@posts_condition('dashboard-stats')
 def dashboard_stats(request):
     """
     Provides statistics for the dashboard (total, published, drafts, and by platform).
     """
-    platform_stats_query = SocialPost.objects.values('platform').annotate(count=Count('id')).order_by('-count')
-
-    agg_stats = SocialPost.objects.aggregate(
-        total_posts=Count('id'),
-        published=Count('id', filter=Q(status='Published')),
-        drafts=Count('id', filter=Q(status='Draft'))
-    )
-
-    response_data = {
-        **agg_stats,
-        'platform_stats': list(platform_stats_query)
-    }
-    return Response(response_data)
+    return Response(dashboard_stats_payload(StatsGrid.from_rollup()))
 
 class PostViewSet(ModelViewSet):
-    queryset = SocialPost.objects.all().order_by("-created_at")
+    queryset = SocialPost.objects.all().order_by("-created_at", "-id")
     serializer_class = SocialPostSerializer
-    filter_backends = [SearchFilter]
+    pagination_class = KeysetPagination
+    filter_backends = [FullTextSearchFilter]
     search_fields = ["title", "content"]
+    max_search_results = 100
+
+    def get_fieldset(self):
+        """Fields picked with ?fields= / ?omit= on reads; None means all of them."""
+        if not hasattr(self, '_fieldset'):
+            self._fieldset = sparse_fieldset(self.request.query_params) if self.request.method == 'GET' else None
+        return self._fieldset
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_fieldset()
+        return queryset.only(*fields) if fields else queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.get_fieldset():
+            kwargs.setdefault('fields', self.get_fieldset())
+        return super().get_serializer(*args, **kwargs)
+
+    @method_decorator(posts_condition('posts'))
+    def list(self, request, *args, **kwargs):
+        # Read-only fast path: plain dicts from .values(), no serializer per row.
+        rows = post_rows_for(self.get_fieldset())
+        queryset = rows.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(rows.represent(page))
+        return Response(rows.represent(queryset))
+
+    @method_decorator(post_condition)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
     def create(self, request, *args, **kwargs):
-        data = request.data.copy()
-        if isinstance(data.get("scheduled_time"), str) and not data.get("scheduled_time").strip():
-            data["scheduled_time"] = None
-        if data.get("engagement_score") in ["", None]:
-            data["engagement_score"] = 0
+        data = normalize_post_data(request.data)
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
         self.perform_create(serializer)
@@ -67,44 +105,140 @@ class PostViewSet(ModelViewSet):
     def update(self, request, *args, **kwargs):
         partial = kwargs.pop('partial', False)
         instance = self.get_object()
-        data = request.data.copy()
-        if isinstance(data.get("scheduled_time"), str) and not data.get("scheduled_time").strip():
-            data["scheduled_time"] = None
-        if data.get("engagement_score") in ["", None]:
-            data["engagement_score"] = 0
+        data = normalize_post_data(request.data)
         serializer = self.get_serializer(instance, data=data, partial=partial)
         serializer.is_valid(raise_exception=True)
         self.perform_update(serializer)
         return Response(serializer.data)
 
+    @action(detail=False, methods=['post', 'patch', 'delete'], url_path='bulk')
+    def bulk(self, request):
+        """
+        POST a list of posts to create them, PATCH a list of ``{"id", ...fields}``
+        to update them, or DELETE ``{"ids": [...]}`` to delete them.
+        """
+        if request.method == 'DELETE':
+            ids = request.data.get('ids') if isinstance(request.data, dict) else None
+            if not isinstance(ids, list) or not all(isinstance(pk, int) and not isinstance(pk, bool) for pk in ids):
+                return Response({"error": "Expected {\"ids\": [<int>, ...]}"}, status=status.HTTP_400_BAD_REQUEST)
+            if len(ids) > settings.POSTS_BULK_MAX_ITEMS:
+                return self.too_many_items()
+            deleted, missing = bulk_delete_posts(ids)
+            return Response({"deleted": deleted, "not_found": missing})
+
+        items = request.data
+        if not isinstance(items, list):
+            return Response({"error": "Expected a list of posts"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.POSTS_BULK_MAX_ITEMS:
+            return self.too_many_items()
+
+        if request.method == 'POST':
+            posts, errors = bulk_create_posts(items)
+            success_status = status.HTTP_201_CREATED
+        else:
+            posts, errors = bulk_update_posts(items)
+            success_status = status.HTTP_200_OK
+        if errors:
+            return Response({"errors": errors}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(posts, many=True).data, status=success_status)
+
+    def too_many_items(self):
+        return Response(
+            {"error": f"At most {settings.POSTS_BULK_MAX_ITEMS} items per request"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Ranked full-text search with highlighted snippets: ?q=<terms>&limit=<n>."""
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({"error": "Missing search query 'q'"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_search_results)
+        except ValueError:
+            limit = 20
+
+        posts = get_backend().ranked(self.get_queryset(), query)[:max(limit, 1)]
+        results = []
+        for post in posts:
+            data = self.get_serializer(post).data
+            data['rank'] = post.search_rank
+            data['snippet'] = post.search_snippet
+            results.append(data)
+        return Response({'query': query, 'results': results})
+
+# Default span per bucket when ?from= is not given.
+TIMESERIES_DEFAULT_SPAN = {'hour': timedelta(hours=24), 'day': timedelta(days=30), 'week': timedelta(weeks=52)}
+
+@api_view(['GET'])
+# Without ?to= the window ends now and moves with every poll, so only
+# responses for a fixed window can be validated against the table version.
+@posts_condition('timeseries', applies=lambda request: bool(request.GET.get('to')))
+def analytics_timeseries(request):
+    """
+    Post count and engagement per hour, day or week:
+    ?bucket=hour|day|week&platform=&from=&to= (dates or datetimes, UTC buckets).
+    """
+    params = request.query_params
+    bucket = params.get('bucket', 'day')
+    if bucket not in TIMESERIES_BUCKETS:
+        return Response({"error": f"bucket must be one of: {', '.join(TIMESERIES_BUCKETS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    platform = params.get('platform') or None
+    if platform and platform not in dict(SocialPost.PLATFORM_CHOICES):
+        return Response({"error": f"Unknown platform: {platform}"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        # Naive dates and datetimes are read as UTC, like the buckets.
+        with timezone.override(dt_timezone.utc):
+            end = timezone.now()
+            if params.get('to'):
+                end, inclusive = parse_date_bound(params['to'], end=True)
+                if not inclusive:
+                    end -= timedelta(microseconds=1)
+            start = parse_date_bound(params['from'])[0] if params.get('from') else end - TIMESERIES_DEFAULT_SPAN[bucket]
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    max_days = settings.ANALYTICS_HOURLY_MAX_DAYS if bucket == 'hour' else settings.ANALYTICS_MAX_RANGE_DAYS
+    if start > end or end - start > timedelta(days=max_days):
+        return Response(
+            {"error": f"from must be before to, at most {max_days} days apart for {bucket} buckets"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return Response({
+        "bucket": bucket,
+        "platform": platform,
+        "from": start,
+        "to": end,
+        "series": engagement_timeseries(bucket, start, end, platform),
+    })
+
+@api_view(['GET'])
+@posts_condition('best-time')
+def best_time(request):
+    """Top hour-of-week slots (UTC) by mean engagement: ?platform=&limit=&min_posts=."""
+    recommender = get_recommender()
+    if recommender is None:
+        return Response({"error": "Recommendations need NumPy installed"}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    platform = request.query_params.get('platform') or None
+    if platform and platform not in dict(SocialPost.PLATFORM_CHOICES):
+        return Response({"error": f"Unknown platform: {platform}"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = min(max(int(request.query_params.get('limit', 5)), 1), 168)
+        min_posts = int(request.query_params.get('min_posts', 1))
+    except ValueError:
+        return Response({"error": "limit and min_posts must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({"platform": platform, **recommender.best_slots(platform, limit=limit, min_posts=min_posts)})
+
 class PostAnalyticsView(APIView):
+    @method_decorator(posts_condition('analytics'))
     def get(self, request, *args, **kwargs):
-        platform_stats = SocialPost.objects.values('platform').annotate(count=Count('id'))
-        status_stats = SocialPost.objects.values('status').annotate(count=Count('id'))
-        engagement_stats = SocialPost.objects.values('platform').annotate(avg_engagement=Avg('engagement_score'))
-        total_posts = SocialPost.objects.count()
-        total_engagement = SocialPost.objects.aggregate(total_engagement=Sum('engagement_score'))['total_engagement'] or 0
-
-        return Response({
-            'platform_stats': platform_stats,
-            'status_stats': status_stats,
-            'engagement_stats': engagement_stats,
-            'total_posts': total_posts,
-            'total_engagement': total_engagement,
-        })
+        return Response(analytics_payload(StatsGrid.from_rollup()))
 
 class PostStatsView(APIView):
+    @method_decorator(posts_condition('post-stats'))
     def get(self, request, *args, **kwargs):
-        stats = SocialPost.objects.aggregate(
-            draft=Count('id', filter=Q(status='Draft')),
-            published=Count('id', filter=Q(status='Published')),
-            scheduled=Count('id', filter=Q(status='Scheduled')),
-            instagram=Count('id', filter=Q(platform='instagram')),
-            twitter=Count('id', filter=Q(platform='twitter')),
-            facebook=Count('id', filter=Q(platform='facebook')),
-            linkedin=Count('id', filter=Q(platform='linkedin')),
-        )
-        return Response(stats)
+        return Response(post_stats_payload(StatsGrid.from_rollup()))
 
 class FetchImageView(APIView):
     def get(self, request, *args, **kwargs):
@@ -114,44 +248,32 @@ class FetchImageView(APIView):
             return Response({"error": "Unsplash API key not configured"}, status=500)
 
         query = request.query_params.get('query', 'social media')
-        url = f"https://api.unsplash.com/photos/random?query={query}&client_id={access_key}"
-        
         try:
-            response = requests.get(url)
-            response.raise_for_status()
-            data = response.json()
-            return Response({"url": data["urls"]["regular"]})
+            url, hit = get_image_cache(access_key).get(query)
+        except LookupError as e:
+            return Response({"error": str(e)}, status=404)
         except requests.exceptions.RequestException as e:
             return Response({"error": str(e)}, status=500)
 
+        response = Response({"url": url})
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
 
 class RandomQuoteView(APIView):
     def get(self, request, *args, **kwargs):
-        try:
-            # Try quotable.io first with SSL verification disabled for local dev
-            response = requests.get("https://api.quotable.io/random", verify=False, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            return Response({"content": data["content"], "author": data.get("author", "Unknown")})
-        except:
-            # Fallback to a simpler API if quotable.io fails
-            try:
-                response = requests.get("https://zenquotes.io/api/random", verify=False, timeout=5)
-                response.raise_for_status()
-                data = response.json()
-                if data and len(data) > 0:
-                    return Response({"content": data[0]["q"], "author": data[0].get("a", "Unknown")})
-            except:
-                # Final fallback - return a hardcoded inspirational quote
-                quotes = [
-                    {"content": "The best time to plant a tree was 20 years ago. The second best time is now.", "author": "Chinese Proverb"},
-                    {"content": "Your limitation—it's only your imagination.", "author": "Unknown"},
-                    {"content": "Great things never come from comfort zones.", "author": "Unknown"},
-                    {"content": "Success doesn't just find you. You have to go out and get it.", "author": "Unknown"},
-                    {"content": "Dream it. Wish it. Do it.", "author": "Unknown"},
-                ]
-                import random
-                return Response(random.choice(quotes))
+        return Response(quote_pool.get())
+
+
+@api_view(['GET'])
+def outbound_stats(request):
+    """Circuit breaker state and latency per upstream host, plus the image and quote caches."""
+    access_key = config('UNSPLASH_ACCESS_KEY', default=None)
+    return Response({
+        "hosts": outbound.client.stats(),
+        "image_cache": get_image_cache(access_key).stats() if access_key else None,
+        "quote_buffer": len(quote_pool.buffer),
+    })
 
 @api_view(['GET', 'POST'])
 def post_list_create(request):
@@ -162,21 +284,82 @@ def post_list_create(request):
             serializer.save()
             return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-        # If it fails, print the error to your terminal so you can see it!
-        print("❌ Validation Error:", serializer.errors)
+        logger.warning("Post validation failed", extra={"errors": serializer.errors})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     # Handle listing posts (for the Dashboard)
     elif request.method == 'GET':
-        posts = SocialPost.objects.all().order_by('-created_at')
-        serializer = SocialPostSerializer(posts, many=True)
-        return Response(serializer.data)
+        rows = post_rows_for(sparse_fieldset(request.query_params))
+        posts = rows.values(SocialPost.objects.all().order_by('-created_at', '-id'))
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(posts, request)
+        if page is not None:
+            return paginator.get_paginated_response(rows.represent(page))
+        return Response(rows.represent(posts))
 
 from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
 
 def health(request):
     return JsonResponse({"status": "ok"})
 
+@require_GET
+def metrics_view(request):
+    """Request metrics in the Prometheus text exposition format."""
+    return HttpResponse(metrics.exposition(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@require_GET
+def export_posts(request):
+    """
+    Stream every matching post as NDJSON (default) or CSV.
+
+    A plain Django view: DRF would treat ?format= as a renderer override.
+    """
+    export_format = request.GET.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({"error": f"format must be one of: {', '.join(EXPORT_FORMATS)}"}, status=400)
+    try:
+        queryset = export_queryset(request.GET)
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+    return export_response(queryset, export_format, gzip=gzip)
+
+@csrf_exempt
+@require_POST
+def import_posts(request):
+    """
+    Import posts from an NDJSON or CSV upload, sent either as the ``file``
+    field of a multipart form or as the raw request body. The body is read
+    as a stream, never loaded whole. Valid rows are created even when
+    others fail; failures are reported by line number.
+    """
+    upload = request.FILES.get("file")
+    if upload is not None:
+        stream, name = upload, upload.name
+    else:
+        stream, name = request, ""
+        if "csv" in request.content_type:
+            name = "upload.csv"
+    if name.lower().endswith(".gz") or request.headers.get("Content-Encoding") == "gzip":
+        stream = gzip.GzipFile(fileobj=stream)
+
+    import_format = request.GET.get("format") or guess_format(name)
+    if import_format not in IMPORT_FORMATS:
+        return JsonResponse({"error": f"format must be one of: {', '.join(IMPORT_FORMATS)}"}, status=400)
+
+    def log_progress(result):
+        logger.info("Import: %s lines, %s created, %s failed", result.lines, result.created, result.failed)
+
+    try:
+        result = run_import(stream, import_format, progress=log_progress)
+    except (UnicodeDecodeError, OSError) as e:
+        return JsonResponse({"error": f"Could not read upload: {e}"}, status=400)
+    status_code = 201 if result.created else 400
+    return JsonResponse(result.as_dict(), status=status_code)
+
 def create_post(request):
     if request.method == "POST":
         form = SocialPostForm(request.POST)
@@ -188,20 +371,56 @@ def create_post(request):
 
     return render(request, "content_posts/create_post.html", {"form": form})
 
+POST_LIST_FIELDS = ('id', 'title', 'platform', 'status', 'scheduled_time', 'created_at')
+
+
+def fragment_context(request):
+    """
+    Template context for ``{% cache %}`` fragments over the posts table.
+    ``posts_version`` changes on every write, so a fragment is never served
+    once the posts behind it have changed.
+    """
+    version, updated_at = posts_version(request)
+    return {
+        "fragment_ttl": settings.HTML_FRAGMENT_CACHE_TTL,
+        "posts_version": f"{version}-{updated_at.timestamp() if updated_at else 0}",
+    }
+
+
+@posts_condition('post-list-html')
 def post_list(request):
     """
-    Renders the main posts page with a list of all posts.
+    Renders the main posts page, one page of posts at a time.
     """
-    posts = Post.objects.all().order_by('-created_at')
-    return render(request, "content_posts/post_list.html", {"posts": posts})
+    fragments = fragment_context(request)
+    posts = Post.objects.order_by('-created_at', '-id').only(*POST_LIST_FIELDS)
+    paginator = RollupCountPaginator(posts, settings.POST_LIST_PAGE_SIZE, version=fragments["posts_version"])
+    try:
+        page = paginator.page(request.GET.get("page", 1))
+    except InvalidPage:
+        raise Http404("Invalid page")
+    if page.number > settings.POST_LIST_MAX_PAGES:
+        raise Http404("Page out of range")
+    # The page's rows are only fetched if the list fragment misses the cache.
+    context = {"page_obj": page, "max_pages": settings.POST_LIST_MAX_PAGES, **fragments}
+    return render(request, "content_posts/post_list.html", context)
 
+
+def dashboard_counts():
+    grid = StatsGrid.from_rollup()
+    by_status = grid.count_by_status()
+    return {
+        "total_posts": grid.total_posts,
+        "draft_count": by_status.get("Draft", 0),
+        "published_count": by_status.get("Published", 0),
+    }
+
+
+@posts_condition('dashboard-html')
 def dashboard(request):
     """
     Renders the dashboard page with post statistics.
     """
-    context = {
-        "total_posts": Post.objects.count(),
-        "draft_count": Post.objects.filter(status="Draft").count(),
-        "published_count": Post.objects.filter(status="Published").count(),
-    }
+    # Lazy, so the rollup is only read when the stats fragment is rebuilt.
+    context = {"stats": SimpleLazyObject(dashboard_counts), **fragment_context(request)}
     return render(request, "content_posts/dashboard.html", context)
@@ -78,7 +78,7 @@ function Dashboard() {
         .catch(err => console.error("Error fetching analytics:", err));
 
       // Fetch recent posts with limit
-      axios.get(`${API_URL}/posts/?limit=5`)
+      axios.get(`${API_URL}/posts/?limit=5&fields=title,platform,status`)
         .then(res => {
           console.log("Recent posts response:", res.data);
           const postsData = res.data.results || res.data;